@@ -9,6 +9,11 @@ from app.manifest_validate import validate_manifest_raw
 
 Issue = Dict[str, Any]
 
+# Snapshots are content-addressed, so the warnings for a (module_id,
+# manifest_hash) pair never change; diagnostics are rebuilt on every request.
+_SNAPSHOT_WARNINGS_CACHE: dict[tuple[str, str], list[Issue]] = {}
+_SNAPSHOT_WARNINGS_MAX_ITEMS = 256
+
 
 def _parse_target(target: str) -> tuple[str, str] | None:
     if not isinstance(target, str):
@@ -20,6 +25,17 @@ def _parse_target(target: str) -> tuple[str, str] | None:
     return None
 
 
+def _snapshot_warnings(module_id: str, manifest_hash: str, manifest: Any) -> list[Issue]:
+    key = (module_id, manifest_hash)
+    warnings = _SNAPSHOT_WARNINGS_CACHE.get(key)
+    if warnings is None:
+        _, _, warnings = validate_manifest_raw(manifest, expected_module_id=module_id)
+        if len(_SNAPSHOT_WARNINGS_CACHE) >= _SNAPSHOT_WARNINGS_MAX_ITEMS:
+            _SNAPSHOT_WARNINGS_CACHE.clear()
+        _SNAPSHOT_WARNINGS_CACHE[key] = warnings
+    return list(warnings)
+
+
 def build_diagnostics(registry, get_snapshot) -> dict:
     modules = []
     for mod in registry.list():
@@ -32,7 +48,7 @@ def build_diagnostics(registry, get_snapshot) -> dict:
         if module_id and manifest_hash:
             try:
                 manifest = get_snapshot(module_id, manifest_hash)
-                _, _, warnings = validate_manifest_raw(manifest, expected_module_id=module_id)
+                warnings = _snapshot_warnings(module_id, manifest_hash, manifest)
             except Exception:
                 manifest = None
         app = manifest.get("app") if isinstance(manifest, dict) else None
@@ -5832,9 +5832,11 @@ def _draft_hash(manifest: dict, module_id: str | None = None) -> str:
     if isinstance(module_id, str) and module_id:
         normalized_input = _ensure_app_home(_ensure_module_id(_sanitize_manifest(normalized_input), module_id))
         normalized_input, _ = normalize_manifest_v13(normalized_input, module_id=module_id, cache={})
+    # Only the normalized form feeds the hash, so skip the validation pass.
     normalized, _, _ = validate_manifest_raw(
         normalized_input,
         expected_module_id=module_id if isinstance(module_id, str) else None,
+        assume_valid=True,
     )
     return manifest_hash(normalized)
 
@@ -15793,7 +15795,7 @@ def _apply_module_change_memory(module_id: str, manifest: dict, actor: dict | No
         if mode == "install":
             record["enabled"] = True
     # In-memory registry does not expose a public setter, so we update internals here.
-    registry._modules[module_id] = record
+    registry._store_record(module_id, record)
     audit_id = str(uuid.uuid4())
     audit = {
         "audit_id": audit_id,
@@ -15806,7 +15808,7 @@ def _apply_module_change_memory(module_id: str, manifest: dict, actor: dict | No
         "reason": reason,
         "at": now,
     }
-    registry._audit.setdefault(module_id, []).insert(0, audit)
+    registry._record_audit(module_id, audit)
     return {"ok": True, "errors": [], "warnings": warnings, "module": record, "audit_id": audit_id}
 
 
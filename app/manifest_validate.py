@@ -669,7 +669,10 @@ def _validate_blocks(
             if not isinstance(tabs, list) or len(tabs) == 0:
                 errors.append(_issue("MANIFEST_TABS_INVALID", "tabs must be a non-empty list", f"{bpath}.tabs"))
                 continue
-            tab_ids = []
+            # The set doubles as the default_tab lookup; duplicates are still
+            # reported once, after the tabs' own content.
+            tab_ids: set[str] = set()
+            duplicate_tab = False
             for tidx, tab in enumerate(tabs):
                 tpath = f"{bpath}.tabs[{tidx}]"
                 if not isinstance(tab, dict):
@@ -679,14 +682,16 @@ def _validate_blocks(
                 tid = _get(tab, "id")
                 if not isinstance(tid, str) or not tid:
                     errors.append(_issue("MANIFEST_TAB_ID_INVALID", "tab.id is required", f"{tpath}.id"))
+                elif tid in tab_ids:
+                    duplicate_tab = True
                 else:
-                    tab_ids.append(tid)
+                    tab_ids.add(tid)
                 content = _get(tab, "content", [])
                 _validate_blocks(content, f"{tpath}.content", view_ids, entity_by_id, action_by_id, errors, allow_layout, allow_chatter, allow_v13, record_entity, depth + 1)
-            if len(tab_ids) != len(set(tab_ids)):
+            if duplicate_tab:
                 errors.append(_issue("MANIFEST_TAB_ID_DUPLICATE", "tab ids must be unique", f"{bpath}.tabs"))
             default_tab = _get(block, "default_tab")
-            if default_tab and default_tab not in tab_ids:
+            if default_tab and (not isinstance(default_tab, str) or default_tab not in tab_ids):
                 errors.append(_issue("MANIFEST_TAB_DEFAULT_INVALID", "default_tab must match a tab id", f"{bpath}.default_tab"))
         elif kind == "text":
             if not allow_layout:
@@ -715,7 +720,8 @@ def _validate_blocks(
             if not isinstance(cards, list) or len(cards) == 0:
                 errors.append(_issue("MANIFEST_STAT_CARDS_INVALID", "stat_cards.cards must be a non-empty list", f"{bpath}.cards"))
                 continue
-            card_ids = []
+            card_ids: set[str] = set()
+            duplicate_card = False
             for cidx, card in enumerate(cards):
                 cpath = f"{bpath}.cards[{cidx}]"
                 if not isinstance(card, dict):
@@ -725,8 +731,10 @@ def _validate_blocks(
                 cid = _get(card, "id")
                 if not isinstance(cid, str) or not cid:
                     errors.append(_issue("MANIFEST_STAT_CARD_INVALID", "stat card id is required", f"{cpath}.id"))
+                elif cid in card_ids:
+                    duplicate_card = True
                 else:
-                    card_ids.append(cid)
+                    card_ids.add(cid)
                 label = _get(card, "label")
                 if not isinstance(label, str) or not label:
                     errors.append(_issue("MANIFEST_STAT_CARD_INVALID", "stat card label is required", f"{cpath}.label"))
@@ -755,7 +763,7 @@ def _validate_blocks(
                 fmt = _get(card, "format")
                 if fmt is not None and fmt not in {"number", "currency", "hours"}:
                     errors.append(_issue("MANIFEST_STAT_CARD_INVALID", "format must be number|currency|hours", f"{cpath}.format"))
-            if len(card_ids) != len(set(card_ids)):
+            if duplicate_card:
                 errors.append(_issue("MANIFEST_STAT_CARD_INVALID", "stat card ids must be unique", f"{bpath}.cards"))
         elif kind == "toolbar":
             if not allow_v13:
@@ -1006,6 +1014,37 @@ def validate_manifest(manifest: dict, expected_module_id: str | None = None) ->
         entities = []
 
     entity_by_id: dict[str, dict] = {}
+    # Views, lookups, transformations etc. check field ids against the same
+    # few entities hundreds of times per manifest, so each registered
+    # entity's id set is built once. Keyed by identity: registered entities
+    # are held by the manifest for the whole call.
+    field_ids_by_entity: dict[int, set[str]] = {}
+
+    def entity_field_ids(entity: dict) -> set[str]:
+        key = id(entity)
+        ids = field_ids_by_entity.get(key)
+        if ids is None:
+            ids = _field_ids(entity)
+            if entity_by_id.get(_get(entity, "id")) is entity:
+                field_ids_by_entity[key] = ids
+        return ids
+
+    # Same for resolving a field id to its definition (first match wins, as
+    # a linear scan would).
+    fields_by_entity: dict[int, dict[str, dict]] = {}
+
+    def entity_field(entity: dict, field_id: str) -> dict | None:
+        key = id(entity)
+        by_id = fields_by_entity.get(key)
+        if by_id is None:
+            by_id = {}
+            for f in _get(entity, "fields", []):
+                if isinstance(f, dict) and isinstance(f.get("id"), str):
+                    by_id.setdefault(f["id"], f)
+            if entity_by_id.get(_get(entity, "id")) is entity:
+                fields_by_entity[key] = by_id
+        return by_id.get(field_id)
+
     for i, entity in enumerate(entities):
         path = f"entities[{i}]"
         if not isinstance(entity, dict):
@@ -1095,7 +1134,7 @@ def validate_manifest(manifest: dict, expected_module_id: str | None = None) ->
                     target_entity = entity_by_id.get(target_full) or entity_by_id.get(target)
                     if not target_entity:
                         warnings.append(_issue("MANIFEST_LOOKUP_TARGET_EXTERNAL", "lookup target entity not found in module (external ok)", f"{fpath}.entity"))
-                    elif isinstance(display, str) and display not in _field_ids(target_entity):
+                    elif isinstance(display, str) and display not in entity_field_ids(target_entity):
                         errors.append(_issue("MANIFEST_LOOKUP_DISPLAY_UNKNOWN", "lookup display_field not found on target entity", f"{fpath}.display_field"))
 
             visible_when = _get(field, "visible_when")
@@ -1126,7 +1165,7 @@ def validate_manifest(manifest: dict, expected_module_id: str | None = None) ->
                     _validate_condition(domain, f"{fpath}.domain", errors)
 
         display_field = _get(entity, "display_field")
-        if display_field and display_field not in _field_ids(entity):
+        if display_field and display_field not in entity_field_ids(entity):
             errors.append(_issue("MANIFEST_DISPLAY_FIELD_INVALID", "display_field not found in fields", f"{path}.display_field"))
 
     transformations = _get(manifest, "transformations", [])
@@ -1359,7 +1398,7 @@ def validate_manifest(manifest: dict, expected_module_id: str | None = None) ->
                             value = _get(item, key)
                             if value is not None and not isinstance(value, str):
                                 errors.append(_issue("MANIFEST_INTERFACES_INVALID", f"{key} must be string", f"{ipath}.{key}"))
-                            elif isinstance(value, str) and entity_obj and value not in _field_ids(entity_obj):
+                            elif isinstance(value, str) and entity_obj and value not in entity_field_ids(entity_obj):
                                 errors.append(_issue("MANIFEST_VIEW_FIELD_UNKNOWN", f"{key} field not found on entity", f"{ipath}.{key}"))
 
             _validate_interface_decl(
@@ -1403,7 +1442,7 @@ def validate_manifest(manifest: dict, expected_module_id: str | None = None) ->
                             errors.append(_issue("MANIFEST_INTERFACES_INVALID", "group_bys must be list of strings", f"{dpath}.group_bys"))
                         elif entity_obj:
                             for gidx, field_id in enumerate(group_bys):
-                                if field_id not in _field_ids(entity_obj):
+                                if field_id not in entity_field_ids(entity_obj):
                                     errors.append(_issue("MANIFEST_VIEW_FIELD_UNKNOWN", "group_bys field not found on entity", f"{dpath}.group_bys[{gidx}]"))
                     default_widgets = _get(item, "default_widgets")
                     if default_widgets is not None:
@@ -1426,7 +1465,7 @@ def validate_manifest(manifest: dict, expected_module_id: str | None = None) ->
                                     value = _get(widget, field_key)
                                     if value is not None and not isinstance(value, str):
                                         errors.append(_issue("MANIFEST_INTERFACES_INVALID", f"{field_key} must be string", f"{wpath}.{field_key}"))
-                                    elif isinstance(value, str) and entity_obj and value not in _field_ids(entity_obj):
+                                    elif isinstance(value, str) and entity_obj and value not in entity_field_ids(entity_obj):
                                         errors.append(_issue("MANIFEST_VIEW_FIELD_UNKNOWN", f"{field_key} field not found on entity", f"{wpath}.{field_key}"))
                                 measure = _get(widget, "measure")
                                 if measure is not None and not isinstance(measure, str):
@@ -1701,7 +1740,7 @@ def validate_manifest(manifest: dict, expected_module_id: str | None = None) ->
                 if title_field is not None:
                     if not isinstance(title_field, str):
                         errors.append(_issue("MANIFEST_VIEW_HEADER_INVALID", "title_field must be string", f"{vpath}.header.title_field"))
-                    elif entity_obj and title_field not in _field_ids(entity_obj):
+                    elif entity_obj and title_field not in entity_field_ids(entity_obj):
                         errors.append(_issue("MANIFEST_VIEW_FIELD_UNKNOWN", "title_field not found on entity", f"{vpath}.header.title_field"))
                 save_mode = _get(header, "save_mode")
                 if save_mode is not None:
@@ -1738,17 +1777,12 @@ def validate_manifest(manifest: dict, expected_module_id: str | None = None) ->
                         field_id = _get(statusbar, "field_id")
                         if not isinstance(field_id, str):
                             errors.append(_issue("MANIFEST_VIEW_HEADER_INVALID", "statusbar.field_id must be string", f"{vpath}.header.statusbar.field_id"))
-                        elif entity_obj and field_id not in _field_ids(entity_obj):
+                        elif entity_obj and field_id not in entity_field_ids(entity_obj):
                             errors.append(_issue("MANIFEST_VIEW_FIELD_UNKNOWN", "statusbar.field_id not found on entity", f"{vpath}.header.statusbar.field_id"))
-                        elif entity_obj:
-                            fields = _get(entity_obj, "fields", [])
-                            if isinstance(fields, list):
-                                for f in fields:
-                                    if isinstance(f, dict) and f.get("id") == field_id:
-                                        ftype = f.get("type")
-                                        if ftype not in {"enum"}:
-                                            errors.append(_issue("MANIFEST_VIEW_HEADER_INVALID", "statusbar field must be enum", f"{vpath}.header.statusbar.field_id"))
-                                        break
+                        elif entity_obj and isinstance(_get(entity_obj, "fields", []), list):
+                            field = entity_field(entity_obj, field_id)
+                            if field is not None and field.get("type") != "enum":
+                                errors.append(_issue("MANIFEST_VIEW_HEADER_INVALID", "statusbar field must be enum", f"{vpath}.header.statusbar.field_id"))
                         wf = workflows_by_entity.get(full_entity_id) or workflows_by_entity.get(entity_id)
                         if isinstance(wf, dict):
                             wf_status = _get(wf, "status_field")
@@ -1849,7 +1883,7 @@ def validate_manifest(manifest: dict, expected_module_id: str | None = None) ->
                             errors.append(_issue("MANIFEST_VIEW_HEADER_INVALID", "search.fields must be list", f"{vpath}.header.search.fields"))
                         if isinstance(fields, list) and entity_obj:
                             for fidx, fid in enumerate(fields):
-                                if isinstance(fid, str) and fid not in _field_ids(entity_obj):
+                                if isinstance(fid, str) and fid not in entity_field_ids(entity_obj):
                                     errors.append(_issue("MANIFEST_VIEW_FIELD_UNKNOWN", "search field not found", f"{vpath}.header.search.fields[{fidx}]"))
 
                 filters = _get(header, "filters")
@@ -1912,7 +1946,7 @@ def validate_manifest(manifest: dict, expected_module_id: str | None = None) ->
                     if not isinstance(tracked_fields, list):
                         errors.append(_issue("MANIFEST_VIEW_ACTIVITY_INVALID", "activity.tracked_fields must be list", f"{vpath}.activity.tracked_fields"))
                     elif entity_obj:
-                        valid_fields = _field_ids(entity_obj)
+                        valid_fields = entity_field_ids(entity_obj)
                         for fidx, fid in enumerate(tracked_fields):
                             if not isinstance(fid, str):
                                 errors.append(_issue("MANIFEST_VIEW_ACTIVITY_INVALID", "tracked_fields items must be strings", f"{vpath}.activity.tracked_fields[{fidx}]"))
@@ -1929,7 +1963,7 @@ def validate_manifest(manifest: dict, expected_module_id: str | None = None) ->
                         continue
                     field_id = _get(col, "field_id")
                     if isinstance(field_id, str):
-                        if entity_obj and field_id not in _field_ids(entity_obj):
+                        if entity_obj and field_id not in entity_field_ids(entity_obj):
                             errors.append(_issue("MANIFEST_VIEW_FIELD_UNKNOWN", "list view field not found", f"{vpath}.columns[{cidx}].field_id"))
 
         if vtype == "form":
@@ -1943,7 +1977,7 @@ def validate_manifest(manifest: dict, expected_module_id: str | None = None) ->
                         for fidx, fid in enumerate(fields):
                             if isinstance(fid, str):
                                 entity_obj = entity_by_id.get(full_entity_id) or entity_by_id.get(entity_id)
-                                if entity_obj and fid not in _field_ids(entity_obj):
+                                if entity_obj and fid not in entity_field_ids(entity_obj):
                                     errors.append(
                                         _issue(
                                             "MANIFEST_VIEW_FIELD_UNKNOWN",
@@ -1986,7 +2020,7 @@ def validate_manifest(manifest: dict, expected_module_id: str | None = None) ->
                 title_field = _get(card, "title_field")
                 if not isinstance(title_field, str) or not title_field:
                     errors.append(_issue("MANIFEST_VIEW_KANBAN_INVALID", "card.title_field is required", f"{vpath}.card.title_field"))
-                elif entity_obj and title_field not in _field_ids(entity_obj):
+                elif entity_obj and title_field not in entity_field_ids(entity_obj):
                     errors.append(_issue("MANIFEST_VIEW_FIELD_UNKNOWN", "card.title_field not found", f"{vpath}.card.title_field"))
                 subtitle_fields = _get(card, "subtitle_fields", [])
                 if subtitle_fields is not None:
@@ -1994,7 +2028,7 @@ def validate_manifest(manifest: dict, expected_module_id: str | None = None) ->
                         errors.append(_issue("MANIFEST_VIEW_KANBAN_INVALID", "card.subtitle_fields must be list", f"{vpath}.card.subtitle_fields"))
                     elif entity_obj:
                         for sidx, fid in enumerate(subtitle_fields):
-                            if isinstance(fid, str) and fid not in _field_ids(entity_obj):
+                            if isinstance(fid, str) and fid not in entity_field_ids(entity_obj):
                                 errors.append(_issue("MANIFEST_VIEW_FIELD_UNKNOWN", "card.subtitle_fields field not found", f"{vpath}.card.subtitle_fields[{sidx}]"))
                 badge_fields = _get(card, "badge_fields", [])
                 if badge_fields is not None:
@@ -2002,7 +2036,7 @@ def validate_manifest(manifest: dict, expected_module_id: str | None = None) ->
                         errors.append(_issue("MANIFEST_VIEW_KANBAN_INVALID", "card.badge_fields must be list", f"{vpath}.card.badge_fields"))
                     elif entity_obj:
                         for bidx, fid in enumerate(badge_fields):
-                            if isinstance(fid, str) and fid not in _field_ids(entity_obj):
+                            if isinstance(fid, str) and fid not in entity_field_ids(entity_obj):
                                 errors.append(_issue("MANIFEST_VIEW_FIELD_UNKNOWN", "card.badge_fields field not found", f"{vpath}.card.badge_fields[{bidx}]"))
 
         if vtype == "graph":
@@ -2016,12 +2050,12 @@ def validate_manifest(manifest: dict, expected_module_id: str | None = None) ->
                     if gtype is not None and gtype not in {"bar", "line", "pie"}:
                         errors.append(_issue("MANIFEST_VIEW_GRAPH_INVALID", "graph.default.type must be bar|line|pie", f"{vpath}.default.type"))
                     group_by = _get(graph_def, "group_by")
-                    if group_by is not None and entity_obj and group_by not in _field_ids(entity_obj):
+                    if group_by is not None and entity_obj and group_by not in entity_field_ids(entity_obj):
                         errors.append(_issue("MANIFEST_VIEW_FIELD_UNKNOWN", "graph.default.group_by not found", f"{vpath}.default.group_by"))
                     measure = _get(graph_def, "measure")
                     if measure is not None and isinstance(measure, str) and measure.startswith("sum:") and entity_obj:
                         mfield = measure.split(":", 1)[1]
-                        if mfield and mfield not in _field_ids(entity_obj):
+                        if mfield and mfield not in entity_field_ids(entity_obj):
                             errors.append(_issue("MANIFEST_VIEW_FIELD_UNKNOWN", "graph.default.measure field not found", f"{vpath}.default.measure"))
 
         if vtype == "calendar":
@@ -2038,26 +2072,26 @@ def validate_manifest(manifest: dict, expected_module_id: str | None = None) ->
 
             if not isinstance(date_start, str) or not date_start:
                 errors.append(_issue("MANIFEST_VIEW_CALENDAR_INVALID", "calendar.date_start is required", f"{vpath}.calendar.date_start"))
-            elif entity_obj and date_start not in _field_ids(entity_obj):
+            elif entity_obj and date_start not in entity_field_ids(entity_obj):
                 errors.append(_issue("MANIFEST_VIEW_FIELD_UNKNOWN", "calendar.date_start field not found", f"{vpath}.calendar.date_start"))
             if date_end is not None:
                 if not isinstance(date_end, str):
                     errors.append(_issue("MANIFEST_VIEW_CALENDAR_INVALID", "calendar.date_end must be string", f"{vpath}.calendar.date_end"))
-                elif entity_obj and date_end not in _field_ids(entity_obj):
+                elif entity_obj and date_end not in entity_field_ids(entity_obj):
                     errors.append(_issue("MANIFEST_VIEW_FIELD_UNKNOWN", "calendar.date_end field not found", f"{vpath}.calendar.date_end"))
             if not isinstance(title_field, str) or not title_field:
                 errors.append(_issue("MANIFEST_VIEW_CALENDAR_INVALID", "calendar.title_field is required", f"{vpath}.calendar.title_field"))
-            elif entity_obj and title_field not in _field_ids(entity_obj):
+            elif entity_obj and title_field not in entity_field_ids(entity_obj):
                 errors.append(_issue("MANIFEST_VIEW_FIELD_UNKNOWN", "calendar.title_field field not found", f"{vpath}.calendar.title_field"))
             if all_day_field is not None:
                 if not isinstance(all_day_field, str):
                     errors.append(_issue("MANIFEST_VIEW_CALENDAR_INVALID", "calendar.all_day_field must be string", f"{vpath}.calendar.all_day_field"))
-                elif entity_obj and all_day_field not in _field_ids(entity_obj):
+                elif entity_obj and all_day_field not in entity_field_ids(entity_obj):
                     errors.append(_issue("MANIFEST_VIEW_FIELD_UNKNOWN", "calendar.all_day_field field not found", f"{vpath}.calendar.all_day_field"))
             if color_field is not None:
                 if not isinstance(color_field, str):
                     errors.append(_issue("MANIFEST_VIEW_CALENDAR_INVALID", "calendar.color_field must be string", f"{vpath}.calendar.color_field"))
-                elif entity_obj and color_field not in _field_ids(entity_obj):
+                elif entity_obj and color_field not in entity_field_ids(entity_obj):
                     errors.append(_issue("MANIFEST_VIEW_FIELD_UNKNOWN", "calendar.color_field field not found", f"{vpath}.calendar.color_field"))
             if default_scale is not None and default_scale not in {"month", "week", "day", "year"}:
                 errors.append(_issue("MANIFEST_VIEW_CALENDAR_INVALID", "calendar.default_scale must be month|week|day|year", f"{vpath}.calendar.default_scale"))
@@ -2112,11 +2146,10 @@ def validate_manifest(manifest: dict, expected_module_id: str | None = None) ->
             if not isinstance(status_field, str) or not status_field:
                 errors.append(_issue("MANIFEST_WORKFLOW_STATUS_FIELD_INVALID", "workflow.status_field is required", f"{wpath}.status_field"))
             else:
-                if status_field not in _field_ids(entity_obj):
+                if status_field not in entity_field_ids(entity_obj):
                     errors.append(_issue("MANIFEST_WORKFLOW_STATUS_FIELD_UNKNOWN", "workflow.status_field not found on entity", f"{wpath}.status_field"))
                 else:
-                    field = next((f for f in _get(entity_obj, "fields", []) if isinstance(f, dict) and f.get("id") == status_field), None)
-                    ftype = _get(field, "type")
+                    ftype = _get(entity_field(entity_obj, status_field), "type")
                     if ftype not in {"enum", "string"}:
                         warnings.append(_issue("MANIFEST_WORKFLOW_STATUS_FIELD_TYPE", "workflow status_field should be enum or string", f"{wpath}.status_field"))
 
@@ -2141,7 +2174,7 @@ def validate_manifest(manifest: dict, expected_module_id: str | None = None) ->
                     errors.append(_issue("MANIFEST_WORKFLOW_REQUIRED_FIELDS_INVALID", "state.required_fields must be a list", f"{spath}.required_fields"))
                 elif isinstance(required_fields, list):
                     for fidx, fid in enumerate(required_fields):
-                        if isinstance(fid, str) and fid not in _field_ids(entity_obj):
+                        if isinstance(fid, str) and fid not in entity_field_ids(entity_obj):
                             errors.append(_issue("MANIFEST_WORKFLOW_REQUIRED_FIELD_UNKNOWN", "required field not found on entity", f"{spath}.required_fields[{fidx}]"))
 
             if len(state_ids) != len(set(state_ids)):
@@ -2178,7 +2211,7 @@ def validate_manifest(manifest: dict, expected_module_id: str | None = None) ->
                         errors.append(_issue("MANIFEST_WORKFLOW_REQUIRED_MAP_INVALID", "required_fields_by_state values must be lists", f"{wpath}.required_fields_by_state.{key}"))
                         continue
                     for fidx, fid in enumerate(fields):
-                        if isinstance(fid, str) and fid not in _field_ids(entity_obj):
+                        if isinstance(fid, str) and fid not in entity_field_ids(entity_obj):
                             errors.append(_issue("MANIFEST_WORKFLOW_REQUIRED_FIELD_UNKNOWN", "required field not found on entity", f"{wpath}.required_fields_by_state.{key}[{fidx}]"))
 
     if is_v1:
@@ -2408,7 +2441,20 @@ def validate_manifest(manifest: dict, expected_module_id: str | None = None) ->
     return errors, warnings
 
 
-def validate_manifest_raw(raw: dict, expected_module_id: str | None = None) -> tuple[dict, list[Issue], list[Issue]]:
+def validate_manifest_raw(
+    raw: dict,
+    expected_module_id: str | None = None,
+    *,
+    assume_valid: bool = False,
+) -> tuple[dict, list[Issue], list[Issue]]:
+    """Normalize ``raw`` and validate the result.
+
+    Callers that only need the normalized manifest (e.g. to hash a draft
+    that was validated when it was saved) pass ``assume_valid=True`` to skip
+    validation; no errors or warnings are reported then.
+    """
     normalized = normalize_manifest(raw)
+    if assume_valid:
+        return normalized, [], []
     errors, warnings = validate_manifest(normalized, expected_module_id=expected_module_id)
     return normalized, errors, warnings
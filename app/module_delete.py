@@ -116,9 +116,12 @@ def delete_module_memory(
     if hasattr(registry, "_modules"):
         record["archived"] = True
         record["enabled"] = False
-        registry._modules[module_id] = record
+        registry._store_record(module_id, record)
     if hasattr(registry, "_audit"):
-        registry._audit[module_id] = [
+        # Archiving replaces the module's audit trail with a single entry.
+        registry._audit.pop(module_id, None)
+        registry._record_audit(
+            module_id,
             {
                 "audit_id": f"delete-{module_id}",
                 "module_id": module_id,
@@ -129,8 +132,8 @@ def delete_module_memory(
                 "actor": actor,
                 "reason": "archive" if archive else reason,
                 "at": _now(),
-            }
-        ]
+            },
+        )
 
     if drafts is not None:
         try:
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import uuid
 from datetime import date, datetime
-from typing import Any
+from typing import Any, Callable
 
 from app.conditions import eval_condition
 
@@ -141,6 +141,98 @@ def _workflow_required_fields(workflow: dict, status_value: str | None) -> list[
     return list(dict.fromkeys(required))
 
 
+TypeIssue = tuple[str, str]
+
+
+def _check_string(field_id: str, field: dict, val: Any) -> TypeIssue | None:
+    if not isinstance(val, str):
+        return "TYPE_MISMATCH", f"{field_id} must be a string"
+    return None
+
+
+def _check_number(field_id: str, field: dict, val: Any) -> TypeIssue | None:
+    if not isinstance(val, (int, float)) or isinstance(val, bool):
+        return "TYPE_MISMATCH", f"{field_id} must be a number"
+    return None
+
+
+def _check_boolean(field_id: str, field: dict, val: Any) -> TypeIssue | None:
+    if not isinstance(val, bool):
+        return "TYPE_MISMATCH", f"{field_id} must be a boolean"
+    return None
+
+
+def _check_enum(field_id: str, field: dict, val: Any) -> TypeIssue | None:
+    allowed = enum_values(field)
+    if val not in allowed:
+        return "INVALID_ENUM", f"{field_id} must be one of {allowed}"
+    return None
+
+
+def _check_date(field_id: str, field: dict, val: Any) -> TypeIssue | None:
+    if not isinstance(val, str):
+        return "TYPE_MISMATCH", f"{field_id} must be a date string"
+    try:
+        date.fromisoformat(val)
+    except Exception:
+        return "INVALID_DATE", f"{field_id} must be YYYY-MM-DD"
+    return None
+
+
+def _check_datetime(field_id: str, field: dict, val: Any) -> TypeIssue | None:
+    if not isinstance(val, str):
+        return "TYPE_MISMATCH", f"{field_id} must be a datetime string"
+    try:
+        datetime.fromisoformat(val.replace("Z", "+00:00"))
+    except Exception:
+        return "INVALID_DATETIME", f"{field_id} must be ISO8601"
+    return None
+
+
+def _check_uuid(field_id: str, field: dict, val: Any) -> TypeIssue | None:
+    if not isinstance(val, str) or not is_uuid(val):
+        return "TYPE_MISMATCH", f"{field_id} must be a UUID"
+    return None
+
+
+def _check_user(field_id: str, field: dict, val: Any) -> TypeIssue | None:
+    if not isinstance(val, str):
+        return "TYPE_MISMATCH", f"{field_id} must be a user id string"
+    return None
+
+
+def _check_users(field_id: str, field: dict, val: Any) -> TypeIssue | None:
+    if not isinstance(val, list) or any(not isinstance(item, str) for item in val):
+        return "TYPE_MISMATCH", f"{field_id} must be a list of user id strings"
+    return None
+
+
+def _check_tags(field_id: str, field: dict, val: Any) -> TypeIssue | None:
+    if not isinstance(val, list):
+        return "TYPE_MISMATCH", f"{field_id} must be a list"
+    return None
+
+
+# One hash lookup per value instead of walking an if-chain of type names.
+_FIELD_TYPE_CHECKS: dict[str, Callable[[str, dict, Any], TypeIssue | None]] = {
+    "string": _check_string,
+    "text": _check_string,
+    "rich_text": _check_string,
+    "number": _check_number,
+    "currency": _check_number,
+    "boolean": _check_boolean,
+    "bool": _check_boolean,
+    "enum": _check_enum,
+    "date": _check_date,
+    "datetime": _check_datetime,
+    "uuid": _check_uuid,
+    "lookup": _check_string,
+    "user": _check_user,
+    "users": _check_users,
+    "tags": _check_tags,
+}
+
+
 def validate_record_payload(entity: dict, data: dict, for_create: bool, workflow: dict | None = None) -> tuple[list[dict], dict]:
     errors: list[dict] = []
     if not isinstance(data, dict):
@@ -221,59 +313,18 @@ def validate_record_payload(entity: dict, data: dict, for_create: bool, workflow
                     _add_error("REQUIRED_FIELD", f"Missing required field: {field_id}", path=field_id)
 
     for field_id, val in data.items():
-        if field_id == "id":
+        if field_id == "id" or val is None:
             continue
         field = field_by_id.get(field_id)
         if not field:
             continue
-        ftype = field.get("type")
-        if val is None:
+        # unknown types are ignored for now
+        check = _FIELD_TYPE_CHECKS.get(field.get("type"))
+        if check is None:
             continue
-        if ftype in ("string", "text", "rich_text"):
-            if not isinstance(val, str):
-                _add_error("TYPE_MISMATCH", f"{field_id} must be a string", path=field_id)
-        elif ftype in {"number", "currency"}:
-            if not isinstance(val, (int, float)) or isinstance(val, bool):
-                _add_error("TYPE_MISMATCH", f"{field_id} must be a number", path=field_id)
-        elif ftype == "boolean" or ftype == "bool":
-            if not isinstance(val, bool):
-                _add_error("TYPE_MISMATCH", f"{field_id} must be a boolean", path=field_id)
-        elif ftype == "enum":
-            allowed = enum_values(field)
-            if val not in allowed:
-                _add_error("INVALID_ENUM", f"{field_id} must be one of {allowed}", path=field_id)
-        elif ftype == "date":
-            if not isinstance(val, str):
-                _add_error("TYPE_MISMATCH", f"{field_id} must be a date string", path=field_id)
-            else:
-                try:
-                    date.fromisoformat(val)
-                except Exception:
-                    _add_error("INVALID_DATE", f"{field_id} must be YYYY-MM-DD", path=field_id)
-        elif ftype == "datetime":
-            if not isinstance(val, str):
-                _add_error("TYPE_MISMATCH", f"{field_id} must be a datetime string", path=field_id)
-            else:
-                try:
-                    datetime.fromisoformat(val.replace("Z", "+00:00"))
-                except Exception:
-                    _add_error("INVALID_DATETIME", f"{field_id} must be ISO8601", path=field_id)
-        elif ftype == "uuid":
-            if not isinstance(val, str) or not is_uuid(val):
-                _add_error("TYPE_MISMATCH", f"{field_id} must be a UUID", path=field_id)
-        elif ftype == "lookup":
-            if not isinstance(val, str):
-                _add_error("TYPE_MISMATCH", f"{field_id} must be a string", path=field_id)
-        elif ftype == "user":
-            if not isinstance(val, str):
-                _add_error("TYPE_MISMATCH", f"{field_id} must be a user id string", path=field_id)
-        elif ftype == "users":
-            if not isinstance(val, list) or any(not isinstance(item, str) for item in val):
-                _add_error("TYPE_MISMATCH", f"{field_id} must be a list of user id strings", path=field_id)
-        elif ftype == "tags":
-            if not isinstance(val, list):
-                _add_error("TYPE_MISMATCH", f"{field_id} must be a list", path=field_id)
-        # ignore unknown types for now
+        issue = check(field_id, field, val)
+        if issue is not None:
+            _add_error(issue[0], issue[1], path=field_id)
 
     return errors, data
 
@@ -67,7 +67,10 @@ class InMemoryQueryRunner:
 class MemoryDraftStore:
     def __init__(self) -> None:
         self._drafts: Dict[str, dict] = {}
+        # Versions per module in creation order (oldest first), plus an id
+        # index so single-version lookups do not scan the history.
         self._draft_versions: Dict[str, List[dict]] = {}
+        self._draft_version_index: Dict[str, Dict[str, dict]] = {}
 
     def list_drafts(self) -> list[dict]:
         items = []
@@ -127,24 +130,24 @@ class MemoryDraftStore:
             "ops_applied": copy.deepcopy(ops_applied) if ops_applied is not None else None,
             "validation_errors": copy.deepcopy(validation_errors) if validation_errors is not None else None,
         }
-        self._draft_versions.setdefault(module_id, []).insert(0, entry)
+        self._draft_versions.setdefault(module_id, []).append(entry)
+        self._draft_version_index.setdefault(module_id, {})[version_id] = entry
         self.upsert_draft(module_id, manifest, updated_by=created_by)
         return copy.deepcopy(entry)
 
     def list_draft_versions(self, module_id: str) -> list[dict]:
-        return [copy.deepcopy(v) for v in self._draft_versions.get(module_id, [])]
+        return [copy.deepcopy(v) for v in reversed(self._draft_versions.get(module_id, []))]
 
     def get_draft_version(self, module_id: str, version_id: str) -> dict | None:
-        for entry in self._draft_versions.get(module_id, []):
-            if entry.get("id") == version_id:
-                return copy.deepcopy(entry)
-        return None
+        entry = self._draft_version_index.get(module_id, {}).get(version_id)
+        return copy.deepcopy(entry) if entry is not None else None
 
     def delete_draft(self, module_id: str) -> bool:
         if module_id in self._drafts:
             del self._drafts[module_id]
         if module_id in self._draft_versions:
             del self._draft_versions[module_id]
+        self._draft_version_index.pop(module_id, None)
         return True
         return False
 
@@ -325,6 +328,10 @@ class MemoryJobStore:
         self._jobs: Dict[str, dict] = {}
         self._events: Dict[str, List[dict]] = {}
 
+    def clear(self) -> None:
+        self._jobs.clear()
+        self._events.clear()
+
     def enqueue(self, job: dict) -> dict:
         record = copy.deepcopy(job)
         coalesce = bool(record.pop("coalesce", False))
@@ -776,6 +783,11 @@ class MemoryAutomationStore:
         self._runs: Dict[str, dict] = {}
         self._step_runs: Dict[str, dict] = {}
 
+    def clear(self) -> None:
+        self._automations.clear()
+        self._runs.clear()
+        self._step_runs.clear()
+
     def create(self, record: dict) -> dict:
         item = copy.deepcopy(record)
         item.setdefault("id", str(uuid.uuid4()))
@@ -23,7 +23,7 @@ if str(SRC) not in sys.path:
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from condition_eval import eval_condition
+from condition_eval import compile_condition, eval_condition
 
 def _load_env_file(path: Path) -> None:
     if not path.exists():
@@ -2217,13 +2217,14 @@ def _handle_system_action(action_id: str, inputs: dict, ctx: dict, job_store: Db
             if isinstance(shaped, dict)
         ]
         if isinstance(filter_expr, dict):
+            matches_filter = compile_condition(filter_expr)
             filtered = []
             for row in records:
                 record = row.get("record") if isinstance(row, dict) else None
                 if not isinstance(record, dict):
                     continue
                 try:
-                    if eval_condition(filter_expr, {"record": record, **ctx}):
+                    if matches_filter({"record": record, **ctx}):
                         filtered.append(row)
                 except Exception:
                     continue
@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 import math
+import operator
 from dataclasses import dataclass
-from typing import Any, Dict, List
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Tuple
 
 
 @dataclass
@@ -48,12 +50,22 @@ def _depth_check(depth: int, limit: int, path: str) -> None:
         raise ConditionDepthError("Depth limit exceeded", path)
 
 
+@lru_cache(maxsize=1024)
+def _var_parts(name: str) -> Tuple[str, ...]:
+    # Conditions are re-evaluated with the same var names against many
+    # contexts, so split each dotted path once.
+    return tuple(name.split("."))
+
+
 def _resolve_var(ctx: dict, name: str, path: str) -> Any:
     current: Any = ctx
-    for part in name.split("."):
-        if not isinstance(current, dict) or part not in current:
+    for part in _var_parts(name):
+        if not isinstance(current, dict):
             raise VarResolveError(f"Unresolved var: {name}", path)
-        current = current[part]
+        try:
+            current = current[part]
+        except KeyError:
+            raise VarResolveError(f"Unresolved var: {name}", path) from None
     return current
 
 
@@ -66,6 +78,10 @@ def _ensure_finite(value: Any, path: str) -> None:
         raise TypeErrorInCondition("Non-finite number", path)
 
 
+def _is_present(value: Any) -> bool:
+    return value is not None and value != "" and not (isinstance(value, list) and len(value) == 0)
+
+
 def _eval_value(node: Any, ctx: dict, path: str, depth: int, limit: int) -> Any:
     _depth_check(depth, limit, path)
     if not isinstance(node, dict):
@@ -98,9 +114,9 @@ def _eval_exists(node: Any, ctx: dict, path: str, depth: int, limit: int) -> boo
             value = _resolve_var(ctx, node["var"], path)
         except VarResolveError:
             return False
-        return value is not None and value != "" and not (isinstance(value, list) and len(value) == 0)
+        return _is_present(value)
     value = _eval_value(node, ctx, path, depth + 1, limit)
-    return value is not None and value != "" and not (isinstance(value, list) and len(value) == 0)
+    return _is_present(value)
 
 
 def _require_fields(cond: dict, fields: List[str], path: str) -> None:
@@ -115,6 +131,119 @@ def eval_condition(cond: dict, ctx: dict, depth_limit: int = 10) -> bool:
     return _eval_condition(cond, ctx, "$", 1, depth_limit)
 
 
+def _eval_logical(cond: dict, op: str, ctx: dict, path: str, depth: int, limit: int) -> bool:
+    _require_fields(cond, ["children"], path)
+    children = cond.get("children")
+    if not isinstance(children, list):
+        raise ConditionSchemaError("children must be list", f"{path}.children")
+    quantifier = all if op == "and" else any
+    return quantifier(
+        _eval_condition(child, ctx, f"{path}.children[{i}]", depth + 1, limit)
+        for i, child in enumerate(children)
+    )
+
+
+def _eval_not(cond: dict, op: str, ctx: dict, path: str, depth: int, limit: int) -> bool:
+    _require_fields(cond, ["children"], path)
+    children = cond.get("children")
+    if not isinstance(children, list) or len(children) != 1:
+        raise ConditionSchemaError("not requires single child", f"{path}.children")
+    return not _eval_condition(children[0], ctx, f"{path}.children[0]", depth + 1, limit)
+
+
+def _eval_operands(cond: dict, ctx: dict, path: str, depth: int, limit: int) -> Tuple[Any, Any]:
+    _require_fields(cond, ["left", "right"], path)
+    left = _eval_value(cond.get("left"), ctx, f"{path}.left", depth + 1, limit)
+    right = _eval_value(cond.get("right"), ctx, f"{path}.right", depth + 1, limit)
+    return left, right
+
+
+def _eval_equality(cond: dict, op: str, ctx: dict, path: str, depth: int, limit: int) -> bool:
+    left, right = _eval_operands(cond, ctx, path, depth, limit)
+    return left == right if op == "eq" else left != right
+
+
+def _eval_compare(cond: dict, op: str, ctx: dict, path: str, depth: int, limit: int) -> bool:
+    left, right = _eval_operands(cond, ctx, path, depth, limit)
+    if not (_is_number(left) and _is_number(right)):
+        raise TypeErrorInCondition("Comparison requires numbers", path)
+    _ensure_finite(left, f"{path}.left")
+    _ensure_finite(right, f"{path}.right")
+    return _COMPARATORS[op](left, right)
+
+
+def _eval_contains(cond: dict, op: str, ctx: dict, path: str, depth: int, limit: int) -> bool:
+    left, right = _eval_operands(cond, ctx, path, depth, limit)
+    if isinstance(left, str) and isinstance(right, str):
+        return right in left
+    if isinstance(left, list):
+        return right in left
+    raise TypeErrorInCondition("contains requires string or list left", path)
+
+
+def _eval_membership(cond: dict, op: str, ctx: dict, path: str, depth: int, limit: int) -> bool:
+    left, right = _eval_operands(cond, ctx, path, depth, limit)
+    if not isinstance(right, list):
+        raise TypeErrorInCondition("right must be list", f"{path}.right")
+    result = left in right
+    return result if op == "in" else not result
+
+
+def _eval_existence(cond: dict, op: str, ctx: dict, path: str, depth: int, limit: int) -> bool:
+    _require_fields(cond, ["left"], path)
+    exists = _eval_exists(cond.get("left"), ctx, f"{path}.left", depth + 1, limit)
+    return exists if op == "exists" else not exists
+
+
+def _eval_quantifier(cond: dict, op: str, ctx: dict, path: str, depth: int, limit: int) -> bool:
+    _require_fields(cond, ["over", "where"], path)
+    over = _eval_value(cond.get("over"), ctx, f"{path}.over", depth + 1, limit)
+    if not isinstance(over, list):
+        raise TypeErrorInCondition("over must be list", f"{path}.over")
+    where = cond.get("where")
+    if not isinstance(where, dict):
+        raise ConditionSchemaError("where must be condition", f"{path}.where")
+    if not over:
+        return False if op == "any" else True
+    # One child context is reused for every item: nothing keeps a reference
+    # to it past the call, and nested quantifiers take their own copy.
+    where_path = f"{path}.where"
+    child_ctx = dict(ctx)
+    results = []
+    for item in over:
+        child_ctx["item"] = item
+        results.append(_eval_condition(where, child_ctx, where_path, depth + 1, limit))
+    return any(results) if op == "any" else all(results)
+
+
+_COMPARATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "lt": operator.lt,
+    "lte": operator.le,
+}
+
+# One hash lookup per node instead of walking an if-chain of op names.
+_CONDITION_OPS: Dict[str, Callable[[dict, str, dict, str, int, int], bool]] = {
+    "and": _eval_logical,
+    "or": _eval_logical,
+    "not": _eval_not,
+    "eq": _eval_equality,
+    "neq": _eval_equality,
+    "gt": _eval_compare,
+    "gte": _eval_compare,
+    "lt": _eval_compare,
+    "lte": _eval_compare,
+    "contains": _eval_contains,
+    "in": _eval_membership,
+    "not_in": _eval_membership,
+    "exists": _eval_existence,
+    "not_exists": _eval_existence,
+    "all": _eval_quantifier,
+    "any": _eval_quantifier,
+}
+
+
 def _eval_condition(cond: Any, ctx: dict, path: str, depth: int, limit: int) -> bool:
     _depth_check(depth, limit, path)
     if not isinstance(cond, dict):
@@ -124,91 +253,275 @@ def _eval_condition(cond: Any, ctx: dict, path: str, depth: int, limit: int) ->
     if op is None:
         raise ConditionSchemaError("Missing op", path)
 
-    if op in {"and", "or"}:
-        _require_fields(cond, ["children"], path)
-        children = cond.get("children")
-        if not isinstance(children, list):
-            raise ConditionSchemaError("children must be list", f"{path}.children")
-        if op == "and":
-            return all(
-                _eval_condition(child, ctx, f"{path}.children[{i}]", depth + 1, limit)
-                for i, child in enumerate(children)
-            )
-        return any(
-            _eval_condition(child, ctx, f"{path}.children[{i}]", depth + 1, limit)
-            for i, child in enumerate(children)
-        )
-
-    if op == "not":
-        _require_fields(cond, ["children"], path)
-        children = cond.get("children")
-        if not isinstance(children, list) or len(children) != 1:
-            raise ConditionSchemaError("not requires single child", f"{path}.children")
-        return not _eval_condition(children[0], ctx, f"{path}.children[0]", depth + 1, limit)
-
-    if op in {"eq", "neq"}:
-        _require_fields(cond, ["left", "right"], path)
-        left = _eval_value(cond.get("left"), ctx, f"{path}.left", depth + 1, limit)
-        right = _eval_value(cond.get("right"), ctx, f"{path}.right", depth + 1, limit)
-        return left == right if op == "eq" else left != right
-
-    if op in {"gt", "gte", "lt", "lte"}:
-        _require_fields(cond, ["left", "right"], path)
-        left = _eval_value(cond.get("left"), ctx, f"{path}.left", depth + 1, limit)
-        right = _eval_value(cond.get("right"), ctx, f"{path}.right", depth + 1, limit)
-        if not (_is_number(left) and _is_number(right)):
-            raise TypeErrorInCondition("Comparison requires numbers", path)
-        _ensure_finite(left, f"{path}.left")
-        _ensure_finite(right, f"{path}.right")
-        if op == "gt":
-            return left > right
-        if op == "gte":
-            return left >= right
-        if op == "lt":
-            return left < right
-        return left <= right
+    handler = _CONDITION_OPS.get(op)
+    if handler is None:
+        raise UnknownOpError(f"Unknown op: {op}", path)
+    return handler(cond, op, ctx, path, depth, limit)
+
+
+# A compiled node: a closure over the pre-validated node that evaluates it
+# against a context. Conditions compile to predicates, value nodes to getters.
+_Compiled = Callable[[dict], Any]
+
+
+def _fail(error: type, *args: Any) -> _Compiled:
+    # Schema and depth problems are deferred to evaluation time, so a
+    # compiled condition raises exactly where and when the tree walk would
+    # (e.g. not at all inside an unreached "and" branch).
+    def run(ctx: dict) -> Any:
+        raise error(*args)
+
+    return run
+
+
+def _compile_var(name: str, path: str) -> _Compiled:
+    parts = _var_parts(name)
+
+    def resolve(ctx: dict) -> Any:
+        current: Any = ctx
+        for part in parts:
+            if not isinstance(current, dict):
+                raise VarResolveError(f"Unresolved var: {name}", path)
+            try:
+                current = current[part]
+            except KeyError:
+                raise VarResolveError(f"Unresolved var: {name}", path) from None
+        return current
+
+    return resolve
+
+
+def _compile_value(node: Any, path: str, depth: int, limit: int) -> _Compiled:
+    if depth > limit:
+        return _fail(ConditionDepthError, "Depth limit exceeded", path)
+    if not isinstance(node, dict):
+        return _fail(ConditionSchemaError, "Value node must be object", path)
+    if "var" in node:
+        if not isinstance(node["var"], str):
+            return _fail(ConditionSchemaError, "var must be string", path)
+        return _compile_var(node["var"], path)
+    if "literal" in node:
+        literal = node["literal"]
+        return lambda ctx: literal
+    if "array" in node:
+        arr = node["array"]
+        if not isinstance(arr, list):
+            return _fail(ConditionSchemaError, "array must be list", path)
+        items = [
+            _compile_value(item, f"{path}.array[{idx}]", depth + 1, limit)
+            for idx, item in enumerate(arr)
+        ]
+        return lambda ctx: [item(ctx) for item in items]
+    return _fail(ConditionSchemaError, "Invalid value node", path)
+
+
+def _compile_exists(node: Any, path: str, depth: int, limit: int) -> _Compiled:
+    if depth > limit:
+        return _fail(ConditionDepthError, "Depth limit exceeded", path)
+    if not isinstance(node, dict):
+        return _fail(ConditionSchemaError, "Value node must be object", path)
+    if "var" in node:
+        if not isinstance(node["var"], str):
+            return _fail(ConditionSchemaError, "var must be string", path)
+        resolve = _compile_var(node["var"], path)
+
+        def exists(ctx: dict) -> bool:
+            try:
+                value = resolve(ctx)
+            except VarResolveError:
+                return False
+            return _is_present(value)
+
+        return exists
+    value = _compile_value(node, path, depth + 1, limit)
+    return lambda ctx: _is_present(value(ctx))
+
+
+def _missing_field(cond: dict, fields: List[str]) -> str | None:
+    for field in fields:
+        if field not in cond:
+            return field
+    return None
+
+
+def compile_condition(cond: dict, depth_limit: int = 10) -> Callable[[dict], bool]:
+    """Compile a condition once into a predicate over contexts.
+
+    ``compile_condition(cond, limit)(ctx)`` behaves exactly like
+    ``eval_condition(cond, ctx, limit)``, including which error is raised,
+    but the tree is validated and var paths are split only once. Use it when
+    the same condition is evaluated against many contexts. The condition is
+    read at compile time; later changes to it are not seen.
+    """
+    predicate = _compile_condition(cond, "$", 1, depth_limit)
+
+    def run(ctx: dict) -> bool:
+        if not isinstance(ctx, dict):
+            raise ConditionSchemaError("ctx must be object", "$")
+        return predicate(ctx)
+
+    return run
+
+
+def _compile_logical(cond: dict, op: str, path: str, depth: int, limit: int) -> _Compiled:
+    missing = _missing_field(cond, ["children"])
+    if missing is not None:
+        return _fail(ConditionSchemaError, f"Missing required field: {missing}", path)
+    children = cond.get("children")
+    if not isinstance(children, list):
+        return _fail(ConditionSchemaError, "children must be list", f"{path}.children")
+    compiled = [
+        _compile_condition(child, f"{path}.children[{i}]", depth + 1, limit)
+        for i, child in enumerate(children)
+    ]
+    if op == "and":
+        return lambda ctx: all(child(ctx) for child in compiled)
+    return lambda ctx: any(child(ctx) for child in compiled)
+
+
+def _compile_not(cond: dict, op: str, path: str, depth: int, limit: int) -> _Compiled:
+    missing = _missing_field(cond, ["children"])
+    if missing is not None:
+        return _fail(ConditionSchemaError, f"Missing required field: {missing}", path)
+    children = cond.get("children")
+    if not isinstance(children, list) or len(children) != 1:
+        return _fail(ConditionSchemaError, "not requires single child", f"{path}.children")
+    child = _compile_condition(children[0], f"{path}.children[0]", depth + 1, limit)
+    return lambda ctx: not child(ctx)
+
+
+def _compile_binary(cond: dict, op: str, path: str, depth: int, limit: int) -> _Compiled:
+    missing = _missing_field(cond, ["left", "right"])
+    if missing is not None:
+        return _fail(ConditionSchemaError, f"Missing required field: {missing}", path)
+    left_path = f"{path}.left"
+    right_path = f"{path}.right"
+    left = _compile_value(cond.get("left"), left_path, depth + 1, limit)
+    right = _compile_value(cond.get("right"), right_path, depth + 1, limit)
+
+    if op == "eq":
+        return lambda ctx: left(ctx) == right(ctx)
+    if op == "neq":
+        return lambda ctx: left(ctx) != right(ctx)
+
+    if op in _COMPARATORS:
+        compare = _COMPARATORS[op]
+
+        def compare_numbers(ctx: dict) -> bool:
+            lhs = left(ctx)
+            rhs = right(ctx)
+            if not (_is_number(lhs) and _is_number(rhs)):
+                raise TypeErrorInCondition("Comparison requires numbers", path)
+            _ensure_finite(lhs, left_path)
+            _ensure_finite(rhs, right_path)
+            return compare(lhs, rhs)
+
+        return compare_numbers
 
     if op == "contains":
-        _require_fields(cond, ["left", "right"], path)
-        left = _eval_value(cond.get("left"), ctx, f"{path}.left", depth + 1, limit)
-        right = _eval_value(cond.get("right"), ctx, f"{path}.right", depth + 1, limit)
-        if isinstance(left, str) and isinstance(right, str):
-            return right in left
-        if isinstance(left, list):
-            return right in left
-        raise TypeErrorInCondition("contains requires string or list left", path)
-
-    if op in {"in", "not_in"}:
-        _require_fields(cond, ["left", "right"], path)
-        left = _eval_value(cond.get("left"), ctx, f"{path}.left", depth + 1, limit)
-        right = _eval_value(cond.get("right"), ctx, f"{path}.right", depth + 1, limit)
-        if not isinstance(right, list):
-            raise TypeErrorInCondition("right must be list", f"{path}.right")
-        result = left in right
-        return result if op == "in" else not result
-
-    if op in {"exists", "not_exists"}:
-        _require_fields(cond, ["left"], path)
-        exists = _eval_exists(cond.get("left"), ctx, f"{path}.left", depth + 1, limit)
-        return exists if op == "exists" else not exists
-
-    if op in {"all", "any"}:
-        _require_fields(cond, ["over", "where"], path)
-        over = _eval_value(cond.get("over"), ctx, f"{path}.over", depth + 1, limit)
-        if not isinstance(over, list):
-            raise TypeErrorInCondition("over must be list", f"{path}.over")
-        where = cond.get("where")
-        if not isinstance(where, dict):
-            raise ConditionSchemaError("where must be condition", f"{path}.where")
-        if not over:
-            return False if op == "any" else True
+
+        def contains(ctx: dict) -> bool:
+            lhs = left(ctx)
+            rhs = right(ctx)
+            if isinstance(lhs, str) and isinstance(rhs, str):
+                return rhs in lhs
+            if isinstance(lhs, list):
+                return rhs in lhs
+            raise TypeErrorInCondition("contains requires string or list left", path)
+
+        return contains
+
+    negate = op == "not_in"
+
+    def membership(ctx: dict) -> bool:
+        lhs = left(ctx)
+        rhs = right(ctx)
+        if not isinstance(rhs, list):
+            raise TypeErrorInCondition("right must be list", right_path)
+        return (lhs in rhs) is not negate
+
+    return membership
+
+
+def _compile_existence(cond: dict, op: str, path: str, depth: int, limit: int) -> _Compiled:
+    missing = _missing_field(cond, ["left"])
+    if missing is not None:
+        return _fail(ConditionSchemaError, f"Missing required field: {missing}", path)
+    exists = _compile_exists(cond.get("left"), f"{path}.left", depth + 1, limit)
+    if op == "exists":
+        return exists
+    return lambda ctx: not exists(ctx)
+
+
+def _compile_quantifier(cond: dict, op: str, path: str, depth: int, limit: int) -> _Compiled:
+    missing = _missing_field(cond, ["over", "where"])
+    if missing is not None:
+        return _fail(ConditionSchemaError, f"Missing required field: {missing}", path)
+    over_path = f"{path}.over"
+    where_path = f"{path}.where"
+    over = _compile_value(cond.get("over"), over_path, depth + 1, limit)
+    where_node = cond.get("where")
+    where = (
+        _compile_condition(where_node, where_path, depth + 1, limit)
+        if isinstance(where_node, dict)
+        else None
+    )
+    quantifier = any if op == "any" else all
+
+    def quantify(ctx: dict) -> bool:
+        items = over(ctx)
+        if not isinstance(items, list):
+            raise TypeErrorInCondition("over must be list", over_path)
+        if where is None:
+            raise ConditionSchemaError("where must be condition", where_path)
+        if not items:
+            return op == "all"
+        # Every item is evaluated, so an error in a later item is raised
+        # even when an earlier one already decides the result.
+        child_ctx = dict(ctx)
         results = []
-        for idx, item in enumerate(over):
-            child_ctx = dict(ctx)
+        for item in items:
             child_ctx["item"] = item
-            results.append(
-                _eval_condition(where, child_ctx, f"{path}.where", depth + 1, limit)
-            )
-        return any(results) if op == "any" else all(results)
+            results.append(where(child_ctx))
+        return quantifier(results)
+
+    return quantify
+
+
+_CONDITION_COMPILERS: Dict[str, Callable[[dict, str, str, int, int], _Compiled]] = {
+    "and": _compile_logical,
+    "or": _compile_logical,
+    "not": _compile_not,
+    "eq": _compile_binary,
+    "neq": _compile_binary,
+    "gt": _compile_binary,
+    "gte": _compile_binary,
+    "lt": _compile_binary,
+    "lte": _compile_binary,
+    "contains": _compile_binary,
+    "in": _compile_binary,
+    "not_in": _compile_binary,
+    "exists": _compile_existence,
+    "not_exists": _compile_existence,
+    "all": _compile_quantifier,
+    "any": _compile_quantifier,
+}
+
+
+def _compile_condition(cond: Any, path: str, depth: int, limit: int) -> _Compiled:
+    if depth > limit:
+        return _fail(ConditionDepthError, "Depth limit exceeded", path)
+    if not isinstance(cond, dict):
+        return _fail(ConditionSchemaError, "Condition must be object", path)
 
-    raise UnknownOpError(f"Unknown op: {op}", path)
+    op = cond.get("op")
+    if op is None:
+        return _fail(ConditionSchemaError, "Missing op", path)
+    try:
+        compiler = _CONDITION_COMPILERS.get(op)
+    except TypeError as exc:
+        # An unhashable op: the tree walk raises this when it reaches the node.
+        return _fail(TypeError, str(exc))
+    if compiler is None:
+        return _fail(UnknownOpError, f"Unknown op: {op}", path)
+    return compiler(cond, op, path, depth, limit)
@@ -6,7 +6,7 @@ import copy
 import uuid
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Callable, Dict, List
+from typing import Any, Callable, Dict, Tuple
 
 from octo.canonical_json import canonical_dumps
 
@@ -126,28 +126,35 @@ def make_event(name: str, payload: dict, meta: dict) -> Event:
 class EventBus:
     def __init__(self, outbox: "Outbox | None" = None) -> None:
         self._outbox = outbox
-        self._subs: Dict[str, List[Handler]] = {}
+        # Handler tuples are replaced, never mutated, so publish can iterate
+        # them without a copy even if a handler (un)subscribes mid-dispatch.
+        self._subs: Dict[str, Tuple[Handler, ...]] = {}
 
     def subscribe(self, name: str, handler: Handler) -> None:
-        self._subs.setdefault(name, []).append(handler)
+        self._subs[name] = self._subs.get(name, ()) + (handler,)
 
     def unsubscribe(self, name: str, handler: Handler) -> bool:
         handlers = self._subs.get(name)
         if not handlers:
             return False
         try:
-            handlers.remove(handler)
-            if not handlers:
-                del self._subs[name]
-            return True
+            idx = handlers.index(handler)
         except ValueError:
             return False
+        remaining = handlers[:idx] + handlers[idx + 1 :]
+        if remaining:
+            self._subs[name] = remaining
+        else:
+            del self._subs[name]
+        return True
 
     def publish(self, event: dict) -> None:
         validate_event(event)
         if self._outbox is not None:
-            self._outbox.enqueue(event)
-        for handler in self._subs.get(event["name"], []):
+            # The envelope schema is the same for every event name, so one
+            # validation here covers the outbox as well.
+            self._outbox.enqueue(event, assume_valid=True)
+        for handler in self._subs.get(event["name"], ()):
             try:
                 handler(event)
             except Exception:
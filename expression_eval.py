@@ -4,7 +4,8 @@ from __future__ import annotations
 
 import math
 from dataclasses import dataclass
-from typing import Any, Dict, List
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Tuple, Union
 
 import condition_eval
 
@@ -45,29 +46,65 @@ class ExprTypeError(ExpressionEvalError):
         super().__init__("EXPR_TYPE_ERROR", message, path)
 
 
-def _depth_check(depth: int, limit: int, path: str) -> None:
+_CASE_KEYS = frozenset(("expr", "cases", "else"))
+
+# Paths are only needed for error messages, so the recursion passes a lazy
+# (parent, name, index) chain and formats it when an error is raised.
+_Path = Union[str, Tuple[Any, str, Union[int, None]]]
+
+
+def _path_str(path: _Path) -> str:
+    parts: List[str] = []
+    while isinstance(path, tuple):
+        path, name, idx = path
+        parts.append(name if idx is None else f"{name}[{idx}]")
+    parts.append(path)
+    return "".join(reversed(parts))
+
+
+def _depth_check(depth: int, limit: int, path: _Path) -> None:
     if depth > limit:
-        raise ExpressionDepthError("Depth limit exceeded", path)
+        raise ExpressionDepthError("Depth limit exceeded", _path_str(path))
+
 
+@lru_cache(maxsize=1024)
+def _var_parts(name: str) -> Tuple[str, ...]:
+    return tuple(name.split("."))
 
-def _resolve_var(ctx: dict, name: str, path: str) -> Any:
+
+def _resolve_var(ctx: dict, name: str, path: _Path) -> Any:
     current: Any = ctx
-    for part in name.split("."):
-        if not isinstance(current, dict) or part not in current:
-            raise ExprVarResolveError(f"Unresolved var: {name}", path)
-        current = current[part]
+    for part in _var_parts(name):
+        if not isinstance(current, dict):
+            raise ExprVarResolveError(f"Unresolved var: {name}", _path_str(path))
+        try:
+            current = current[part]
+        except KeyError:
+            raise ExprVarResolveError(f"Unresolved var: {name}", _path_str(path)) from None
     return current
 
 
-def _ensure_no_nonfinite(value: Any, path: str) -> None:
-    if isinstance(value, float) and not math.isfinite(value):
-        raise ExprTypeError("Non-finite number", path)
+def _find_nonfinite(value: Any) -> str | None:
+    """Return the relative path of the first non-finite float, if any."""
+    if isinstance(value, float):
+        return None if math.isfinite(value) else ""
     if isinstance(value, list):
         for idx, item in enumerate(value):
-            _ensure_no_nonfinite(item, f"{path}[{idx}]")
+            found = _find_nonfinite(item)
+            if found is not None:
+                return f"[{idx}]{found}"
     elif isinstance(value, dict):
         for key, item in value.items():
-            _ensure_no_nonfinite(item, f"{path}.{key}")
+            found = _find_nonfinite(item)
+            if found is not None:
+                return f".{key}{found}"
+    return None
+
+
+def _ensure_no_nonfinite(value: Any, path: _Path) -> None:
+    found = _find_nonfinite(value)
+    if found is not None:
+        raise ExprTypeError("Non-finite number", _path_str(path) + found)
 
 
 def eval_expression(expr: dict, ctx: dict, depth_limit: int = 10) -> Any:
@@ -76,75 +113,87 @@ def eval_expression(expr: dict, ctx: dict, depth_limit: int = 10) -> Any:
     return _eval_expression(expr, ctx, "$", 1, depth_limit)
 
 
-def _eval_expression(expr: Any, ctx: dict, path: str, depth: int, limit: int) -> Any:
+def _eval_coalesce(expr: dict, ctx: dict, path: _Path, depth: int, limit: int) -> Any:
+    if len(expr) != 2 or "args" not in expr:
+        raise ExpressionSchemaError("coalesce has invalid keys", _path_str(path))
+    args = expr.get("args")
+    if not isinstance(args, list) or not args:
+        raise ExpressionSchemaError("args must be non-empty list", f"{_path_str(path)}.args")
+    for idx, arg in enumerate(args):
+        arg_path = (path, ".args", idx)
+        value = _eval_expression(arg, ctx, arg_path, depth + 1, limit)
+        _ensure_no_nonfinite(value, arg_path)
+        if value is not None:
+            return value
+    return None
+
+
+def _eval_case(expr: dict, ctx: dict, path: _Path, depth: int, limit: int) -> Any:
+    if not all(key in _CASE_KEYS for key in expr):
+        raise ExpressionSchemaError("case has invalid keys", _path_str(path))
+    cases = expr.get("cases")
+    if not isinstance(cases, list) or not cases:
+        raise ExpressionSchemaError("cases must be non-empty list", f"{_path_str(path)}.cases")
+    for idx, case in enumerate(cases):
+        case_path = (path, ".cases", idx)
+        if not isinstance(case, dict) or len(case) != 2 or "when" not in case or "then" not in case:
+            raise ExpressionSchemaError("case items require when and then", _path_str(case_path))
+        when = case.get("when")
+        try:
+            remaining = limit - depth + 1
+            if remaining < 1:
+                raise ExpressionDepthError("Depth limit exceeded", f"{_path_str(case_path)}.when")
+            matched = condition_eval.eval_condition(when, ctx, depth_limit=remaining)
+        except condition_eval.ConditionEvalError as exc:
+            raise ExpressionEvalError(
+                "EXPR_CONDITION_ERROR",
+                f"Condition error: {exc.code}",
+                f"{_path_str(case_path)}.when",
+            ) from exc
+        if matched:
+            then_path = (case_path, ".then", None)
+            value = _eval_expression(case.get("then"), ctx, then_path, depth + 1, limit)
+            _ensure_no_nonfinite(value, then_path)
+            return value
+    if "else" in expr:
+        else_path = (path, ".else", None)
+        value = _eval_expression(expr.get("else"), ctx, else_path, depth + 1, limit)
+        _ensure_no_nonfinite(value, else_path)
+        return value
+    return None
+
+
+# Handlers for {"expr": <name>, ...} nodes, dispatched with one hash lookup.
+_EXPRESSIONS: Dict[str, Callable[[dict, dict, _Path, int, int], Any]] = {
+    "coalesce": _eval_coalesce,
+    "case": _eval_case,
+}
+
+
+def _eval_expression(expr: Any, ctx: dict, path: _Path, depth: int, limit: int) -> Any:
     _depth_check(depth, limit, path)
     if not isinstance(expr, dict):
-        raise ExpressionSchemaError("Expression must be object", path)
+        raise ExpressionSchemaError("Expression must be object", _path_str(path))
 
-    keys = set(expr.keys())
+    n_keys = len(expr)
 
-    if keys == {"literal"}:
+    if n_keys == 1 and "literal" in expr:
         value = expr.get("literal")
         _ensure_no_nonfinite(value, path)
         return value
 
-    if keys == {"var"}:
+    if n_keys == 1 and "var" in expr:
         if not isinstance(expr.get("var"), str):
-            raise ExpressionSchemaError("var must be string", path)
+            raise ExpressionSchemaError("var must be string", _path_str(path))
         value = _resolve_var(ctx, expr["var"], path)
         _ensure_no_nonfinite(value, path)
         return value
 
     if "expr" in expr:
         expr_type = expr.get("expr")
-        if expr_type == "coalesce":
-            if keys != {"expr", "args"}:
-                raise ExpressionSchemaError("coalesce has invalid keys", path)
-            args = expr.get("args")
-            if not isinstance(args, list) or not args:
-                raise ExpressionSchemaError("args must be non-empty list", f"{path}.args")
-            for idx, arg in enumerate(args):
-                value = _eval_expression(arg, ctx, f"{path}.args[{idx}]", depth + 1, limit)
-                _ensure_no_nonfinite(value, f"{path}.args[{idx}]")
-                if value is not None:
-                    return value
-            return None
-
-        if expr_type == "case":
-            allowed = {"expr", "cases", "else"}
-            if not keys.issubset(allowed):
-                raise ExpressionSchemaError("case has invalid keys", path)
-            cases = expr.get("cases")
-            if not isinstance(cases, list) or not cases:
-                raise ExpressionSchemaError("cases must be non-empty list", f"{path}.cases")
-            for idx, case in enumerate(cases):
-                case_path = f"{path}.cases[{idx}]"
-                if not isinstance(case, dict) or set(case.keys()) != {"when", "then"}:
-                    raise ExpressionSchemaError("case items require when and then", case_path)
-                when = case.get("when")
-                try:
-                    remaining = limit - depth + 1
-                    if remaining < 1:
-                        raise ExpressionDepthError("Depth limit exceeded", f"{case_path}.when")
-                    matched = condition_eval.eval_condition(when, ctx, depth_limit=remaining)
-                except condition_eval.ConditionEvalError as exc:
-                    raise ExpressionEvalError(
-                        "EXPR_CONDITION_ERROR",
-                        f"Condition error: {exc.code}",
-                        f"{case_path}.when",
-                    ) from exc
-                if matched:
-                    value = _eval_expression(
-                        case.get("then"), ctx, f"{case_path}.then", depth + 1, limit
-                    )
-                    _ensure_no_nonfinite(value, f"{case_path}.then")
-                    return value
-            if "else" in expr:
-                value = _eval_expression(expr.get("else"), ctx, f"{path}.else", depth + 1, limit)
-                _ensure_no_nonfinite(value, f"{path}.else")
-                return value
-            return None
-
-        raise UnknownExprError(f"Unknown expr: {expr_type}", path)
-
-    raise ExpressionSchemaError("Invalid expression shape", path)
+        handler = _EXPRESSIONS.get(expr_type) if isinstance(expr_type, str) else None
+        if handler is None:
+            raise UnknownExprError(f"Unknown expr: {expr_type}", _path_str(path))
+        return handler(expr, ctx, path, depth, limit)
+
+    raise ExpressionSchemaError("Invalid expression shape", _path_str(path))
@@ -3,83 +3,103 @@
 from __future__ import annotations
 
 import copy
+import sys
 import uuid
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
+from octo.canonical_json import json_clone
 from octo.manifest_hash import manifest_hash
 
 
 Issue = Dict[str, Any]
 
 
+_TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
 def _now() -> str:
-    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return datetime.now(timezone.utc).strftime(_TIMESTAMP_FORMAT)
 
 
 def _issue(code: str, message: str, path: str | None = None, detail: dict | None = None) -> Issue:
     return {"code": code, "message": message, "path": path, "detail": detail}
 
 
+def _fail(code: str, message: str, path: str | None = None, from_hash: str | None = None) -> dict:
+    return {
+        "ok": False,
+        "errors": [_issue(code, message, path)],
+        "warnings": [],
+        "from_hash": from_hash,
+        "to_hash": None,
+        "audit_id": None,
+    }
+
+
+def _intern(value: Any) -> Any:
+    # Hashes and module ids are compared on every snapshot lookup; interning
+    # lets dict probes match on identity instead of a full string compare.
+    return sys.intern(value) if type(value) is str else value
+
+
 def _decode_segment(segment: str) -> str:
+    if "~" not in segment:
+        return segment
     return segment.replace("~1", "/").replace("~0", "~")
 
 
-def _parse_pointer(pointer: str) -> List[str]:
+Token = Tuple[str, Optional[int]]
+
+
+def _parse_pointer(pointer: str) -> List[Token]:
+    """Split a JSON Pointer into (segment, list index or None) pairs."""
     if pointer == "":
         return []
     parts = pointer.split("/")
     if parts and parts[0] == "":
         parts = parts[1:]
-    return [_decode_segment(p) for p in parts]
+    if "~" in pointer:
+        parts = [_decode_segment(p) for p in parts]
+    return [(p, int(p) if p.isascii() and p.isdigit() else None) for p in parts]
+
+
+def _step(current: Any, token: Token) -> Any:
+    segment, idx = token
+    if isinstance(current, dict):
+        if segment not in current:
+            raise KeyError("Missing object key")
+        return current[segment]
+    if isinstance(current, list):
+        if idx is None:
+            raise IndexError("Invalid list index")
+        if idx >= len(current):
+            raise IndexError("List index out of range")
+        return current[idx]
+    raise TypeError("Cannot traverse into non-container")
 
 
-def _get_container_and_token(doc: Any, pointer: str) -> Tuple[Any, str]:
+def _get_container_and_token(doc: Any, pointer: str) -> Tuple[Any, Token]:
     tokens = _parse_pointer(pointer)
     if not tokens:
-        return (None, "")
+        return (None, ("", None))
     current = doc
     for token in tokens[:-1]:
-        if isinstance(current, dict):
-            if token not in current:
-                raise KeyError("Missing object key")
-            current = current[token]
-        elif isinstance(current, list):
-            if not token.isdigit():
-                raise IndexError("Invalid list index")
-            idx = int(token)
-            if idx < 0 or idx >= len(current):
-                raise IndexError("List index out of range")
-            current = current[idx]
-        else:
-            raise TypeError("Cannot traverse into non-container")
+        current = _step(current, token)
     return current, tokens[-1]
 
 
 def _get_value(doc: Any, pointer: str) -> Any:
-    tokens = _parse_pointer(pointer)
     current = doc
-    for token in tokens:
-        if isinstance(current, dict):
-            if token not in current:
-                raise KeyError("Missing object key")
-            current = current[token]
-        elif isinstance(current, list):
-            if not token.isdigit():
-                raise IndexError("Invalid list index")
-            idx = int(token)
-            if idx < 0 or idx >= len(current):
-                raise IndexError("List index out of range")
-            current = current[idx]
-        else:
-            raise TypeError("Cannot traverse into non-container")
+    for token in _parse_pointer(pointer):
+        current = _step(current, token)
     return current
 
 
 def _apply_add(doc: Any, path: str, value: Any) -> None:
     if path == "":
         raise ValueError("Cannot add at document root")
-    container, token = _get_container_and_token(doc, path)
+    container, (token, idx) = _get_container_and_token(doc, path)
     if isinstance(container, dict):
         container[token] = value
         return
@@ -87,10 +107,9 @@ def _apply_add(doc: Any, path: str, value: Any) -> None:
         if token == "-":
             container.append(value)
             return
-        if not token.isdigit():
+        if idx is None:
             raise IndexError("Invalid list index")
-        idx = int(token)
-        if idx < 0 or idx > len(container):
+        if idx > len(container):
             raise IndexError("List index out of range")
         container.insert(idx, value)
         return
@@ -98,17 +117,16 @@ def _apply_add(doc: Any, path: str, value: Any) -> None:
 
 
 def _apply_remove(doc: Any, path: str) -> None:
-    container, token = _get_container_and_token(doc, path)
+    container, (token, idx) = _get_container_and_token(doc, path)
     if isinstance(container, dict):
         if token not in container:
             raise KeyError("Missing object key")
         del container[token]
         return
     if isinstance(container, list):
-        if not token.isdigit():
+        if idx is None:
             raise IndexError("Invalid list index")
-        idx = int(token)
-        if idx < 0 or idx >= len(container):
+        if idx >= len(container):
             raise IndexError("List index out of range")
         del container[idx]
         return
@@ -118,17 +136,16 @@ def _apply_remove(doc: Any, path: str) -> None:
 def _apply_replace(doc: Any, path: str, value: Any) -> None:
     if path == "":
         raise ValueError("Cannot replace document root")
-    container, token = _get_container_and_token(doc, path)
+    container, (token, idx) = _get_container_and_token(doc, path)
     if isinstance(container, dict):
         if token not in container:
             raise KeyError("Missing object key")
         container[token] = value
         return
     if isinstance(container, list):
-        if not token.isdigit():
+        if idx is None:
             raise IndexError("Invalid list index")
-        idx = int(token)
-        if idx < 0 or idx >= len(container):
+        if idx >= len(container):
             raise IndexError("List index out of range")
         container[idx] = value
         return
@@ -136,7 +153,13 @@ def _apply_replace(doc: Any, path: str, value: Any) -> None:
 
 
 def _apply_test(doc: Any, path: str, value: Any) -> None:
-    existing = _get_value(doc, path)
+    if path == "":
+        existing = doc
+    else:
+        container, token = _get_container_and_token(doc, path)
+        existing = _step(container, token)
+    if existing is value:
+        return
     if existing != value:
         raise ValueError("Test operation failed")
 
@@ -147,8 +170,13 @@ def _apply_move(doc: Any, from_path: str, path: str) -> None:
     _apply_add(doc, path, value)
 
 
+_IMMUTABLE_SCALARS = (str, int, float, bool, type(None))
+
+
 def _apply_copy(doc: Any, from_path: str, path: str) -> None:
-    value = copy.deepcopy(_get_value(doc, from_path))
+    value = _get_value(doc, from_path)
+    if type(value) not in _IMMUTABLE_SCALARS:
+        value = copy.deepcopy(value)
     _apply_add(doc, path, value)
 
 
@@ -174,49 +202,67 @@ def _apply_ops(doc: Any, ops: List[dict]) -> None:
 class ManifestStore:
     def __init__(self) -> None:
         self._snapshots: Dict[str, Dict[str, dict]] = {}
-        self._head: Dict[str, str] = {}
+        # module_id -> current head snapshot record (carries its manifest_hash).
+        self._head: Dict[str, dict] = {}
+        # Oldest-first so writes are appends; list_history reverses on read.
         self._audit: Dict[str, List[dict]] = {}
 
     def get_head(self, module_id: str) -> str | None:
-        return self._head.get(module_id)
+        record = self._head.get(module_id)
+        return record["manifest_hash"] if record is not None else None
+
+    def get_snapshot(self, module_id: str, manifest_hash_value: str, *, mutable: bool = True) -> dict:
+        """Return the manifest stored under a snapshot hash.
 
-    def get_snapshot(self, module_id: str, manifest_hash_value: str) -> dict:
-        record = self._snapshots.get(module_id, {}).get(manifest_hash_value)
+        Callers get their own copy by default. Pass ``mutable=False`` for
+        read-only use; the stored manifest is then returned as-is and must not
+        be mutated.
+        """
+        record = self._snapshots.get(module_id, {}).get(_intern(manifest_hash_value))
         if record is None:
             raise KeyError("Snapshot not found")
-        return copy.deepcopy(record["manifest"])
+        return json_clone(record["manifest"]) if mutable else record["manifest"]
 
     def list_history(self, module_id: str) -> list[dict]:
-        return list(self._audit.get(module_id, []))
+        return list(reversed(self._audit.get(module_id, ())))
 
     def list_snapshots(self, module_id: str) -> list[dict]:
+        # Snapshot dicts are kept in creation order (see _store_snapshot), so
+        # newest-first is a reverse walk rather than a sort.
         records = self._snapshots.get(module_id, {})
-        items = []
-        for manifest_hash_value, record in records.items():
-            items.append(
-                {
-                    "manifest_hash": manifest_hash_value,
-                    "created_at": record.get("created_at"),
-                    "created_by": record.get("created_by"),
-                    "reason": record.get("reason"),
-                }
-            )
-        items.sort(key=lambda r: r.get("created_at") or "", reverse=True)
-        return items
+        return [
+            {
+                "manifest_hash": manifest_hash_value,
+                "created_at": record.get("created_at"),
+                "created_by": record.get("created_by"),
+                "reason": record.get("reason"),
+            }
+            for manifest_hash_value, record in reversed(records.items())
+        ]
+
+    def _store_snapshot(self, module_id: str, record: dict) -> None:
+        snapshots = self._snapshots.setdefault(module_id, {})
+        # Re-storing an existing hash refreshes its timestamp, so move it to the end.
+        snapshots.pop(record["manifest_hash"], None)
+        snapshots[record["manifest_hash"]] = record
+        self._head[module_id] = record
 
     def init_module(self, module_id: str, manifest: dict, actor: dict | None = None, reason: str = "init") -> str:
-        manifest_copy = copy.deepcopy(manifest)
-        new_hash = manifest_hash(manifest_copy)
+        now = _now()
+        module_id = _intern(module_id)
+        # Hash the caller's object first so non-JSON input is rejected before
+        # json_clone, which only copies dicts and lists, could share it.
+        new_hash = _intern(manifest_hash(manifest))
+        manifest_copy = json_clone(manifest)
         record = {
             "module_id": module_id,
             "manifest_hash": new_hash,
             "manifest": manifest_copy,
-            "created_at": _now(),
+            "created_at": now,
             "created_by": actor,
             "reason": reason,
         }
-        self._snapshots.setdefault(module_id, {})[new_hash] = record
-        self._head[module_id] = new_hash
+        self._store_snapshot(module_id, record)
         audit = {
             "audit_id": str(uuid.uuid4()),
             "module_id": module_id,
@@ -226,86 +272,71 @@ class ManifestStore:
             "to_hash": new_hash,
             "actor": actor,
             "reason": reason,
-            "at": _now(),
+            "at": now,
         }
-        self._audit.setdefault(module_id, []).insert(0, audit)
+        self._audit.setdefault(module_id, []).append(audit)
         return new_hash
 
     def apply_approved_preview(self, approved: dict) -> dict:
-        errors: List[Issue] = []
-        warnings: List[Issue] = []
-
         if not isinstance(approved, dict):
-            errors.append(_issue("APPLY_INVALID", "approved must be object", "$"))
-            return {"ok": False, "errors": errors, "warnings": warnings, "from_hash": None, "to_hash": None, "audit_id": None}
+            return _fail("APPLY_INVALID", "approved must be object", "$")
 
         patch = approved.get("patch")
         preview = approved.get("preview")
         if not isinstance(patch, dict) or not isinstance(preview, dict):
-            errors.append(_issue("APPLY_INVALID", "patch and preview required", "$"))
-            return {"ok": False, "errors": errors, "warnings": warnings, "from_hash": None, "to_hash": None, "audit_id": None}
+            return _fail("APPLY_INVALID", "patch and preview required", "$")
 
         if preview.get("ok") is not True:
-            errors.append(_issue("APPLY_PREVIEW_NOT_OK", "preview.ok must be true", "preview.ok"))
-            return {"ok": False, "errors": errors, "warnings": warnings, "from_hash": None, "to_hash": None, "audit_id": None}
+            return _fail("APPLY_PREVIEW_NOT_OK", "preview.ok must be true", "preview.ok")
 
         if patch.get("mode") != "preview":
-            errors.append(_issue("APPLY_INVALID", "patch.mode must be preview", "patch.mode"))
-            return {"ok": False, "errors": errors, "warnings": warnings, "from_hash": None, "to_hash": None, "audit_id": None}
+            return _fail("APPLY_INVALID", "patch.mode must be preview", "patch.mode")
 
         module_id = patch.get("target_module_id")
         from_hash = patch.get("target_manifest_hash")
         if not isinstance(module_id, str) or not isinstance(from_hash, str):
-            errors.append(_issue("APPLY_INVALID", "module_id and from_hash required", "patch"))
-            return {"ok": False, "errors": errors, "warnings": warnings, "from_hash": None, "to_hash": None, "audit_id": None}
-
-        head = self._head.get(module_id)
-        if head != from_hash:
-            errors.append(_issue("APPLY_HASH_MISMATCH", "from_hash does not match head", "patch.target_manifest_hash"))
-            return {"ok": False, "errors": errors, "warnings": warnings, "from_hash": from_hash, "to_hash": None, "audit_id": None}
+            return _fail("APPLY_INVALID", "module_id and from_hash required", "patch")
 
-        current_record = self._snapshots.get(module_id, {}).get(from_hash)
-        if current_record is None:
-            errors.append(_issue("APPLY_UNKNOWN_HASH", "from_hash not found", "patch.target_manifest_hash"))
-            return {"ok": False, "errors": errors, "warnings": warnings, "from_hash": from_hash, "to_hash": None, "audit_id": None}
+        current_record = self._head.get(module_id)
+        if current_record is None or current_record["manifest_hash"] != from_hash:
+            return _fail("APPLY_HASH_MISMATCH", "from_hash does not match head", "patch.target_manifest_hash", from_hash)
 
         resolved_ops = preview.get("resolved_ops")
         if not isinstance(resolved_ops, list):
-            errors.append(_issue("APPLY_INVALID", "resolved_ops must be list", "preview.resolved_ops"))
-            return {"ok": False, "errors": errors, "warnings": warnings, "from_hash": from_hash, "to_hash": None, "audit_id": None}
+            return _fail("APPLY_INVALID", "resolved_ops must be list", "preview.resolved_ops", from_hash)
 
         for idx, op in enumerate(resolved_ops):
             if not isinstance(op, dict):
-                errors.append(_issue("APPLY_INVALID", "op must be object", f"preview.resolved_ops[{idx}]"))
-                return {"ok": False, "errors": errors, "warnings": warnings, "from_hash": from_hash, "to_hash": None, "audit_id": None}
+                return _fail("APPLY_INVALID", "op must be object", f"preview.resolved_ops[{idx}]", from_hash)
             for key in ("path", "from"):
                 if key in op and isinstance(op[key], str) and "@[id=" in op[key]:
-                    errors.append(_issue("APPLY_UNRESOLVED_SELECTOR", "selector segment found", f"preview.resolved_ops[{idx}].{key}"))
-                    return {"ok": False, "errors": errors, "warnings": warnings, "from_hash": from_hash, "to_hash": None, "audit_id": None}
+                    return _fail("APPLY_UNRESOLVED_SELECTOR", "selector segment found", f"preview.resolved_ops[{idx}].{key}", from_hash)
 
-        new_manifest = copy.deepcopy(current_record["manifest"])
+        new_manifest = json_clone(current_record["manifest"])
         try:
             _apply_ops(new_manifest, resolved_ops)
         except Exception as exc:
-            errors.append(_issue("APPLY_FAILED", str(exc), "preview.resolved_ops"))
-            return {"ok": False, "errors": errors, "warnings": warnings, "from_hash": from_hash, "to_hash": None, "audit_id": None}
+            return _fail("APPLY_FAILED", str(exc), "preview.resolved_ops", from_hash)
 
+        # A patch made only of "test" ops leaves the manifest untouched, so the
+        # head hash is still valid and the full canonical re-encode is skipped.
         try:
-            to_hash = manifest_hash(new_manifest)
+            if any(op.get("op") != "test" for op in resolved_ops):
+                to_hash = _intern(manifest_hash(new_manifest))
+            else:
+                to_hash = from_hash
         except Exception as exc:
-            errors.append(_issue("APPLY_MANIFEST_INVALID", str(exc), "manifest"))
-            return {"ok": False, "errors": errors, "warnings": warnings, "from_hash": from_hash, "to_hash": None, "audit_id": None}
+            return _fail("APPLY_MANIFEST_INVALID", str(exc), "manifest", from_hash)
 
         record = {
             "module_id": module_id,
             "manifest_hash": to_hash,
-            "manifest": copy.deepcopy(new_manifest),
+            "manifest": json_clone(new_manifest),
             "created_at": _now(),
             "created_by": approved.get("approved_by"),
             "reason": patch.get("reason"),
         }
-        self._snapshots.setdefault(module_id, {})[to_hash] = record
-        self._head[module_id] = to_hash
+        self._store_snapshot(module_id, record)
 
         audit_id = str(uuid.uuid4())
         audit = {
@@ -319,31 +350,28 @@ class ManifestStore:
             "reason": patch.get("reason"),
             "at": approved.get("approved_at"),
         }
-        self._audit.setdefault(module_id, []).insert(0, audit)
+        self._audit.setdefault(module_id, []).append(audit)
 
         return {
             "ok": True,
-            "errors": errors,
-            "warnings": warnings,
+            "errors": [],
+            "warnings": [],
             "from_hash": from_hash,
             "to_hash": to_hash,
             "audit_id": audit_id,
         }
 
     def rollback(self, module_id: str, to_hash: str, actor: dict, reason: str) -> dict:
-        errors: List[Issue] = []
-        warnings: List[Issue] = []
+        to_hash = _intern(to_hash)
 
         if module_id not in self._snapshots:
-            errors.append(_issue("ROLLBACK_UNKNOWN_MODULE", "module not found", "module_id"))
-            return {"ok": False, "errors": errors, "warnings": warnings, "from_hash": None, "to_hash": None, "audit_id": None}
+            return _fail("ROLLBACK_UNKNOWN_MODULE", "module not found", "module_id")
 
         if to_hash not in self._snapshots[module_id]:
-            errors.append(_issue("ROLLBACK_UNKNOWN_HASH", "hash not found", "to_hash"))
-            return {"ok": False, "errors": errors, "warnings": warnings, "from_hash": None, "to_hash": None, "audit_id": None}
+            return _fail("ROLLBACK_UNKNOWN_HASH", "hash not found", "to_hash")
 
-        from_hash = self._head.get(module_id)
-        self._head[module_id] = to_hash
+        from_hash = self.get_head(module_id)
+        self._head[module_id] = self._snapshots[module_id][to_hash]
 
         audit_id = str(uuid.uuid4())
         audit = {
@@ -357,12 +385,12 @@ class ManifestStore:
             "reason": reason,
             "at": _now(),
         }
-        self._audit.setdefault(module_id, []).insert(0, audit)
+        self._audit.setdefault(module_id, []).append(audit)
 
         return {
             "ok": True,
-            "errors": errors,
-            "warnings": warnings,
+            "errors": [],
+            "warnings": [],
             "from_hash": from_hash,
             "to_hash": to_hash,
             "audit_id": audit_id,
@@ -2,60 +2,162 @@
 
 from __future__ import annotations
 
-import copy
-import uuid
+import os
+from bisect import bisect_left
+from collections import deque
 from datetime import datetime, timezone
-from typing import Any, Dict, List
+from types import MappingProxyType
+from typing import Any, Deque, Dict, List, Mapping, Tuple
 
 from manifest_store import ManifestStore
+from octo.canonical_json import json_clone
 
 
 Issue = Dict[str, Any]
 
 
 def _now() -> str:
-    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    # Same output as strftime("%Y-%m-%dT%H:%M:%SZ") without the format parser.
+    dt = datetime.now(timezone.utc)
+    return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}T{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}Z"
+
+
+def _new_id() -> str:
+    # Random v4 UUID string built from os.urandom directly, skipping the
+    # uuid.UUID object that str(uuid.uuid4()) allocates and re-formats.
+    h = os.urandom(16).hex()
+    return f"{h[:8]}-{h[8:12]}-4{h[13:16]}-{'89ab'[int(h[16], 16) & 3]}{h[17:20]}-{h[20:]}"
 
 
 def _issue(code: str, message: str, path: str | None = None, detail: dict | None = None) -> Issue:
     return {"code": code, "message": message, "path": path, "detail": detail}
 
 
+def _new_record(module_id: str, name: str | None, enabled: bool, current_hash: str, now: str) -> dict:
+    return {
+        "module_id": module_id,
+        "name": name,
+        "enabled": enabled,
+        "current_hash": current_hash,
+        "installed_at": now,
+        "updated_at": now,
+        "tags": None,
+        "status": "installed",
+        "active_version": None,
+        "last_error": None,
+        "archived": False,
+    }
+
+
+def _clone_record(record: dict) -> dict:
+    # Module records are flat scalars; only ``tags`` may carry a list.
+    clone = dict(record)
+    tags = clone.get("tags")
+    if isinstance(tags, list):
+        clone["tags"] = list(tags)
+    return clone
+
+
+def _make_audit(
+    audit_id: str,
+    module_id: str,
+    action: str,
+    from_hash: str | None,
+    to_hash: str | None,
+    patch_id: str | None,
+    actor: dict | None,
+    reason: str | None,
+    at: str,
+    **extra: Any,
+) -> dict:
+    audit = {
+        "audit_id": audit_id,
+        "module_id": module_id,
+        "action": action,
+        "from_hash": from_hash,
+        "to_hash": to_hash,
+        "patch_id": patch_id,
+        "actor": actor,
+        "reason": reason,
+        "at": at,
+    }
+    if extra:
+        audit.update(extra)
+    return audit
+
+
+_HASH_PREFIX = "sha256:"
+
+
 def _is_hash(value: Any) -> bool:
-    return isinstance(value, str) and value.startswith("sha256:")
+    return isinstance(value, str) and value.startswith(_HASH_PREFIX)
 
 
 class ModuleRegistry:
-    def __init__(self, manifest_store: ManifestStore) -> None:
+    def __init__(self, manifest_store: ManifestStore, audit_cap: int | None = None) -> None:
         self._store = manifest_store
+        # Per-module audit retention; None keeps the full trail.
+        self._audit_cap = audit_cap
         self._modules: Dict[str, dict] = {}
-        self._audit: Dict[str, List[dict]] = {}
+        # Sorted ids of non-archived modules, maintained by _store_record.
+        self._active_ids: List[str] = []
+        # Newest-first per module; deque keeps the prepend O(1) and drops the
+        # oldest entries once audit_cap is reached.
+        self._audit: Dict[str, Deque[Mapping[str, Any]]] = {}
         self._versions: Dict[str, List[dict]] = {}
+        # Lookup indices over _versions; the hash index keeps the first
+        # version created for a hash, matching creation-order scans.
+        self._versions_by_id: Dict[Tuple[str, str], dict] = {}
+        self._versions_by_num: Dict[Tuple[str, int], dict] = {}
+        self._versions_by_hash: Dict[Tuple[str, str], dict] = {}
+        # Version entries only carry metadata; the (large) manifests live in
+        # this side table, stored once per (module_id, manifest_hash) and
+        # only materialized by list_versions.
+        self._version_manifests: Dict[Tuple[str, str], dict] = {}
         self._icons: Dict[str, str] = {}
 
     def get(self, module_id: str) -> dict | None:
         record = self._modules.get(module_id)
         if not record:
             return None
-        record = copy.deepcopy(record)
+        record = _clone_record(record)
         if module_id in self._icons:
             record["icon_key"] = self._icons[module_id]
         return record
 
     def list(self) -> list[dict]:
-        modules = []
-        for mid in sorted(self._modules.keys()):
-            record = self._modules[mid]
-            if record.get("archived"):
-                continue
-            rec = copy.deepcopy(record)
-            if mid in self._icons:
-                rec["icon_key"] = self._icons[mid]
-            modules.append(rec)
+        # _active_ids is already sorted and archive-filtered at write time.
+        records = self._modules
+        modules = [_clone_record(records[mid]) for mid in self._active_ids]
+        icons = self._icons
+        if icons:
+            for rec in modules:
+                mid = rec["module_id"]
+                if mid in icons:
+                    rec["icon_key"] = icons[mid]
         return modules
 
-    def history(self, module_id: str) -> list[dict]:
-        return list(self._audit.get(module_id, []))
+    def history(self, module_id: str) -> list[Mapping[str, Any]]:
+        return list(self._audit.get(module_id, ()))
+
+    def _store_record(self, module_id: str, record: dict) -> None:
+        self._modules[module_id] = record
+        ids = self._active_ids
+        idx = bisect_left(ids, module_id)
+        present = idx < len(ids) and ids[idx] == module_id
+        if record.get("archived"):
+            if present:
+                del ids[idx]
+        elif not present:
+            ids.insert(idx, module_id)
+
+    def _record_audit(self, module_id: str, audit: dict) -> None:
+        entries = self._audit.get(module_id)
+        if entries is None:
+            entries = self._audit[module_id] = deque(maxlen=self._audit_cap)
+        # Audit entries are immutable once written; freezing them here lets
+        # history() hand them out by reference.
+        entries.appendleft(MappingProxyType(audit))
 
     def register(self, module_id: str, name: str | None, actor: dict | None, reason: str = "register") -> dict:
         errors: List[Issue] = []
@@ -70,58 +172,66 @@ class ModuleRegistry:
             errors.append(_issue("MODULE_NO_MANIFEST_HEAD", "module has no manifest head", "module_id"))
             return {"ok": False, "errors": errors, "warnings": warnings, "module": None, "audit_id": None}
 
-        record = {
-            "module_id": module_id,
-            "name": name,
-            "enabled": False,
-            "current_hash": head,
-            "installed_at": _now(),
-            "updated_at": _now(),
-            "tags": None,
-            "status": "installed",
-            "active_version": None,
-            "last_error": None,
-            "archived": False,
-        }
-        self._modules[module_id] = copy.deepcopy(record)
-
-        audit_id = str(uuid.uuid4())
-        audit = {
-            "audit_id": audit_id,
-            "module_id": module_id,
-            "action": "register",
-            "from_hash": None,
-            "to_hash": head,
-            "patch_id": None,
-            "actor": actor,
-            "reason": reason,
-            "at": _now(),
-        }
-        self._audit.setdefault(module_id, []).insert(0, audit)
-
-        return {"ok": True, "errors": errors, "warnings": warnings, "module": copy.deepcopy(record), "audit_id": audit_id}
+        now = _now()
+        record = _new_record(module_id, name, False, head, now)
+        self._store_record(module_id, record)
+
+        audit_id = _new_id()
+        audit = _make_audit(
+            audit_id,
+            module_id,
+            action="register",
+            from_hash=None,
+            to_hash=head,
+            patch_id=None,
+            actor=actor,
+            reason=reason,
+            at=now,
+        )
+        self._record_audit(module_id, audit)
+
+        return {"ok": True, "errors": errors, "warnings": warnings, "module": _clone_record(record), "audit_id": audit_id}
 
     def list_versions(self, module_id: str) -> list[dict]:
-        return copy.deepcopy(self._versions.get(module_id, []))
+        versions = []
+        for version in self._versions.get(module_id, []):
+            item = json_clone(version)
+            item["manifest"] = json_clone(self._version_manifests[(module_id, version["manifest_hash"])])
+            versions.append(item)
+        return versions
 
     def _next_version_num(self, module_id: str) -> int:
-        versions = self._versions.get(module_id, [])
+        versions = self._versions.get(module_id)
         if not versions:
             return 1
-        return max(v.get("version_num", 0) for v in versions) + 1
+        # Versions are only ever appended with increasing numbers.
+        return versions[-1]["version_num"] + 1
 
-    def _create_version(self, module_id: str, manifest_hash: str, manifest: dict, actor: dict | None, notes: str | None) -> dict:
-        version_id = str(uuid.uuid4())
+    def _create_version(
+        self,
+        module_id: str,
+        manifest_hash: str,
+        manifest: dict,
+        actor: dict | None,
+        notes: str | None,
+        created_at: str | None = None,
+    ) -> dict:
+        version_id = _new_id()
         version = {
             "version_id": version_id,
             "version_num": self._next_version_num(module_id),
             "manifest_hash": manifest_hash,
-            "manifest": copy.deepcopy(manifest),
-            "created_at": _now(),
-            "created_by": copy.deepcopy(actor) if actor else None,
+            "created_at": created_at or _now(),
+            "created_by": json_clone(actor) if actor else None,
             "notes": notes,
         }
+        manifest_key = (module_id, manifest_hash)
+        if manifest_key not in self._version_manifests:
+            self._version_manifests[manifest_key] = json_clone(manifest)
         self._versions.setdefault(module_id, []).append(version)
+        self._versions_by_id[(module_id, version_id)] = version
+        self._versions_by_num[(module_id, version["version_num"])] = version
+        self._versions_by_hash.setdefault((module_id, manifest_hash), version)
         return version
 
     def _find_version(
@@ -132,14 +242,18 @@ class ModuleRegistry:
         version_num: int | None = None,
         manifest_hash: str | None = None,
     ) -> dict | None:
-        for version in self._versions.get(module_id, []):
-            if version_id and version.get("version_id") == version_id:
-                return copy.deepcopy(version)
-            if version_num and version.get("version_num") == version_num:
-                return copy.deepcopy(version)
-            if manifest_hash and version.get("manifest_hash") == manifest_hash:
-                return copy.deepcopy(version)
-        return None
+        matches = []
+        if version_id:
+            matches.append(self._versions_by_id.get((module_id, version_id)))
+        if version_num:
+            matches.append(self._versions_by_num.get((module_id, version_num)))
+        if manifest_hash:
+            matches.append(self._versions_by_hash.get((module_id, manifest_hash)))
+        found = [version for version in matches if version is not None]
+        if not found:
+            return None
+        # Several criteria may hit different versions; the oldest wins.
+        return json_clone(min(found, key=lambda version: version["version_num"]))
 
     def install(self, approved: dict) -> dict:
         return self._apply(approved, action="install", auto_register=True)
@@ -159,26 +273,27 @@ class ModuleRegistry:
         if record.get("enabled") == enabled:
             warnings.append(_issue("MODULE_ENABLED_NOOP", "no change", "enabled"))
 
-        record = copy.deepcopy(record)
+        now = _now()
+        record = _clone_record(record)
         record["enabled"] = enabled
-        record["updated_at"] = _now()
-        self._modules[module_id] = copy.deepcopy(record)
-
-        audit_id = str(uuid.uuid4())
-        audit = {
-            "audit_id": audit_id,
-            "module_id": module_id,
-            "action": "enable" if enabled else "disable",
-            "from_hash": record.get("current_hash"),
-            "to_hash": record.get("current_hash"),
-            "patch_id": None,
-            "actor": actor,
-            "reason": reason,
-            "at": _now(),
-        }
-        self._audit.setdefault(module_id, []).insert(0, audit)
-
-        return {"ok": True, "errors": errors, "warnings": warnings, "module": copy.deepcopy(record), "audit_id": audit_id}
+        record["updated_at"] = now
+        self._store_record(module_id, record)
+
+        audit_id = _new_id()
+        audit = _make_audit(
+            audit_id,
+            module_id,
+            action="enable" if enabled else "disable",
+            from_hash=record.get("current_hash"),
+            to_hash=record.get("current_hash"),
+            patch_id=None,
+            actor=actor,
+            reason=reason,
+            at=now,
+        )
+        self._record_audit(module_id, audit)
+
+        return {"ok": True, "errors": errors, "warnings": warnings, "module": _clone_record(record), "audit_id": audit_id}
 
     def set_icon(self, module_id: str, icon_key: str) -> None:
         self._icons[module_id] = icon_key
@@ -212,45 +327,51 @@ class ModuleRegistry:
                 errors.append(_issue("ROLLBACK_UNKNOWN_VERSION", "version not found", "to_version_id"))
                 return {"ok": False, "errors": errors, "warnings": warnings, "module": None, "audit_id": None}
             to_hash = target_version.get("manifest_hash")
-        if not isinstance(to_hash, str) or not _is_hash(to_hash):
+        if not _is_hash(to_hash):
             errors.append(_issue("ROLLBACK_INVALID_HASH", "to_hash must be a manifest hash", "to_hash"))
             return {"ok": False, "errors": errors, "warnings": warnings, "module": None, "audit_id": None}
 
-        store_result = self._store.rollback(module_id, to_hash, actor=actor, reason=reason)
-        if not store_result.get("ok"):
-            errors.extend(store_result.get("errors", []))
-            return {"ok": False, "errors": errors, "warnings": warnings, "module": None, "audit_id": None}
-
         from_hash = record.get("current_hash")
+        if from_hash == to_hash and self._store.get_head(module_id) == to_hash:
+            # Both the registry and the store already sit on the target, so
+            # there is nothing for the store to move.
+            store_result: dict = {"ok": True, "audit_id": None}
+        else:
+            store_result = self._store.rollback(module_id, to_hash, actor=actor, reason=reason)
+            if not store_result.get("ok"):
+                errors.extend(store_result.get("errors", []))
+                return {"ok": False, "errors": errors, "warnings": warnings, "module": None, "audit_id": None}
+
         if from_hash == to_hash:
             warnings.append(_issue("MODULE_ALREADY_AT_SNAPSHOT", "module already at requested snapshot", "to_hash"))
 
-        record = copy.deepcopy(record)
+        now = _now()
+        record = _clone_record(record)
         record["current_hash"] = to_hash
-        record["updated_at"] = _now()
+        record["updated_at"] = now
         record["status"] = "installed"
         record["last_error"] = None
         if not target_version:
             target_version = self._find_version(module_id, manifest_hash=to_hash)
         if target_version:
             record["active_version"] = target_version.get("version_id")
-        self._modules[module_id] = copy.deepcopy(record)
-
-        audit_id = store_result.get("audit_id") or str(uuid.uuid4())
-        audit = {
-            "audit_id": audit_id,
-            "module_id": module_id,
-            "action": "rollback",
-            "from_hash": from_hash,
-            "to_hash": to_hash,
-            "patch_id": None,
-            "actor": actor,
-            "reason": reason,
-            "at": _now(),
-        }
-        self._audit.setdefault(module_id, []).insert(0, audit)
-
-        return {"ok": True, "errors": errors, "warnings": warnings, "module": copy.deepcopy(record), "audit_id": audit_id}
+        self._store_record(module_id, record)
+
+        audit_id = store_result.get("audit_id") or _new_id()
+        audit = _make_audit(
+            audit_id,
+            module_id,
+            action="rollback",
+            from_hash=from_hash,
+            to_hash=to_hash,
+            patch_id=None,
+            actor=actor,
+            reason=reason,
+            at=now,
+        )
+        self._record_audit(module_id, audit)
+
+        return {"ok": True, "errors": errors, "warnings": warnings, "module": _clone_record(record), "audit_id": audit_id}
 
     def _apply(self, approved: dict, action: str, auto_register: bool) -> dict:
         errors: List[Issue] = []
@@ -282,60 +403,50 @@ class ModuleRegistry:
         if not store_result.get("ok"):
             errors.extend(store_result.get("errors", []))
             if record is not None:
-                record = copy.deepcopy(record)
+                record = _clone_record(record)
                 record["status"] = "failed"
                 record["last_error"] = errors[0]["message"] if errors else "apply failed"
                 record["updated_at"] = _now()
-                self._modules[module_id] = copy.deepcopy(record)
+                self._store_record(module_id, record)
             return {"ok": False, "errors": errors, "warnings": warnings, "module": None, "audit_id": None}
 
         to_hash = store_result.get("to_hash")
-        if not _is_hash(to_hash):
+        if not isinstance(to_hash, str) or not to_hash.startswith(_HASH_PREFIX):
             errors.append(_issue("MODULE_INVALID", "invalid to_hash", "to_hash"))
             return {"ok": False, "errors": errors, "warnings": warnings, "module": None, "audit_id": None}
 
-        manifest = self._store.get_snapshot(module_id, to_hash)
+        # Read in place: _create_version copies what it keeps.
+        manifest = self._store.get_snapshot(module_id, to_hash, mutable=False)
+        now = _now()
 
         if record is None:
-            record = {
-                "module_id": module_id,
-                "name": None,
-                "enabled": True,
-                "current_hash": to_hash,
-                "installed_at": _now(),
-                "updated_at": _now(),
-                "tags": None,
-                "status": "installed",
-                "active_version": None,
-                "last_error": None,
-                "archived": False,
-            }
+            record = _new_record(module_id, None, True, to_hash, now)
         else:
-            record = copy.deepcopy(record)
+            record = _clone_record(record)
             record["current_hash"] = to_hash
-            record["updated_at"] = _now()
+            record["updated_at"] = now
             if action == "install":
                 record["enabled"] = True
             record["status"] = "installed"
             record["last_error"] = None
 
-        version = self._create_version(module_id, to_hash, manifest, approved.get("approved_by"), notes=patch.get("reason"))
+        version = self._create_version(module_id, to_hash, manifest, approved.get("approved_by"), notes=patch.get("reason"), created_at=now)
         record["active_version"] = version.get("version_id")
-        self._modules[module_id] = copy.deepcopy(record)
-
-        audit_id = str(uuid.uuid4())
-        audit = {
-            "audit_id": audit_id,
-            "module_id": module_id,
-            "action": action,
-            "from_hash": store_result.get("from_hash"),
-            "to_hash": to_hash,
-            "patch_id": patch.get("patch_id"),
-            "transaction_group_id": patch.get("transaction_group_id"),
-            "actor": approved.get("approved_by"),
-            "reason": patch.get("reason"),
-            "at": _now(),
-        }
-        self._audit.setdefault(module_id, []).insert(0, audit)
-
-        return {"ok": True, "errors": errors, "warnings": warnings, "module": copy.deepcopy(record), "audit_id": audit_id}
+        self._store_record(module_id, record)
+
+        audit_id = _new_id()
+        audit = _make_audit(
+            audit_id,
+            module_id,
+            action=action,
+            from_hash=store_result.get("from_hash"),
+            to_hash=to_hash,
+            patch_id=patch.get("patch_id"),
+            actor=approved.get("approved_by"),
+            reason=patch.get("reason"),
+            at=now,
+            transaction_group_id=patch.get("transaction_group_id"),
+        )
+        self._record_audit(module_id, audit)
+
+        return {"ok": True, "errors": errors, "warnings": warnings, "module": _clone_record(record), "audit_id": audit_id}
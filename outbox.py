@@ -2,29 +2,51 @@
 
 from __future__ import annotations
 
-import copy
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator
 
 from event_bus import Event, validate_event
+from octo.canonical_json import json_clone
 
 
 class Outbox:
     def __init__(self) -> None:
-        self._events: List[Event] = []
-
-    def enqueue(self, event: dict) -> None:
-        validate_event(event)
-        self._events.append(copy.deepcopy(event))
+        # Keyed by meta.event_id; dicts keep insertion order, so pending()
+        # stays FIFO while ack() is a single pop.
+        self._events: Dict[str, Event] = {}
+
+    def enqueue(self, event: dict, *, copy: bool = True, assume_valid: bool = False) -> None:
+        """Queue a validated event.
+
+        Pass ``copy=False`` when the caller hands over a freshly built event
+        it will not touch again; the outbox then stores it as-is. Pass
+        ``assume_valid=True`` when the caller has just run ``validate_event``
+        on this exact event.
+        """
+        if not assume_valid:
+            validate_event(event)
+        self._events[event["meta"]["event_id"]] = json_clone(event) if copy else event
 
     def pending(self) -> list[dict]:
-        return list(self._events)
+        return list(self._events.values())
+
+    def pending_iter(self) -> Iterator[dict]:
+        """Iterate pending events without materializing a list.
+
+        The outbox must not be modified while the iterator is in use.
+        """
+        return iter(self._events.values())
 
     def ack(self, event_id: str) -> bool:
-        for idx, event in enumerate(self._events):
-            if event.get("meta", {}).get("event_id") == event_id:
-                del self._events[idx]
-                return True
-        return False
+        return self._events.pop(event_id, None) is not None
+
+    def ack_many(self, event_ids: Iterable[str]) -> int:
+        """Acknowledge several events; returns how many were pending."""
+        events = self._events
+        acked = 0
+        for event_id in event_ids:
+            if events.pop(event_id, None) is not None:
+                acked += 1
+        return acked
 
     def clear(self) -> None:
         self._events.clear()
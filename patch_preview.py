@@ -2,26 +2,58 @@
 
 from __future__ import annotations
 
-import copy
-from typing import Any, Dict, List, Tuple
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Tuple, Union
 
+from octo.canonical_json import json_clone
 from octo.manifest_hash import manifest_hash
 from octo.selector_path import (
+    ListIndexCache,
     PointerResolveError,
     SelectorNotFound,
     SelectorNotUnique,
     SelectorPathError,
     SelectorTypeError,
     resolve_selector_path,
+    resolve_selector_paths_batch,
 )
 
 
 Issue = Dict[str, Any]
 Rfc6902Op = Dict[str, Any]
 DiffSummary = Dict[str, Any]
+SelectorCache = Dict[str, Union[str, SelectorPathError]]
+# Containers created during simulation, keyed by id(); anything else is
+# shared with the caller's manifest and must be copied before mutation.
+Owned = Dict[int, Any]
+
+
+# Maps each allowed op name to the module's own (interned) string, so the
+# resolved ops carry a shared constant rather than the caller's string.
+_ALLOWED_OPS = {
+    name: name
+    for name in ("add", "remove", "replace", "move", "copy", "test", "add_field")
+}
+
+_REQUIRED_PATCH_FIELDS = (
+    "patch_id",
+    "target_module_id",
+    "target_manifest_hash",
+    "mode",
+    "reason",
+    "operations",
+)
 
-
-_ALLOWED_OPS = {"add", "remove", "replace", "move", "copy", "test", "add_field"}
+# Fields each RFC 6902 op needs beyond "path": (needs_value, needs_from,
+# message when missing). add_field is validated by _expand_add_field.
+_OP_SPEC: Dict[str, Tuple[bool, bool, str]] = {
+    "add": (True, False, "op requires path and value"),
+    "replace": (True, False, "op requires path and value"),
+    "test": (True, False, "op requires path and value"),
+    "remove": (False, False, "op requires path"),
+    "move": (False, True, "op requires path and from"),
+    "copy": (False, True, "op requires path and from"),
+}
 
 
 def _issue(
@@ -41,6 +73,8 @@ def _issue(
 
 
 def _decode_segment(segment: str) -> str:
+    if "~" not in segment:
+        return segment
     return segment.replace("~1", "/").replace("~0", "~")
 
 
@@ -50,107 +84,111 @@ def _parse_pointer(pointer: str) -> List[str]:
     segments = pointer.split("/")
     if segments and segments[0] == "":
         segments = segments[1:]
+    if "~" not in pointer:
+        return segments
     return [_decode_segment(seg) for seg in segments]
 
 
+@lru_cache(maxsize=1024)
 def _contains_numeric_segment(path: str) -> bool:
-    if path == "":
-        return False
-    segments = path.split("/")
-    if segments and segments[0] == "":
-        segments = segments[1:]
-    for seg in segments:
-        if seg.startswith("@[id=") and seg.endswith("]"):
-            continue
-        if _decode_segment(seg).isdigit():
-            return True
-    return False
+    # Escapes never decode to digits and selector segments start with "@",
+    # so the raw segments can be checked directly.
+    return any(seg.isdigit() for seg in path.split("/"))
+
+
+_SELECTOR_ERROR_CODES = (
+    (SelectorNotFound, "SELECTOR_NOT_FOUND"),
+    (SelectorNotUnique, "SELECTOR_NOT_UNIQUE"),
+    (SelectorTypeError, "SELECTOR_TYPE_ERROR"),
+    (PointerResolveError, "POINTER_RESOLVE_ERROR"),
+    (SelectorPathError, "SELECTOR_PATH_ERROR"),
+)
 
 
 def _resolve_path(
-    doc: Any, raw_path: str, op_index: int, errors: List[Issue]
+    doc: Any,
+    raw_path: str,
+    op_index: int,
+    errors: List[Issue],
+    cache: SelectorCache | None = None,
+    list_index_cache: ListIndexCache | None = None,
 ) -> str | None:
     if "@[id=" not in raw_path:
         return raw_path
-    try:
-        return resolve_selector_path(doc, raw_path)
-    except SelectorNotFound as exc:
-        errors.append(
-            _issue(
-                "SELECTOR_NOT_FOUND",
-                str(exc),
-                op_index=op_index,
-                path=raw_path,
-                resolved_path=exc.pointer_so_far,
-            )
-        )
-    except SelectorNotUnique as exc:
-        errors.append(
-            _issue(
-                "SELECTOR_NOT_UNIQUE",
-                str(exc),
-                op_index=op_index,
-                path=raw_path,
-                resolved_path=exc.pointer_so_far,
-            )
-        )
-    except SelectorTypeError as exc:
-        errors.append(
-            _issue(
-                "SELECTOR_TYPE_ERROR",
-                str(exc),
-                op_index=op_index,
-                path=raw_path,
-                resolved_path=exc.pointer_so_far,
-            )
-        )
-    except PointerResolveError as exc:
-        errors.append(
-            _issue(
-                "POINTER_RESOLVE_ERROR",
-                str(exc),
-                op_index=op_index,
-                path=raw_path,
-                resolved_path=exc.pointer_so_far,
-            )
-        )
-    except SelectorPathError as exc:
-        errors.append(
-            _issue(
-                "SELECTOR_PATH_ERROR",
-                str(exc),
-                op_index=op_index,
-                path=raw_path,
-                resolved_path=exc.pointer_so_far,
-            )
-        )
+    if cache is not None and raw_path in cache:
+        outcome = cache[raw_path]
+    else:
+        try:
+            outcome = resolve_selector_path(doc, raw_path, list_index_cache)
+        except SelectorPathError as exc:
+            outcome = exc
+        if cache is not None:
+            # Failures are cached too so a repeated bad selector reports the
+            # same issue for each op without walking the manifest again.
+            cache[raw_path] = outcome
+    if isinstance(outcome, str):
+        return outcome
+    errors.append(_selector_issue(outcome, op_index, raw_path))
     return None
 
 
-def _get_container_and_token(doc: Any, pointer: str) -> Tuple[Any, str]:
-    tokens = _parse_pointer(pointer)
+def _selector_issue(exc: SelectorPathError, op_index: int, raw_path: str) -> Issue:
+    for exc_type, code in _SELECTOR_ERROR_CODES:
+        if isinstance(exc, exc_type):
+            break
+    return _issue(
+        code,
+        str(exc),
+        op_index=op_index,
+        path=raw_path,
+        resolved_path=exc.pointer_so_far,
+    )
+
+
+def _own(container: Any, owned: Owned) -> Any:
+    """Return a shallow copy of ``container`` that is safe to mutate."""
+    if id(container) in owned:
+        return container
+    clone = dict(container) if isinstance(container, dict) else list(container)
+    owned[id(clone)] = clone
+    return clone
+
+
+def _get_container_and_token(
+    doc: Any, tokens: List[str], owned: Owned | None = None
+) -> Tuple[Any, str]:
+    """Walk to the parent of the pointer given as parsed ``tokens``.
+
+    With ``owned``, every container on the way is copied on first write so
+    the document being walked never mutates containers it shares with the
+    original manifest.
+    """
     if not tokens:
         return (None, "")
     current = doc
-    for token in tokens[:-1]:
+    for i in range(len(tokens) - 1):
+        token = tokens[i]
         if isinstance(current, dict):
             if token not in current:
                 raise KeyError("Missing object key")
-            current = current[token]
+            key: Any = token
         elif isinstance(current, list):
             if not token.isdigit():
                 raise IndexError("Invalid list index")
-            idx = int(token)
-            if idx < 0 or idx >= len(current):
+            key = int(token)
+            if key < 0 or key >= len(current):
                 raise IndexError("List index out of range")
-            current = current[idx]
         else:
             raise TypeError("Cannot traverse into non-container")
+        child = current[key]
+        if owned is not None and isinstance(child, (dict, list)):
+            child = _own(child, owned)
+            current[key] = child
+        current = child
     return current, tokens[-1]
 
 
-def _get_value(doc: Any, pointer: str) -> Any:
-    tokens = _parse_pointer(pointer)
+def _get_value(doc: Any, tokens: List[str]) -> Any:
     current = doc
     for token in tokens:
         if isinstance(current, dict):
@@ -169,10 +207,12 @@ def _get_value(doc: Any, pointer: str) -> Any:
     return current
 
 
-def _apply_add(doc: Any, path: str, value: Any) -> None:
-    if path == "":
+def _apply_add(
+    doc: Any, tokens: List[str], value: Any, owned: Owned | None = None
+) -> None:
+    if not tokens:
         raise ValueError("Cannot add at document root")
-    container, token = _get_container_and_token(doc, path)
+    container, token = _get_container_and_token(doc, tokens, owned)
     if isinstance(container, dict):
         container[token] = value
         return
@@ -190,8 +230,10 @@ def _apply_add(doc: Any, path: str, value: Any) -> None:
     raise TypeError("Cannot add into non-container")
 
 
-def _apply_remove(doc: Any, path: str) -> None:
-    container, token = _get_container_and_token(doc, path)
+def _apply_remove(
+    doc: Any, tokens: List[str], owned: Owned | None = None
+) -> None:
+    container, token = _get_container_and_token(doc, tokens, owned)
     if isinstance(container, dict):
         if token not in container:
             raise KeyError("Missing object key")
@@ -208,10 +250,12 @@ def _apply_remove(doc: Any, path: str) -> None:
     raise TypeError("Cannot remove from non-container")
 
 
-def _apply_replace(doc: Any, path: str, value: Any) -> None:
-    if path == "":
+def _apply_replace(
+    doc: Any, tokens: List[str], value: Any, owned: Owned | None = None
+) -> None:
+    if not tokens:
         raise ValueError("Cannot replace document root")
-    container, token = _get_container_and_token(doc, path)
+    container, token = _get_container_and_token(doc, tokens, owned)
     if isinstance(container, dict):
         if token not in container:
             raise KeyError("Missing object key")
@@ -228,25 +272,59 @@ def _apply_replace(doc: Any, path: str, value: Any) -> None:
     raise TypeError("Cannot replace in non-container")
 
 
-def _apply_test(doc: Any, path: str, value: Any) -> None:
-    existing = _get_value(doc, path)
+def _apply_test(doc: Any, tokens: List[str], value: Any) -> None:
+    existing = _get_value(doc, tokens)
     if existing != value:
         raise ValueError("Test operation failed")
 
 
-def _apply_move(doc: Any, from_path: str, path: str) -> None:
-    value = _get_value(doc, from_path)
-    _apply_remove(doc, from_path)
-    _apply_add(doc, path, value)
-
-
-def _apply_copy(doc: Any, from_path: str, path: str) -> None:
-    value = copy.deepcopy(_get_value(doc, from_path))
-    _apply_add(doc, path, value)
+def _apply_move(
+    doc: Any, from_tokens: List[str], tokens: List[str], owned: Owned | None = None
+) -> None:
+    value = _get_value(doc, from_tokens)
+    _apply_remove(doc, from_tokens, owned)
+    _apply_add(doc, tokens, value, owned)
+
+
+def _apply_copy(
+    doc: Any, from_tokens: List[str], tokens: List[str], owned: Owned | None = None
+) -> None:
+    # Containers are still copied in full: the source may already be owned,
+    # and sharing it would let a later write through one path show up at
+    # the other. Patches only ever write into dicts and lists, so
+    # json_clone sharing the leaves is safe here.
+    value = json_clone(_get_value(doc, from_tokens))
+    _apply_add(doc, tokens, value, owned)
+
+
+def _compile_op(op: Rfc6902Op, owned: Owned) -> Callable[[Any], None]:
+    """Bind a resolved op to its parsed pointers, ready to run on a document."""
+    op_name = op["op"]
+    tokens = _parse_pointer(op["path"])
+    if op_name == "add":
+        value = op["value"]
+        return lambda doc: _apply_add(doc, tokens, value, owned)
+    if op_name == "remove":
+        return lambda doc: _apply_remove(doc, tokens, owned)
+    if op_name == "replace":
+        value = op["value"]
+        return lambda doc: _apply_replace(doc, tokens, value, owned)
+    if op_name == "test":
+        value = op["value"]
+        return lambda doc: _apply_test(doc, tokens, value)
+    from_tokens = _parse_pointer(op["from"])
+    if op_name == "move":
+        return lambda doc: _apply_move(doc, from_tokens, tokens, owned)
+    return lambda doc: _apply_copy(doc, from_tokens, tokens, owned)
 
 
 def _expand_add_field(
-    manifest: Any, op: Dict[str, Any], op_index: int, errors: List[Issue]
+    manifest: Any,
+    op: Dict[str, Any],
+    op_index: int,
+    errors: List[Issue],
+    selector_cache: SelectorCache | None = None,
+    list_index_cache: ListIndexCache | None = None,
 ) -> List[Rfc6902Op]:
     entity_id = op.get("entity_id")
     after_field_id = op.get("after_field_id")
@@ -263,19 +341,19 @@ def _expand_add_field(
         return []
 
     fields_selector = f"/entities/@[id={entity_id}]/fields"
-    resolved_fields_path = _resolve_path(manifest, fields_selector, op_index, errors)
-    if resolved_fields_path is None:
-        return []
-
-    after_selector = (
-        f"/entities/@[id={entity_id}]/fields/@[id={after_field_id}]"
+    resolved_fields_path = _resolve_path(
+        manifest,
+        fields_selector,
+        op_index,
+        errors,
+        selector_cache,
+        list_index_cache,
     )
-    resolved_after_path = _resolve_path(manifest, after_selector, op_index, errors)
-    if resolved_after_path is None:
+    if resolved_fields_path is None:
         return []
 
     try:
-        fields_list = _get_value(manifest, resolved_fields_path)
+        fields_list = _get_value(manifest, _parse_pointer(resolved_fields_path))
     except Exception as exc:  # pragma: no cover - defensive
         errors.append(
             _issue(
@@ -288,6 +366,22 @@ def _expand_add_field(
         )
         return []
 
+    # Resolve the after-field selector against the fields list itself rather
+    # than walking the entity selector a second time from the manifest root.
+    after_selector = (
+        f"/entities/@[id={entity_id}]/fields/@[id={after_field_id}]"
+    )
+    try:
+        after_suffix = resolve_selector_path(
+            fields_list, f"/@[id={after_field_id}]", list_index_cache
+        )
+    except SelectorPathError as exc:
+        # Report the failure as if the full selector had been walked.
+        exc = type(exc)(exc.message, exc.segment, resolved_fields_path + exc.pointer_so_far)
+        errors.append(_selector_issue(exc, op_index, after_selector))
+        return []
+    resolved_after_path = resolved_fields_path + after_suffix
+
     if not isinstance(fields_list, list):
         errors.append(
             _issue(
@@ -300,8 +394,10 @@ def _expand_add_field(
         )
         return []
 
-    tokens = _parse_pointer(resolved_after_path)
-    if not tokens or not tokens[-1].isdigit():
+    # Selector segments resolve to plain numeric indices, so only the last
+    # segment is needed; no decoding applies.
+    last_segment = resolved_after_path.rsplit("/", 1)[-1]
+    if not last_segment.isdigit():
         errors.append(
             _issue(
                 "ADD_FIELD_INVALID",
@@ -313,12 +409,40 @@ def _expand_add_field(
         )
         return []
 
-    insert_index = int(tokens[-1]) + 1
+    insert_index = int(last_segment) + 1
     resolved_insert_path = f"{resolved_fields_path}/{insert_index}"
 
     return [{"op": "add", "path": resolved_insert_path, "value": field}]
 
 
+def _collect_selector_paths(operations: List[Any]) -> List[str]:
+    """Return the distinct selector paths the ops may need resolved.
+
+    Ops are not validated here; resolving a path for an op that is later
+    rejected is harmless because errors are only reported when an op asks
+    for its path.
+    """
+    paths: Dict[str, None] = {}
+    for op in operations:
+        if not isinstance(op, dict):
+            continue
+        op_name = op.get("op")
+        if op_name == "add_field":
+            entity_id = op.get("entity_id")
+            if isinstance(entity_id, str):
+                paths[f"/entities/@[id={entity_id}]/fields"] = None
+            continue
+        if not isinstance(op_name, str) or op_name not in _OP_SPEC:
+            continue
+        candidates = [op.get("path")]
+        if _OP_SPEC[op_name][1]:
+            candidates.append(op.get("from"))
+        for candidate in candidates:
+            if isinstance(candidate, str) and "@[id=" in candidate:
+                paths[candidate] = None
+    return list(paths)
+
+
 def _is_protected_path(pointer: str) -> bool:
     return pointer.startswith("/module/id") or pointer.startswith("/module/requires")
 
@@ -351,7 +475,14 @@ def _classify_impact(ops: List[Rfc6902Op]) -> str | None:
     return None
 
 
-def preview_patch(manifest: Any, patch: Any) -> Dict[str, Any]:
+def preview_patch(
+    manifest: Any, patch: Any, *, current_hash: str | None = None
+) -> Dict[str, Any]:
+    """Validate ``patch`` against ``manifest`` and dry-run it.
+
+    Callers previewing several patches against one manifest can pass its
+    ``current_hash`` (as returned by ``manifest_hash``) to skip rehashing.
+    """
     errors: List[Issue] = []
     warnings: List[Issue] = []
     resolved_ops: List[Rfc6902Op] = []
@@ -369,15 +500,7 @@ def preview_patch(manifest: Any, patch: Any) -> Dict[str, Any]:
             "diff_summary": _diff_summary([]),
         }
 
-    required_fields = [
-        "patch_id",
-        "target_module_id",
-        "target_manifest_hash",
-        "mode",
-        "reason",
-        "operations",
-    ]
-    for field in required_fields:
+    for field in _REQUIRED_PATCH_FIELDS:
         if field not in patch:
             errors.append(
                 _issue(
@@ -423,7 +546,8 @@ def preview_patch(manifest: Any, patch: Any) -> Dict[str, Any]:
             "diff_summary": _diff_summary([]),
         }
 
-    current_hash = manifest_hash(manifest)
+    if current_hash is None:
+        current_hash = manifest_hash(manifest)
     if patch.get("target_manifest_hash") != current_hash:
         errors.append(
             _issue(
@@ -440,6 +564,18 @@ def preview_patch(manifest: Any, patch: Any) -> Dict[str, Any]:
             "diff_summary": _diff_summary([]),
         }
 
+    # The manifest is not mutated until simulation, so a selector resolves
+    # to the same pointer (or error) for every op in this call and list id
+    # indexes stay valid across ops.
+    selector_cache: SelectorCache = {}
+    list_index_cache: ListIndexCache = {}
+    selector_paths = _collect_selector_paths(operations)
+    selector_cache.update(
+        zip(
+            selector_paths,
+            resolve_selector_paths_batch(manifest, selector_paths, list_index_cache),
+        )
+    )
     for idx, op in enumerate(operations):
         if not isinstance(op, dict):
             errors.append(
@@ -451,54 +587,43 @@ def preview_patch(manifest: Any, patch: Any) -> Dict[str, Any]:
             )
             continue
 
-        op_name = op.get("op")
-        if op_name not in _ALLOWED_OPS:
+        raw_op_name = op.get("op")
+        if raw_op_name not in _ALLOWED_OPS:
             errors.append(
                 _issue(
                     "OP_UNSUPPORTED",
-                    f"Unsupported op: {op_name}",
+                    f"Unsupported op: {raw_op_name}",
                     op_index=idx,
                 )
             )
             continue
+        op_name = _ALLOWED_OPS[raw_op_name]
 
         if op_name == "add_field":
-            resolved_ops.extend(_expand_add_field(manifest, op, idx, errors))
+            resolved_ops.extend(
+                _expand_add_field(
+                    manifest, op, idx, errors, selector_cache, list_index_cache
+                )
+            )
             continue
 
         path = op.get("path")
         from_path = op.get("from")
 
-        if op_name in {"add", "replace", "test"}:
-            if path is None or "value" not in op:
-                errors.append(
-                    _issue(
-                        "OP_MISSING_FIELD",
-                        "op requires path and value",
-                        op_index=idx,
-                    )
-                )
-                continue
-        if op_name == "remove":
-            if path is None:
-                errors.append(
-                    _issue(
-                        "OP_MISSING_FIELD",
-                        "op requires path",
-                        op_index=idx,
-                    )
-                )
-                continue
-        if op_name in {"move", "copy"}:
-            if path is None or from_path is None:
-                errors.append(
-                    _issue(
-                        "OP_MISSING_FIELD",
-                        "op requires path and from",
-                        op_index=idx,
-                    )
+        needs_value, needs_from, missing_message = _OP_SPEC[op_name]
+        if (
+            path is None
+            or (needs_value and "value" not in op)
+            or (needs_from and from_path is None)
+        ):
+            errors.append(
+                _issue(
+                    "OP_MISSING_FIELD",
+                    missing_message,
+                    op_index=idx,
                 )
-                continue
+            )
+            continue
 
         if isinstance(path, str) and _contains_numeric_segment(path):
             errors.append(
@@ -524,12 +649,16 @@ def preview_patch(manifest: Any, patch: Any) -> Dict[str, Any]:
         resolved_path = None
         resolved_from = None
         if isinstance(path, str):
-            resolved_path = _resolve_path(manifest, path, idx, errors)
-        if op_name in {"move", "copy"} and isinstance(from_path, str):
-            resolved_from = _resolve_path(manifest, from_path, idx, errors)
+            resolved_path = _resolve_path(
+                manifest, path, idx, errors, selector_cache, list_index_cache
+            )
+        if needs_from and isinstance(from_path, str):
+            resolved_from = _resolve_path(
+                manifest, from_path, idx, errors, selector_cache, list_index_cache
+            )
 
         if (path is not None and resolved_path is None) or (
-            op_name in {"move", "copy"} and from_path is not None and resolved_from is None
+            needs_from and from_path is not None and resolved_from is None
         ):
             continue
 
@@ -556,13 +685,16 @@ def preview_patch(manifest: Any, patch: Any) -> Dict[str, Any]:
             )
             continue
 
-        normalized: Rfc6902Op = {"op": op_name}
-        if op_name in {"add", "replace", "test"}:
-            normalized.update({"path": resolved_path, "value": op["value"]})
-        elif op_name == "remove":
-            normalized.update({"path": resolved_path})
-        elif op_name in {"move", "copy"}:
-            normalized.update({"from": resolved_from, "path": resolved_path})
+        if needs_value:
+            normalized: Rfc6902Op = {
+                "op": op_name,
+                "path": resolved_path,
+                "value": op["value"],
+            }
+        elif needs_from:
+            normalized = {"op": op_name, "from": resolved_from, "path": resolved_path}
+        else:
+            normalized = {"op": op_name, "path": resolved_path}
 
         resolved_ops.append(normalized)
 
@@ -576,29 +708,25 @@ def preview_patch(manifest: Any, patch: Any) -> Dict[str, Any]:
             "diff_summary": _diff_summary(resolved_ops),
         }
 
-    simulated = copy.deepcopy(manifest)
-    for idx, op in enumerate(resolved_ops):
+    # Copy-on-write: only containers along touched paths are copied, the
+    # rest of the simulated document is shared with ``manifest``.
+    owned: Owned = {}
+    simulated = manifest
+    if isinstance(manifest, (dict, list)):
+        simulated = _own(manifest, owned)
+    compiled = [_compile_op(op, owned) for op in resolved_ops]
+    for idx, apply_op in enumerate(compiled):
         try:
-            if op["op"] == "add":
-                _apply_add(simulated, op["path"], op["value"])
-            elif op["op"] == "remove":
-                _apply_remove(simulated, op["path"])
-            elif op["op"] == "replace":
-                _apply_replace(simulated, op["path"], op["value"])
-            elif op["op"] == "test":
-                _apply_test(simulated, op["path"], op["value"])
-            elif op["op"] == "move":
-                _apply_move(simulated, op["from"], op["path"])
-            elif op["op"] == "copy":
-                _apply_copy(simulated, op["from"], op["path"])
+            apply_op(simulated)
         except Exception as exc:
+            failed_path = resolved_ops[idx].get("path")
             errors.append(
                 _issue(
                     "SIMULATION_ERROR",
                     f"Simulation failed: {exc}",
                     op_index=idx,
-                    path=op.get("path"),
-                    resolved_path=op.get("path"),
+                    path=failed_path,
+                    resolved_path=failed_path,
                 )
             )
 
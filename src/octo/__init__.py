@@ -1,10 +1,11 @@
 """OCTO kernel utilities."""
 
-from .canonical_json import CanonicalJsonTypeError, canonical_dumps
+from .canonical_json import CanonicalJsonTypeError, canonical_dumps, json_clone
 from .manifest_hash import manifest_hash
 
 __all__ = [
     "CanonicalJsonTypeError",
     "canonical_dumps",
+    "json_clone",
     "manifest_hash",
 ]
@@ -4,40 +4,110 @@ from __future__ import annotations
 
 import json
 import math
-from typing import Any
+import sys
+from typing import Any, List, Optional, Tuple, Union
 
 
 class CanonicalJsonTypeError(TypeError):
     """Raised when an object cannot be serialized to canonical JSON."""
 
 
-def _validate(obj: Any, path: str = "$") -> None:
-    if isinstance(obj, dict):
-        for key, value in obj.items():
-            if not isinstance(key, str):
-                raise CanonicalJsonTypeError(
-                    f"Unsupported key type at {path}: {type(key).__name__}"
+# A validation path is a linked chain of (parent, key) pairs, rooted at None;
+# it is only rendered to a "$.a[0]" string when an error is raised.
+_Path = Optional[Tuple[Any, Union[str, int]]]
+
+
+def _format_path(path: _Path) -> str:
+    parts: List[str] = []
+    while path is not None:
+        path, key = path
+        parts.append(f".{key}" if isinstance(key, str) else f"[{key}]")
+    return "$" + "".join(reversed(parts))
+
+
+def _validate(obj: Any) -> None:
+    # Explicit worklist instead of recursion. Children are pushed in reverse
+    # so the first error reported is the same one a depth-first recursive
+    # walk would find. Nesting is still capped at the recursion limit, as
+    # the encoder is, so a circular structure fails instead of looping.
+    max_depth = sys.getrecursionlimit()
+    stack: List[Tuple[Any, _Path, bool, int]] = [(obj, None, False, 0)]
+    while stack:
+        current, path, is_key, depth = stack.pop()
+        if depth > max_depth:
+            raise RecursionError(f"Nesting too deep at {_format_path(path)}")
+        if is_key:
+            raise CanonicalJsonTypeError(
+                f"Unsupported key type at {_format_path(path)}: {type(current).__name__}"
+            )
+        kind = type(current)
+        if kind is str or kind is int or kind is bool or current is None:
+            continue
+        if kind is dict or isinstance(current, dict):
+            children = []
+            for key, value in current.items():
+                if not isinstance(key, str):
+                    children.append((key, path, True, depth))
+                    break
+                children.append((value, (path, key), False, depth + 1))
+            children.reverse()
+            stack.extend(children)
+            continue
+        if kind is list or isinstance(current, list):
+            stack.extend(
+                (current[idx], (path, idx), False, depth + 1)
+                for idx in range(len(current) - 1, -1, -1)
+            )
+            continue
+        if isinstance(current, float):
+            if not math.isfinite(current):
+                raise ValueError(
+                    f"Non-finite float at {_format_path(path)}: {current!r}"
                 )
-            _validate(value, f"{path}.{key}")
-        return
-    if isinstance(obj, list):
-        for idx, item in enumerate(obj):
-            _validate(item, f"{path}[{idx}]")
-        return
-    if obj is None:
-        return
-    if isinstance(obj, float):
-        if not math.isfinite(obj):
-            raise ValueError(f"Non-finite float at {path}: {obj!r}")
-        return
-    if isinstance(obj, (str, int, bool)):
-        return
-    raise CanonicalJsonTypeError(
-        f"Unsupported type at {path}: {type(obj).__name__}"
+            continue
+        if isinstance(current, (str, int, bool)):
+            continue
+        raise CanonicalJsonTypeError(
+            f"Unsupported type at {_format_path(path)}: {type(current).__name__}"
+        )
+
+
+def _reject_unsupported(obj: Any) -> Any:
+    raise CanonicalJsonTypeError(f"Unsupported type: {type(obj).__name__}")
+
+
+_ENCODER = json.JSONEncoder(
+    sort_keys=True,
+    ensure_ascii=False,
+    separators=(",", ":"),
+    allow_nan=False,
+    default=_reject_unsupported,
+)
+
+# JSONEncoder.encode builds a fresh C encoder on every call, which dominates
+# the cost for small documents, so build one up front with the same settings.
+# It is created without a markers dict: a dict shared across calls (and
+# threads) would keep stale entries after a failed encode. A circular
+# structure then fails with RecursionError instead of ValueError.
+_c_make_encoder = getattr(json.encoder, "c_make_encoder", None)
+_C_ENCODE = (
+    _c_make_encoder(
+        None,
+        _reject_unsupported,
+        json.encoder.encode_basestring,
+        None,
+        _ENCODER.key_separator,
+        _ENCODER.item_separator,
+        True,
+        False,
+        False,
     )
+    if _c_make_encoder is not None
+    else None
+)
 
 
-def canonical_dumps(obj: Any) -> str:
+def canonical_dumps(obj: Any, *, trusted: bool = False) -> str:
     """Serialize an object to deterministic canonical JSON.
 
     Rules:
@@ -45,12 +115,31 @@ def canonical_dumps(obj: Any) -> str:
     - Preserve list order.
     - UTF-8 with non-ASCII preserved.
     - No extra whitespace.
+
+    Input is validated first: non-string dict keys, tuples and other
+    unsupported types raise CanonicalJsonTypeError, and non-finite floats
+    raise ValueError, each reporting the offending path. The encoder alone
+    would coerce keys and tuples, so only pass ``trusted=True`` for input
+    known to be JSON-shaped (e.g. fresh from ``json.loads``); the
+    validation walk is then skipped.
     """
-    _validate(obj)
-    return json.dumps(
-        obj,
-        sort_keys=True,
-        ensure_ascii=False,
-        separators=(",", ":"),
-        allow_nan=False,
-    )
+    if not trusted:
+        _validate(obj)
+    if _C_ENCODE is None:
+        return _ENCODER.encode(obj)
+    return "".join(_C_ENCODE(obj, 0))
+
+
+def json_clone(value: Any) -> Any:
+    """Deep-copy JSON-shaped data.
+
+    Dicts and lists are rebuilt recursively; every other value is shared
+    with the input. That is a full copy only for JSON data, whose leaves
+    (str, int, float, bool, None) are immutable, so callers must pass
+    validated JSON. It is much cheaper than ``copy.deepcopy`` for that case.
+    """
+    if isinstance(value, dict):
+        return {key: json_clone(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [json_clone(item) for item in value]
+    return value
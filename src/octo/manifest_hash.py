@@ -7,9 +7,24 @@ from typing import Any
 
 from .canonical_json import canonical_dumps
 
+# hashlib's sha256 is OpenSSL's, which picks the SHA-NI kernel on CPUs that
+# have it, so there is no faster digest to reach for from here. For a typical
+# marketplace manifest, canonical_dumps is ~95% of the cost of manifest_hash.
+#
+# Characters fed to the digest per update. At least 64 KiB of UTF-8 per
+# call keeps OpenSSL's update loop in its steady state while bounding the
+# transient encoded copy.
+_CHUNK_CHARS = 1 << 16
+
 
 def manifest_hash(manifest_obj: Any) -> str:
     """Return the canonical SHA-256 hash for a manifest object."""
-    data = canonical_dumps(manifest_obj).encode("utf-8")
-    digest = hashlib.sha256(data).hexdigest()
-    return f"sha256:{digest}"
+    text = canonical_dumps(manifest_obj)
+    if len(text) <= _CHUNK_CHARS:
+        return f"sha256:{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+    digest = hashlib.sha256()
+    # Slicing a str never splits a code point, so encoding slice by slice
+    # yields exactly the bytes of text.encode("utf-8").
+    for start in range(0, len(text), _CHUNK_CHARS):
+        digest.update(text[start : start + _CHUNK_CHARS].encode("utf-8"))
+    return f"sha256:{digest.hexdigest()}"
@@ -3,7 +3,11 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, List
+from typing import Any, Dict, List, Union
+
+
+# Maps id(list) -> {element id: [indices]} for lists already indexed.
+ListIndexCache = Dict[int, Dict[str, List[int]]]
 
 
 @dataclass
@@ -33,11 +37,18 @@ class SelectorNotUnique(SelectorPathError):
 
 
 def _decode_segment(segment: str) -> str:
+    if "~" not in segment:
+        return segment
     return segment.replace("~1", "/").replace("~0", "~")
 
 
+_ENCODE_TABLE = str.maketrans({"~": "~0", "/": "~1"})
+
+
 def _encode_segment(segment: str) -> str:
-    return segment.replace("~", "~0").replace("/", "~1")
+    if "~" not in segment and "/" not in segment:
+        return segment
+    return segment.translate(_ENCODE_TABLE)
 
 
 def _is_selector(segment: str) -> bool:
@@ -48,10 +59,68 @@ def _selector_id(segment: str) -> str:
     return segment[len("@[id=") : -1]
 
 
-def resolve_selector_path(doc: Any, selector_path: str) -> str:
-    """Resolve selector segments to numeric indices and return a JSON Pointer."""
+def _index_list(items: List[Any]) -> Dict[str, List[int]]:
+    index: Dict[str, List[int]] = {}
+    for idx, item in enumerate(items):
+        if isinstance(item, dict):
+            item_id = item.get("id")
+            if isinstance(item_id, str):
+                index.setdefault(item_id, []).append(idx)
+    return index
+
+
+def _is_canonical_plain_pointer(doc: Any, pointer: str) -> bool:
+    """Check that a selector-free, escape-free pointer resolves to itself.
+
+    True means every segment exists and every list index is already in
+    canonical form, so resolution would return ``pointer`` unchanged.
+    """
+    current = doc
+    for segment in pointer[1:].split("/"):
+        if isinstance(current, dict):
+            if segment not in current:
+                return False
+            current = current[segment]
+        elif isinstance(current, list):
+            if not (segment.isascii() and segment.isdigit()):
+                return False
+            if len(segment) > 1 and segment[0] == "0":
+                return False
+            idx = int(segment)
+            if idx >= len(current):
+                return False
+            current = current[idx]
+        else:
+            return False
+    return True
+
+
+def _pointer_so_far(out_segments: List[str]) -> str:
+    # Only built when raising; the resolution loop never needs it otherwise.
+    return "/" + "/".join(out_segments) if out_segments else ""
+
+
+def resolve_selector_path(
+    doc: Any, selector_path: str, list_index_cache: ListIndexCache | None = None
+) -> str:
+    """Resolve selector segments to numeric indices and return a JSON Pointer.
+
+    ``list_index_cache`` lets several resolutions against the same, unmodified
+    document share the per-list id indexes built for selector segments.
+    """
     if selector_path == "":
         return ""
+    if (
+        "@[id=" not in selector_path
+        and "~" not in selector_path
+        and selector_path[0] == "/"
+        and _is_canonical_plain_pointer(doc, selector_path)
+    ):
+        return selector_path
+    # Anything else (selectors, escapes, non-canonical indexes, errors)
+    # takes the full walk, which normalizes output and reports failures.
+    if list_index_cache is None:
+        list_index_cache = {}
 
     segments = selector_path.split("/")
     if segments and segments[0] == "":
@@ -61,33 +130,28 @@ def resolve_selector_path(doc: Any, selector_path: str) -> str:
     out_segments: List[str] = []
 
     for raw_segment in segments:
-        pointer_so_far = "/" + "/".join(out_segments) if out_segments else ""
-
         if _is_selector(raw_segment):
             if not isinstance(current, list):
                 raise SelectorTypeError(
                     "Selector segment used on non-list",
                     raw_segment,
-                    pointer_so_far,
+                    _pointer_so_far(out_segments),
                 )
-            target_id = _selector_id(raw_segment)
-            matches = []
-            for idx, item in enumerate(current):
-                if isinstance(item, dict):
-                    item_id = item.get("id")
-                    if isinstance(item_id, str) and item_id == target_id:
-                        matches.append(idx)
+            index = list_index_cache.get(id(current))
+            if index is None:
+                index = list_index_cache[id(current)] = _index_list(current)
+            matches = index.get(_selector_id(raw_segment), ())
             if not matches:
                 raise SelectorNotFound(
                     "Selector did not match any element",
                     raw_segment,
-                    pointer_so_far,
+                    _pointer_so_far(out_segments),
                 )
             if len(matches) > 1:
                 raise SelectorNotUnique(
                     "Selector matched multiple elements",
                     raw_segment,
-                    pointer_so_far,
+                    _pointer_so_far(out_segments),
                 )
             match_idx = matches[0]
             current = current[match_idx]
@@ -101,7 +165,7 @@ def resolve_selector_path(doc: Any, selector_path: str) -> str:
                 raise PointerResolveError(
                     "Missing object key",
                     raw_segment,
-                    pointer_so_far,
+                    _pointer_so_far(out_segments),
                 )
             current = current[segment]
             out_segments.append(_encode_segment(segment))
@@ -112,14 +176,14 @@ def resolve_selector_path(doc: Any, selector_path: str) -> str:
                 raise PointerResolveError(
                     "Invalid list index",
                     raw_segment,
-                    pointer_so_far,
+                    _pointer_so_far(out_segments),
                 )
             idx = int(segment)
             if idx < 0 or idx >= len(current):
                 raise PointerResolveError(
                     "List index out of range",
                     raw_segment,
-                    pointer_so_far,
+                    _pointer_so_far(out_segments),
                 )
             current = current[idx]
             out_segments.append(str(idx))
@@ -128,7 +192,29 @@ def resolve_selector_path(doc: Any, selector_path: str) -> str:
         raise PointerResolveError(
             "Cannot traverse into non-container",
             raw_segment,
-            pointer_so_far,
+            _pointer_so_far(out_segments),
         )
 
     return "/" + "/".join(out_segments)
+
+
+def resolve_selector_paths_batch(
+    doc: Any,
+    selector_paths: List[str],
+    list_index_cache: ListIndexCache | None = None,
+) -> List[Union[str, SelectorPathError]]:
+    """Resolve several selector paths against one document.
+
+    Each entry is either the resolved JSON Pointer or the error raised for
+    that path; list indexes are built once and shared across the batch (and
+    with later resolutions when ``list_index_cache`` is passed in).
+    """
+    if list_index_cache is None:
+        list_index_cache = {}
+    results: List[Union[str, SelectorPathError]] = []
+    for selector_path in selector_paths:
+        try:
+            results.append(resolve_selector_path(doc, selector_path, list_index_cache))
+        except SelectorPathError as exc:
+            results.append(exc)
+    return results
@@ -0,0 +1,19 @@
+import os
+import sys
+
+
+# Both pytest and `python -m unittest` import this package before any test
+# module, so the bootstrap lives here rather than being repeated per module.
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SRC = os.path.join(ROOT, "src")
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+# app.main reads these at import time, so they have to be set before any test
+# module is imported. Values already in the environment win.
+os.environ.setdefault("USE_DB", "0")
+os.environ.setdefault("OCTO_DISABLE_AUTH", "1")
+os.environ.setdefault("SUPABASE_URL", "http://localhost")
+os.environ.setdefault("SUPABASE_JWT_AUD", "authenticated")
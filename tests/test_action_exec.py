@@ -1,14 +1,6 @@
-import os
-import sys
 import unittest
-
-
-ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-SRC = os.path.join(ROOT, "src")
-if ROOT not in sys.path:
-    sys.path.insert(0, ROOT)
-if SRC not in sys.path:
-    sys.path.insert(0, SRC)
+from collections import deque
+from types import MappingProxyType
 
 from action_exec import execute_plan
 from outbox import Outbox
@@ -37,8 +29,8 @@ class FakeTxMgr:
 
 class FakeRecordStore:
     def __init__(self) -> None:
-        self.updated = []
-        self.created = []
+        self.updated = deque()
+        self.created = deque()
         self.fail_update = False
 
     def update_record(self, tx, entity, record_id, changes) -> None:
@@ -71,19 +63,39 @@ class FakeQueries:
         return [1, 2]
 
 
+_CTX = MappingProxyType(
+    {
+        "actor": {"id": "u1", "roles": ["admin"]},
+        "module_id": "job_management",
+        "manifest_hash": "sha256:abcd",
+        "vars": {"job": {"id": "j1"}},
+        "trace_id": None,
+    }
+)
+
+# Plans only read their steps, so tests share this one and vary it with dict(...).
+_UPDATE_JOB_STEP = {
+    "kind": "update_record",
+    "record_ref": {"entity": "entity.job", "id": {"var": "job.id"}},
+    "changes": {"job.status": {"literal": "closed"}},
+}
+
+
 class TestActionExec(unittest.TestCase):
+    ctx = _CTX
+
     def setUp(self) -> None:
         self.tx_mgr = FakeTxMgr()
         self.records = FakeRecordStore()
         self.actions = FakeActions()
         self.queries = FakeQueries()
         self.outbox = Outbox()
-        self.ctx = {
-            "actor": {"id": "u1", "roles": ["admin"]},
-            "module_id": "job_management",
-            "manifest_hash": "sha256:abcd",
-            "vars": {"job": {"id": "j1"}},
-            "trace_id": None,
+        self.deps = {
+            "tx": self.tx_mgr,
+            "records": self.records,
+            "actions": self.actions,
+            "queries": self.queries,
+            "outbox": self.outbox,
         }
 
     def test_update_create_order_and_commit(self) -> None:
@@ -91,11 +103,7 @@ class TestActionExec(unittest.TestCase):
             "action_id": "a",
             "type": "update_record",
             "steps": [
-                {
-                    "kind": "update_record",
-                    "record_ref": {"entity": "entity.job", "id": {"var": "job.id"}},
-                    "changes": {"job.status": {"literal": "closed"}},
-                },
+                _UPDATE_JOB_STEP,
                 {
                     "kind": "create_record",
                     "entity": "entity.note",
@@ -104,11 +112,7 @@ class TestActionExec(unittest.TestCase):
                 },
             ],
         }
-        result = execute_plan(
-            plan,
-            self.ctx,
-            {"tx": self.tx_mgr, "records": self.records, "actions": self.actions, "queries": self.queries, "outbox": self.outbox},
-        )
+        result = execute_plan(plan, self.ctx, self.deps)
         self.assertTrue(result["ok"])
         self.assertTrue(self.tx_mgr.last_tx.committed)
         self.assertFalse(self.tx_mgr.last_tx.rolled_back)
@@ -120,19 +124,9 @@ class TestActionExec(unittest.TestCase):
         plan = {
             "action_id": "a",
             "type": "update_record",
-            "steps": [
-                {
-                    "kind": "update_record",
-                    "record_ref": {"entity": "entity.job", "id": {"var": "job.id"}},
-                    "changes": {"job.status": {"literal": "closed"}},
-                }
-            ],
+            "steps": [_UPDATE_JOB_STEP],
         }
-        result = execute_plan(
-            plan,
-            self.ctx,
-            {"tx": self.tx_mgr, "records": self.records, "actions": self.actions, "queries": self.queries, "outbox": self.outbox},
-        )
+        result = execute_plan(plan, self.ctx, self.deps)
         self.assertFalse(result["ok"])
         self.assertTrue(self.tx_mgr.last_tx.rolled_back)
         self.assertFalse(self.tx_mgr.last_tx.committed)
@@ -149,11 +143,7 @@ class TestActionExec(unittest.TestCase):
                 }
             ],
         }
-        result = execute_plan(
-            plan,
-            self.ctx,
-            {"tx": self.tx_mgr, "records": self.records, "actions": self.actions, "queries": self.queries, "outbox": self.outbox},
-        )
+        result = execute_plan(plan, self.ctx, self.deps)
         self.assertTrue(result["ok"])
         self.assertEqual(len(self.outbox.pending()), 1)
         self.assertTrue(self.tx_mgr.last_tx.committed)
@@ -176,11 +166,7 @@ class TestActionExec(unittest.TestCase):
                 },
             ],
         }
-        result = execute_plan(
-            plan,
-            self.ctx,
-            {"tx": self.tx_mgr, "records": self.records, "actions": self.actions, "queries": self.queries, "outbox": self.outbox},
-        )
+        result = execute_plan(plan, self.ctx, self.deps)
         self.assertTrue(result["ok"])
         self.assertEqual(self.records.updated[0][1], "new1")
 
@@ -189,18 +175,10 @@ class TestActionExec(unittest.TestCase):
             "action_id": "a",
             "type": "update_record",
             "steps": [
-                {
-                    "kind": "update_record",
-                    "record_ref": {"entity": "entity.job", "id": {"var": "missing.id"}},
-                    "changes": {"job.status": {"literal": "closed"}},
-                }
+                dict(_UPDATE_JOB_STEP, record_ref={"entity": "entity.job", "id": {"var": "missing.id"}})
             ],
         }
-        result = execute_plan(
-            plan,
-            self.ctx,
-            {"tx": self.tx_mgr, "records": self.records, "actions": self.actions, "queries": self.queries, "outbox": self.outbox},
-        )
+        result = execute_plan(plan, self.ctx, self.deps)
         self.assertFalse(result["ok"])
         self.assertTrue(self.tx_mgr.last_tx.rolled_back)
 
@@ -209,18 +187,10 @@ class TestActionExec(unittest.TestCase):
             "action_id": "a",
             "type": "update_record",
             "steps": [
-                {
-                    "kind": "update_record",
-                    "record_ref": {"entity": "entity.job", "id": {"var": "job.id"}},
-                    "changes": {"job.status": {"literal": float("nan")}},
-                }
+                dict(_UPDATE_JOB_STEP, changes={"job.status": {"literal": float("nan")}})
             ],
         }
-        result = execute_plan(
-            plan,
-            self.ctx,
-            {"tx": self.tx_mgr, "records": self.records, "actions": self.actions, "queries": self.queries, "outbox": self.outbox},
-        )
+        result = execute_plan(plan, self.ctx, self.deps)
         self.assertFalse(result["ok"])
 
     def test_missing_return_fields_warning(self) -> None:
@@ -236,11 +206,7 @@ class TestActionExec(unittest.TestCase):
                 }
             ],
         }
-        result = execute_plan(
-            plan,
-            self.ctx,
-            {"tx": self.tx_mgr, "records": self.records, "actions": self.actions, "queries": self.queries, "outbox": self.outbox},
-        )
+        result = execute_plan(plan, self.ctx, self.deps)
         self.assertTrue(result["ok"])
         self.assertEqual(result["warnings"][0]["code"], "EXEC_RETURN_FIELD_MISSING")
 
@@ -1,21 +1,62 @@
-import os
-import sys
 import unittest
 
+from action_plan import plan_action
 
-ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-SRC = os.path.join(ROOT, "src")
-if ROOT not in sys.path:
-    sys.path.insert(0, ROOT)
-if SRC not in sys.path:
-    sys.path.insert(0, SRC)
 
-from action_plan import plan_action
+_PARAMS_SCHEMA_CASES = (
+    ({}, "PARAMS_REQUIRED_MISSING"),
+    ({"title": 123}, "PARAMS_TYPE_INVALID"),
+    ({"title": "t", "extra": 1}, "PARAMS_ADDITIONAL_FORBIDDEN"),
+)
+
+# One well-formed effect per action type; each plans to a single step of
+# the same kind.
+_HAPPY_PATH_EFFECTS = (
+    (
+        "update_record",
+        {
+            "record_ref": {"entity": "entity.job", "id": {"var": "job.id"}},
+            "changes": {"job.status": {"literal": "closed"}},
+        },
+    ),
+    (
+        "create_record",
+        {
+            "entity": "entity.job",
+            "values": {"job.title": {"literal": "x"}},
+            "returns": {"as": "created", "fields": ["job.id"]},
+        },
+    ),
+    (
+        "call_action",
+        {
+            "action_ref": "docs.action.generate",
+            "params": {"id": {"var": "job.id"}},
+            "returns": {"as": "result"},
+        },
+    ),
+    (
+        "publish_event",
+        {
+            "name": "job.created",
+            "payload": {"job_id": {"var": "job.id"}},
+        },
+    ),
+    (
+        "run_query",
+        {
+            "query_ref": "job.query.tasks",
+            "params": {"job_id": {"var": "job.id"}},
+            "returns": {"as": "tasks"},
+        },
+    ),
+)
 
 
 class TestActionPlan(unittest.TestCase):
-    def setUp(self) -> None:
-        self.ctx = {
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.ctx = {
             "actor": {"id": "u1", "roles": ["manager"]},
             "module_id": "job_management",
             "now": None,
@@ -86,95 +127,25 @@ class TestActionPlan(unittest.TestCase):
                 "values": {"job.title": {"var": "title"}},
             },
         }
-        result = plan_action(action, {}, self.ctx)
-        self.assertFalse(result["ok"])
-        self.assertEqual(result["errors"][0]["code"], "PARAMS_REQUIRED_MISSING")
-
-        result = plan_action(action, {"title": 123}, self.ctx)
-        self.assertFalse(result["ok"])
-        self.assertEqual(result["errors"][0]["code"], "PARAMS_TYPE_INVALID")
-
-        result = plan_action(action, {"title": "t", "extra": 1}, self.ctx)
-        self.assertFalse(result["ok"])
-        self.assertEqual(result["errors"][0]["code"], "PARAMS_ADDITIONAL_FORBIDDEN")
-
-    def test_update_record_plan(self) -> None:
-        action = {
-            "id": "action.update",
-            "type": "update_record",
-            "params_schema": None,
-            "effect": {
-                "record_ref": {"entity": "entity.job", "id": {"var": "job.id"}},
-                "changes": {"job.status": {"literal": "closed"}},
-            },
-        }
-        result = plan_action(action, {}, self.ctx)
-        self.assertTrue(result["ok"])
-        step = result["plan"]["steps"][0]
-        self.assertEqual(step["kind"], "update_record")
-
-    def test_create_record_plan(self) -> None:
-        action = {
-            "id": "action.create",
-            "type": "create_record",
-            "params_schema": None,
-            "effect": {
-                "entity": "entity.job",
-                "values": {"job.title": {"literal": "x"}},
-                "returns": {"as": "created", "fields": ["job.id"]},
-            },
-        }
-        result = plan_action(action, {}, self.ctx)
-        self.assertTrue(result["ok"])
-        step = result["plan"]["steps"][0]
-        self.assertEqual(step["kind"], "create_record")
-
-    def test_call_action_plan(self) -> None:
-        action = {
-            "id": "action.call",
-            "type": "call_action",
-            "params_schema": None,
-            "effect": {
-                "action_ref": "docs.action.generate",
-                "params": {"id": {"var": "job.id"}},
-                "returns": {"as": "result"},
-            },
-        }
-        result = plan_action(action, {}, self.ctx)
-        self.assertTrue(result["ok"])
-        step = result["plan"]["steps"][0]
-        self.assertEqual(step["kind"], "call_action")
-
-    def test_publish_event_plan(self) -> None:
-        action = {
-            "id": "action.publish",
-            "type": "publish_event",
-            "params_schema": None,
-            "effect": {
-                "name": "job.created",
-                "payload": {"job_id": {"var": "job.id"}},
-            },
-        }
-        result = plan_action(action, {}, self.ctx)
-        self.assertTrue(result["ok"])
-        step = result["plan"]["steps"][0]
-        self.assertEqual(step["kind"], "publish_event")
-
-    def test_run_query_plan(self) -> None:
-        action = {
-            "id": "action.query",
-            "type": "run_query",
-            "params_schema": None,
-            "effect": {
-                "query_ref": "job.query.tasks",
-                "params": {"job_id": {"var": "job.id"}},
-                "returns": {"as": "tasks"},
-            },
-        }
-        result = plan_action(action, {}, self.ctx)
-        self.assertTrue(result["ok"])
-        step = result["plan"]["steps"][0]
-        self.assertEqual(step["kind"], "run_query")
+        for params, expected_code in _PARAMS_SCHEMA_CASES:
+            with self.subTest(params=params):
+                result = plan_action(action, params, self.ctx)
+                self.assertFalse(result["ok"])
+                self.assertEqual(result["errors"][0]["code"], expected_code)
+
+    def test_plan_step_kind_matches_action_type(self) -> None:
+        for action_type, effect in _HAPPY_PATH_EFFECTS:
+            with self.subTest(action_type=action_type):
+                action = {
+                    "id": f"action.{action_type}",
+                    "type": action_type,
+                    "params_schema": None,
+                    "effect": effect,
+                }
+                result = plan_action(action, {}, self.ctx)
+                self.assertTrue(result["ok"])
+                step = result["plan"]["steps"][0]
+                self.assertEqual(step["kind"], action_type)
 
     def test_invalid_action_type(self) -> None:
         action = {
@@ -1,21 +1,10 @@
 import os
-import sys
 import json
 import unittest
 from types import SimpleNamespace
 from unittest.mock import patch
 
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-SRC = os.path.join(ROOT, "src")
-if ROOT not in sys.path:
-    sys.path.insert(0, ROOT)
-if SRC not in sys.path:
-    sys.path.insert(0, SRC)
-
-os.environ.setdefault("USE_DB", "0")
-os.environ.setdefault("OCTO_DISABLE_AUTH", "1")
-os.environ.setdefault("SUPABASE_URL", "http://localhost")
-os.environ.setdefault("SUPABASE_JWT_AUD", "authenticated")
 
 try:
     import fastapi  # noqa: F401
@@ -34,7 +23,7 @@ class DummyRequest:
 
 
 def _json_body(response):
-    return json.loads(response.body.decode("utf-8"))
+    return json.loads(response.body)
 
 
 if fastapi is None:
@@ -1,21 +1,40 @@
 import json
-import os
-import sys
+import re
 import unittest
 from unittest.mock import patch
 
-ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-if ROOT not in sys.path:
-    sys.path.insert(0, ROOT)
+from app.agent_stream import summarize_build_spec, diff_manifest, preview_calls
 
-from fastapi.testclient import TestClient
+try:
+    import fastapi  # noqa: F401
+except ImportError:
+    fastapi = None
 
-os.environ["USE_DB"] = "0"
-os.environ["OCTO_DISABLE_AUTH"] = "1"
-os.environ["SUPABASE_URL"] = "http://localhost"
+if fastapi is not None:
+    import app.main as main
+    from fastapi.testclient import TestClient
 
-from app.agent_stream import summarize_build_spec, diff_manifest, preview_calls
-import app.main as main
+
+# SSE data payloads are single-line JSON, so any line starting "event: " names an event.
+_SSE_EVENT = re.compile(rb"^event: (.+)$", re.MULTILINE)
+
+_AGENT_CHAT_EVENTS = frozenset(
+    {
+        "run_started",
+        "stage_started",
+        "stage_done",
+        "planner_result",
+        "planner_done",
+        "builder_started",
+        "builder_done",
+        "apply_result",
+        "apply_done",
+        "validate_result",
+        "validate_done",
+        "final_done",
+        "done",
+    }
+)
 
 
 class TestAgentStreamHelpers(unittest.TestCase):
@@ -27,8 +46,8 @@ class TestAgentStreamHelpers(unittest.TestCase):
             "ui_patterns": [{"pattern": "entity_list_form", "entity": "entity.contact"}],
         }
         bullets = summarize_build_spec(spec)
-        self.assertTrue(any("Goal" in item for item in bullets))
-        self.assertTrue(any("entity.contact" in item for item in bullets))
+        self.assertIn("Goal: Build contacts", bullets)
+        self.assertIn("Entities: entity.contact", bullets)
 
     def test_diff_manifest_counts(self) -> None:
         before = {"entities": [{"id": "entity.a"}], "pages": []}
@@ -46,15 +65,19 @@ class TestAgentStreamHelpers(unittest.TestCase):
         self.assertEqual(preview[0]["tool"], "ensure_entity")
 
 
+@unittest.skipIf(fastapi is None, "fastapi not installed")
 class TestAgentStreamEndpoint(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        # One client (and its portal thread) for the whole class; it is
+        # closed again when the class finishes.
+        cls.client = cls.enterClassContext(TestClient(main.app))
+
     @staticmethod
     def _stream_event_names(response) -> list[str]:
-        events = []
-        for line in response.iter_lines():
-            if line.startswith("event:"):
-                events.append(line.replace("event: ", ""))
-            if line.startswith("event: done"):
-                break
+        events = [name.decode("utf-8") for name in _SSE_EVENT.findall(response.read())]
+        if "done" in events:
+            del events[events.index("done") + 1 :]
         return events
 
     @staticmethod
@@ -62,10 +85,10 @@ class TestAgentStreamEndpoint(unittest.TestCase):
         frames = []
         current_event = ""
         for line in response.iter_lines():
-            if line.startswith("event:"):
-                current_event = line.replace("event: ", "")
-            elif line.startswith("data:"):
-                raw = line.replace("data: ", "")
+            if line.startswith("event: "):
+                current_event = line[7:]
+            elif line.startswith("data: "):
+                raw = line[6:]
                 try:
                     payload = json.loads(raw)
                 except Exception:
@@ -95,12 +118,15 @@ class TestAgentStreamEndpoint(unittest.TestCase):
             )
             return {"choices": [{"message": {"content": content}}]}
 
-        with TestClient(main.app) as client, patch.object(main, "_openai_chat_completion", fake_openai), patch.object(
-            main, "_openai_configured", lambda: True
-        ), patch.object(main, "validate_manifest_raw", lambda manifest, expected_module_id=None: (manifest, [], [])), patch.object(
-            main, "_studio2_strict_validate", lambda manifest, expected_module_id=None: []
-        ), patch.object(main, "_studio2_completeness_check", lambda manifest: []), patch.object(
-            main, "_studio2_design_warnings", lambda manifest: []
+        client = self.client
+        with patch.multiple(
+            main,
+            _openai_chat_completion=fake_openai,
+            _openai_configured=lambda: True,
+            validate_manifest_raw=lambda manifest, expected_module_id=None: (manifest, [], []),
+            _studio2_strict_validate=lambda manifest, expected_module_id=None: [],
+            _studio2_completeness_check=lambda manifest: [],
+            _studio2_design_warnings=lambda manifest: [],
         ):
             with client.stream(
                 "POST",
@@ -108,20 +134,8 @@ class TestAgentStreamEndpoint(unittest.TestCase):
                 json={"module_id": "module_test", "message": "Build contacts", "build_spec": build_spec},
             ) as resp:
                 events = self._stream_event_names(resp)
-                # Ensure key phases appear in order
-                self.assertIn("run_started", events)
-                self.assertIn("stage_started", events)
-                self.assertIn("stage_done", events)
-                self.assertIn("planner_result", events)
-                self.assertIn("planner_done", events)
-                self.assertIn("builder_started", events)
-                self.assertIn("builder_done", events)
-                self.assertIn("apply_result", events)
-                self.assertIn("apply_done", events)
-                self.assertIn("validate_result", events)
-                self.assertIn("validate_done", events)
-                self.assertIn("final_done", events)
-                self.assertIn("done", events)
+                # Ensure key phases appear
+                self.assertEqual(_AGENT_CHAT_EVENTS - set(events), set())
 
     def test_document_template_ai_plan_stream_event_order(self) -> None:
         actor = {
@@ -135,7 +149,8 @@ class TestAgentStreamEndpoint(unittest.TestCase):
             "api_scopes": ["templates.manage"],
             "claims": {},
         }
-        with TestClient(main.app) as client, patch.object(main, "_resolve_actor", lambda _request: actor):
+        client = self.client
+        with patch.object(main, "_resolve_actor", lambda _request: actor):
             created = client.post(
                 "/documents/templates",
                 json={
@@ -163,7 +178,11 @@ class TestAgentStreamEndpoint(unittest.TestCase):
                     "assumptions": [],
                 }
 
-            with patch.object(main, "_artifact_ai_generate_plan", fake_plan), patch.object(main, "_openai_configured", lambda: True):
+            with patch.multiple(
+                main,
+                _artifact_ai_generate_plan=fake_plan,
+                _openai_configured=lambda: True,
+            ):
                 with client.stream(
                     "POST",
                     f"/documents/templates/{template_id}/ai/plan/stream",
@@ -242,7 +261,8 @@ class TestAgentStreamEndpoint(unittest.TestCase):
             "api_scopes": ["templates.manage"],
             "claims": {},
         }
-        with TestClient(main.app) as client, patch.object(main, "_resolve_actor", lambda _request: actor):
+        client = self.client
+        with patch.object(main, "_resolve_actor", lambda _request: actor):
             created = client.post(
                 "/email/templates",
                 json={
@@ -269,7 +289,11 @@ class TestAgentStreamEndpoint(unittest.TestCase):
                     "assumptions": [],
                 }
 
-            with patch.object(main, "_artifact_ai_generate_plan", fake_plan), patch.object(main, "_openai_configured", lambda: True):
+            with patch.multiple(
+                main,
+                _artifact_ai_generate_plan=fake_plan,
+                _openai_configured=lambda: True,
+            ):
                 with client.stream(
                     "POST",
                     f"/email/templates/{template_id}/ai/plan/stream",
@@ -347,7 +371,8 @@ class TestAgentStreamEndpoint(unittest.TestCase):
             "api_scopes": ["templates.manage"],
             "claims": {},
         }
-        with TestClient(main.app) as client, patch.object(main, "_resolve_actor", lambda _request: actor):
+        client = self.client
+        with patch.object(main, "_resolve_actor", lambda _request: actor):
             created = client.post(
                 "/email/templates",
                 json={
@@ -375,7 +400,11 @@ class TestAgentStreamEndpoint(unittest.TestCase):
                     "assumptions": [],
                 }
 
-            with patch.object(main, "_artifact_ai_generate_plan", fake_plan), patch.object(main, "_openai_configured", lambda: True):
+            with patch.multiple(
+                main,
+                _artifact_ai_generate_plan=fake_plan,
+                _openai_configured=lambda: True,
+            ):
                 with client.stream(
                     "POST",
                     f"/email/templates/{template_id}/ai/plan/stream",
@@ -403,7 +432,8 @@ class TestAgentStreamEndpoint(unittest.TestCase):
             "workspaces": [{"workspace_id": "default", "role": "owner", "workspace_name": "Default"}],
             "claims": {},
         }
-        with TestClient(main.app) as client, patch.object(main, "_resolve_actor", lambda _request: actor):
+        client = self.client
+        with patch.object(main, "_resolve_actor", lambda _request: actor):
             created = client.post(
                 "/automations",
                 json={
@@ -469,7 +499,11 @@ class TestAgentStreamEndpoint(unittest.TestCase):
                     "assumptions": [],
                 }
 
-            with patch.object(main, "_artifact_ai_generate_plan", fake_plan), patch.object(main, "_openai_configured", lambda: True):
+            with patch.multiple(
+                main,
+                _artifact_ai_generate_plan=fake_plan,
+                _openai_configured=lambda: True,
+            ):
                 with client.stream(
                     "POST",
                     f"/automations/{automation_id}/ai/plan/stream",
@@ -546,7 +580,8 @@ class TestAgentStreamEndpoint(unittest.TestCase):
             "api_scopes": ["automations.manage"],
             "claims": {},
         }
-        with TestClient(main.app) as client, patch.object(main, "_resolve_actor", lambda _request: actor):
+        client = self.client
+        with patch.object(main, "_resolve_actor", lambda _request: actor):
             created = client.post(
                 "/automations",
                 json={
@@ -584,7 +619,11 @@ class TestAgentStreamEndpoint(unittest.TestCase):
                     }]
                 }
 
-            with patch.object(main, "_openai_chat_completion", fake_openai), patch.object(main, "_openai_configured", lambda: True):
+            with patch.multiple(
+                main,
+                _openai_chat_completion=fake_openai,
+                _openai_configured=lambda: True,
+            ):
                 with client.stream(
                     "POST",
                     f"/automations/{automation_id}/ai/plan/stream",
@@ -612,7 +651,8 @@ class TestAgentStreamEndpoint(unittest.TestCase):
             "api_scopes": ["automations.manage"],
             "claims": {},
         }
-        with TestClient(main.app) as client, patch.object(main, "_resolve_actor", lambda _request: actor):
+        client = self.client
+        with patch.object(main, "_resolve_actor", lambda _request: actor):
             created = client.post(
                 "/automations",
                 json={
@@ -667,7 +707,11 @@ class TestAgentStreamEndpoint(unittest.TestCase):
                     }]
                 }
 
-            with patch.object(main, "_openai_chat_completion", fake_openai), patch.object(main, "_openai_configured", lambda: True):
+            with patch.multiple(
+                main,
+                _openai_chat_completion=fake_openai,
+                _openai_configured=lambda: True,
+            ):
                 with client.stream(
                     "POST",
                     f"/automations/{automation_id}/ai/plan/stream",
@@ -697,7 +741,8 @@ class TestAgentStreamEndpoint(unittest.TestCase):
             "api_scopes": ["automations.manage"],
             "claims": {},
         }
-        with TestClient(main.app) as client, patch.object(main, "_resolve_actor", lambda _request: actor):
+        client = self.client
+        with patch.object(main, "_resolve_actor", lambda _request: actor):
             created = client.post(
                 "/automations",
                 json={
@@ -760,7 +805,11 @@ class TestAgentStreamEndpoint(unittest.TestCase):
                     }]
                 }
 
-            with patch.object(main, "_openai_chat_completion", fake_openai), patch.object(main, "_openai_configured", lambda: True):
+            with patch.multiple(
+                main,
+                _openai_chat_completion=fake_openai,
+                _openai_configured=lambda: True,
+            ):
                 with client.stream(
                     "POST",
                     f"/automations/{automation_id}/ai/plan/stream",
@@ -790,7 +839,8 @@ class TestAgentStreamEndpoint(unittest.TestCase):
             "api_scopes": ["automations.manage"],
             "claims": {},
         }
-        with TestClient(main.app) as client, patch.object(main, "_resolve_actor", lambda _request: actor):
+        client = self.client
+        with patch.object(main, "_resolve_actor", lambda _request: actor):
             created = client.post(
                 "/automations",
                 json={
@@ -844,7 +894,11 @@ class TestAgentStreamEndpoint(unittest.TestCase):
                     }]
                 }
 
-            with patch.object(main, "_openai_chat_completion", fake_openai), patch.object(main, "_openai_configured", lambda: True):
+            with patch.multiple(
+                main,
+                _openai_chat_completion=fake_openai,
+                _openai_configured=lambda: True,
+            ):
                 with client.stream(
                     "POST",
                     f"/automations/{automation_id}/ai/plan/stream",
@@ -872,7 +926,8 @@ class TestAgentStreamEndpoint(unittest.TestCase):
             "api_scopes": ["templates.manage"],
             "claims": {},
         }
-        with TestClient(main.app) as client, patch.object(main, "_resolve_actor", lambda _request: actor):
+        client = self.client
+        with patch.object(main, "_resolve_actor", lambda _request: actor):
             created = client.post(
                 "/documents/templates",
                 json={
@@ -911,7 +966,12 @@ class TestAgentStreamEndpoint(unittest.TestCase):
                     },
                 )
 
-            with patch.object(main, "_artifact_ai_generate_plan", fake_plan), patch.object(main, "_artifact_ai_apply_scoped_template_hints", fake_apply), patch.object(main, "_openai_configured", lambda: True):
+            with patch.multiple(
+                main,
+                _artifact_ai_generate_plan=fake_plan,
+                _artifact_ai_apply_scoped_template_hints=fake_apply,
+                _openai_configured=lambda: True,
+            ):
                 with client.stream(
                     "POST",
                     f"/documents/templates/{template_id}/ai/plan/stream",
@@ -942,7 +1002,8 @@ class TestAgentStreamEndpoint(unittest.TestCase):
             "api_scopes": ["templates.manage"],
             "claims": {},
         }
-        with TestClient(main.app) as client, patch.object(main, "_resolve_actor", lambda _request: actor):
+        client = self.client
+        with patch.object(main, "_resolve_actor", lambda _request: actor):
             created = client.post(
                 "/email/templates",
                 json={
@@ -983,7 +1044,12 @@ class TestAgentStreamEndpoint(unittest.TestCase):
                     },
                 )
 
-            with patch.object(main, "_artifact_ai_generate_plan", fake_plan), patch.object(main, "_artifact_ai_apply_scoped_template_hints", fake_apply), patch.object(main, "_openai_configured", lambda: True):
+            with patch.multiple(
+                main,
+                _artifact_ai_generate_plan=fake_plan,
+                _artifact_ai_apply_scoped_template_hints=fake_apply,
+                _openai_configured=lambda: True,
+            ):
                 with client.stream(
                     "POST",
                     f"/email/templates/{template_id}/ai/plan/stream",
@@ -10,6 +10,48 @@ from app.stores import MemoryAutomationStore, MemoryJobStore
 from app.worker import _emit_automation_event, _handle_system_action, _run_automation
 
 
+# Automation definitions shared by the scheduling tests. store.create()
+# deep-copies its input, so these are never mutated by a test.
+_DELAY_AUTOMATION = {
+    "name": "Delay Test",
+    "status": "published",
+    "trigger": {"kind": "event", "event_types": ["record.created"]},
+    "steps": [{"id": "delay1", "kind": "delay", "seconds": 60}],
+}
+
+_IDEM_AUTOMATION = {
+    "name": "Idem Test",
+    "status": "published",
+    "trigger": {"kind": "event", "event_types": ["record.created"]},
+    "steps": [{"id": "noop1", "kind": "action", "action_id": "system.noop"}],
+}
+
+_RETRY_AUTOMATION = {
+    "name": "Retry Test",
+    "status": "published",
+    "trigger": {"kind": "event", "event_types": ["record.created"]},
+    "steps": [
+        {
+            "id": "fail1",
+            "kind": "action",
+            "action_id": "system.fail",
+            "retry_policy": {"max_attempts": 2, "backoff_seconds": 1},
+        }
+    ],
+}
+
+
+_AUTOMATION_STORE = MemoryAutomationStore()
+_JOB_STORE = MemoryJobStore()
+
+
+def _memory_stores() -> tuple[MemoryAutomationStore, MemoryJobStore]:
+    """Return the module's shared in-memory stores, emptied for the caller."""
+    _AUTOMATION_STORE.clear()
+    _JOB_STORE.clear()
+    return _AUTOMATION_STORE, _JOB_STORE
+
+
 class TestAutomationRuntime(unittest.TestCase):
     def test_emit_triggers_still_reaches_automations_without_manifest_trigger(self):
         handled: list[dict] = []
@@ -77,8 +119,7 @@ class TestAutomationRuntime(unittest.TestCase):
         self.assertEqual(captured["webhook"]["meta"]["manifest_hash"], "sha256:automation")
 
     def test_email_compose_targets_only_selected_automation(self):
-        store = MemoryAutomationStore()
-        job_store = MemoryJobStore()
+        store, job_store = _memory_stores()
         selected = store.create(
             {
                 "name": "Send Quote Selected",
@@ -261,16 +302,8 @@ class TestAutomationRuntime(unittest.TestCase):
         self.assertEqual(result["first"]["record"]["biz_invoice_line"]["description"], "Manual line")
 
     def test_delay_reschedules(self):
-        store = MemoryAutomationStore()
-        job_store = MemoryJobStore()
-        automation = store.create(
-            {
-                "name": "Delay Test",
-                "status": "published",
-                "trigger": {"kind": "event", "event_types": ["record.created"]},
-                "steps": [{"id": "delay1", "kind": "delay", "seconds": 60}],
-            }
-        )
+        store, job_store = _memory_stores()
+        automation = store.create(_DELAY_AUTOMATION)
         run = store.create_run(
             {
                 "automation_id": automation["id"],
@@ -287,16 +320,8 @@ class TestAutomationRuntime(unittest.TestCase):
         self.assertEqual(jobs[0]["type"], "automation.run")
 
     def test_idempotency_skips_duplicate(self):
-        store = MemoryAutomationStore()
-        job_store = MemoryJobStore()
-        automation = store.create(
-            {
-                "name": "Idem Test",
-                "status": "published",
-                "trigger": {"kind": "event", "event_types": ["record.created"]},
-                "steps": [{"id": "noop1", "kind": "action", "action_id": "system.noop"}],
-            }
-        )
+        store, job_store = _memory_stores()
+        automation = store.create(_IDEM_AUTOMATION)
         run = store.create_run(
             {
                 "automation_id": automation["id"],
@@ -314,23 +339,8 @@ class TestAutomationRuntime(unittest.TestCase):
         self.assertEqual(len(second_runs), 1)
 
     def test_retry_policy_reschedules(self):
-        store = MemoryAutomationStore()
-        job_store = MemoryJobStore()
-        automation = store.create(
-            {
-                "name": "Retry Test",
-                "status": "published",
-                "trigger": {"kind": "event", "event_types": ["record.created"]},
-                "steps": [
-                    {
-                        "id": "fail1",
-                        "kind": "action",
-                        "action_id": "system.fail",
-                        "retry_policy": {"max_attempts": 2, "backoff_seconds": 1},
-                    }
-                ],
-            }
-        )
+        store, job_store = _memory_stores()
+        automation = store.create(_RETRY_AUTOMATION)
         run = store.create_run(
             {
                 "automation_id": automation["id"],
@@ -347,8 +357,7 @@ class TestAutomationRuntime(unittest.TestCase):
         self.assertEqual(jobs[0]["type"], "automation.run")
 
     def test_step_outputs_available_to_following_conditions(self):
-        store = MemoryAutomationStore()
-        job_store = MemoryJobStore()
+        store, job_store = _memory_stores()
         automation = store.create(
             {
                 "name": "Context Test",
@@ -385,8 +394,7 @@ class TestAutomationRuntime(unittest.TestCase):
         self.assertEqual(step_runs[1]["status"], "succeeded")
 
     def test_foreach_repeats_action_over_list(self):
-        store = MemoryAutomationStore()
-        job_store = MemoryJobStore()
+        store, job_store = _memory_stores()
         automation = store.create(
             {
                 "name": "Loop Test",
@@ -429,8 +437,7 @@ class TestAutomationRuntime(unittest.TestCase):
         self.assertEqual(step_runs[0]["output"]["count"], 3)
 
     def test_condition_executes_then_branch_steps(self):
-        store = MemoryAutomationStore()
-        job_store = MemoryJobStore()
+        store, job_store = _memory_stores()
         automation = store.create(
             {
                 "name": "Nested Condition Test",
@@ -477,8 +484,7 @@ class TestAutomationRuntime(unittest.TestCase):
         self.assertTrue(any(item.get("step_id") == "cond1.then.nested_noop" for item in step_runs))
 
     def test_foreach_executes_nested_steps(self):
-        store = MemoryAutomationStore()
-        job_store = MemoryJobStore()
+        store, job_store = _memory_stores()
         automation = store.create(
             {
                 "name": "Nested Loop Test",
@@ -524,8 +530,7 @@ class TestAutomationRuntime(unittest.TestCase):
         self.assertTrue(any(item.get("step_id") == "loop_nested.loop_2.child_noop" for item in step_runs))
 
     def test_apply_integration_mapping_action_uses_saved_mapping(self):
-        store = MemoryAutomationStore()
-        job_store = MemoryJobStore()
+        store, job_store = _memory_stores()
         automation = store.create(
             {
                 "name": "Apply Integration Mapping",
@@ -607,8 +612,7 @@ class TestAutomationRuntime(unittest.TestCase):
         self.assertEqual(captured["context"]["source"], "automation")
 
     def test_apply_integration_mapping_action_accepts_rendered_json_source_record(self):
-        store = MemoryAutomationStore()
-        job_store = MemoryJobStore()
+        store, job_store = _memory_stores()
         automation = store.create(
             {
                 "name": "Apply Integration Mapping From Rendered Json",
@@ -685,8 +689,7 @@ class TestAutomationRuntime(unittest.TestCase):
         )
 
     def test_apply_integration_mapping_rejects_sync_only_mapping(self):
-        store = MemoryAutomationStore()
-        job_store = MemoryJobStore()
+        store, job_store = _memory_stores()
         automation = store.create(
             {
                 "name": "Reject Sync Mapping",
@@ -728,8 +731,7 @@ class TestAutomationRuntime(unittest.TestCase):
         self.assertEqual(run_after["status"], "failed")
 
     def test_integration_request_action_uses_saved_request_template_with_overrides(self):
-        store = MemoryAutomationStore()
-        job_store = MemoryJobStore()
+        store, job_store = _memory_stores()
         automation = store.create(
             {
                 "name": "Run Request Template",
@@ -807,8 +809,7 @@ class TestAutomationRuntime(unittest.TestCase):
         self.assertEqual(captured["request_config"]["query"]["where"], "Status==\"ACTIVE\"")
 
     def test_send_email_step_renders_record_placeholders_at_action_runtime(self):
-        store = MemoryAutomationStore()
-        job_store = MemoryJobStore()
+        store, job_store = _memory_stores()
         automation = store.create(
             {
                 "name": "Quote Accepted Email",
@@ -1573,8 +1574,7 @@ class TestAutomationRuntime(unittest.TestCase):
         self.assertIn("job", result)
 
     def test_run_automation_email_compose_overrides_replace_recipients_and_attachments(self):
-        store = MemoryAutomationStore()
-        job_store = MemoryJobStore()
+        store, job_store = _memory_stores()
         created_outbox: list[dict] = []
 
         class _FakeAttachmentStore:
@@ -1707,8 +1707,7 @@ class TestAutomationRuntime(unittest.TestCase):
         )
 
     def test_run_automation_email_compose_selected_attachments_replace_attachment_field(self):
-        store = MemoryAutomationStore()
-        job_store = MemoryJobStore()
+        store, job_store = _memory_stores()
         created_outbox: list[dict] = []
 
         class _FakeAttachmentStore:
@@ -1844,8 +1843,7 @@ class TestAutomationRuntime(unittest.TestCase):
         )
 
     def test_run_automation_generates_document_inline_before_following_email_step(self):
-        store = MemoryAutomationStore()
-        job_store = MemoryJobStore()
+        store, job_store = _memory_stores()
         created_outbox: list[dict] = []
         attachments_by_id: dict[str, dict] = {}
         linked_by_purpose: dict[tuple[str, str, str], list[str]] = {}
@@ -2018,8 +2016,7 @@ class TestAutomationRuntime(unittest.TestCase):
         self.assertEqual(len(job_store.list("default", job_type="email.send")), 1)
 
     def test_run_automation_quote_handoff_generates_document_emails_customer_and_notifies_owner(self):
-        store = MemoryAutomationStore()
-        job_store = MemoryJobStore()
+        store, job_store = _memory_stores()
         created_outbox: list[dict] = []
         created_notifications: list[dict] = []
         attachments_by_id: dict[str, dict] = {}
@@ -2218,8 +2215,7 @@ class TestAutomationRuntime(unittest.TestCase):
         self.assertEqual(len(job_store.list("default", job_type="email.send")), 1)
 
     def test_run_automation_create_record_then_email_and_notify_targets_created_record(self):
-        store = MemoryAutomationStore()
-        job_store = MemoryJobStore()
+        store, job_store = _memory_stores()
         created_outbox: list[dict] = []
         created_notifications: list[dict] = []
         created_records: list[dict] = []
@@ -2413,8 +2409,7 @@ class TestAutomationRuntime(unittest.TestCase):
         self.assertEqual(created_notifications[0]["body"], "Lead is ready for follow-up.")
 
     def test_create_record_step_renders_trigger_field_templates_at_action_runtime(self):
-        store = MemoryAutomationStore()
-        job_store = MemoryJobStore()
+        store, job_store = _memory_stores()
         automation = store.create(
             {
                 "name": "Create Job From Quote",
@@ -2530,8 +2525,7 @@ class TestAutomationRuntime(unittest.TestCase):
         self.assertEqual(created_records[0]["biz_job.status"], "new")
 
     def test_create_record_step_renders_record_bracket_templates_at_action_runtime(self):
-        store = MemoryAutomationStore()
-        job_store = MemoryJobStore()
+        store, job_store = _memory_stores()
         automation = store.create(
             {
                 "name": "Create Lead From Contact",
@@ -2644,8 +2638,7 @@ class TestAutomationRuntime(unittest.TestCase):
         self.assertEqual(created_records[0]["crm_lead.company_id"], "company_1")
 
     def test_create_then_update_record_steps_share_outputs_and_render_templates(self):
-        store = MemoryAutomationStore()
-        job_store = MemoryJobStore()
+        store, job_store = _memory_stores()
         automation = store.create(
             {
                 "name": "Create Then Update Job",
@@ -2804,8 +2797,7 @@ class TestAutomationRuntime(unittest.TestCase):
         self.assertEqual(records_by_id["job_1"]["biz_job.status"], "scheduled")
 
     def test_create_then_update_record_steps_hydrate_trigger_after_from_fetched_record_when_missing(self):
-        store = MemoryAutomationStore()
-        job_store = MemoryJobStore()
+        store, job_store = _memory_stores()
         automation = store.create(
             {
                 "name": "Create Then Update Job With Hydrated After",
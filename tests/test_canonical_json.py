@@ -1,14 +1,6 @@
-import os
-import sys
 import unittest
 
-
-ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-SRC = os.path.join(ROOT, "src")
-if SRC not in sys.path:
-    sys.path.insert(0, SRC)
-
-from octo.canonical_json import CanonicalJsonTypeError, canonical_dumps
+from octo.canonical_json import CanonicalJsonTypeError, canonical_dumps, json_clone
 
 
 class TestCanonicalJson(unittest.TestCase):
@@ -38,6 +30,26 @@ class TestCanonicalJson(unittest.TestCase):
         with self.assertRaises(CanonicalJsonTypeError):
             canonical_dumps(obj)
 
+    def test_rejects_non_string_keys(self) -> None:
+        for obj in ({1: "a"}, {"ok": {1: "one"}}, {1: "a", "b": 2}):
+            with self.subTest(obj=obj):
+                with self.assertRaises(CanonicalJsonTypeError):
+                    canonical_dumps(obj)
+
+    def test_rejects_tuples(self) -> None:
+        with self.assertRaises(CanonicalJsonTypeError):
+            canonical_dumps({"a": (1, 2)})
+
+    def test_rejects_circular_structure(self) -> None:
+        obj: dict = {}
+        obj["self"] = obj
+        with self.assertRaises(RecursionError):
+            canonical_dumps(obj)
+
+    def test_trusted_skips_validation(self) -> None:
+        obj = {"b": [1, {"c": "é"}], "a": None}
+        self.assertEqual(canonical_dumps(obj, trusted=True), canonical_dumps(obj))
+
     def test_reject_nan(self) -> None:
         obj = {"bad": float("nan")}
         with self.assertRaises(ValueError):
@@ -58,6 +70,13 @@ class TestCanonicalJson(unittest.TestCase):
         b = {"n": 1.0}
         self.assertNotEqual(canonical_dumps(a), canonical_dumps(b))
 
+    def test_json_clone_copies_containers(self) -> None:
+        obj = {"a": [1, {"b": "x"}], "c": None}
+        clone = json_clone(obj)
+        self.assertEqual(clone, obj)
+        clone["a"][1]["b"] = "y"
+        self.assertEqual(obj["a"][1]["b"], "x")
+
 
 if __name__ == "__main__":
     unittest.main()
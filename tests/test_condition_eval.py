@@ -1,27 +1,21 @@
-import os
-import sys
 import unittest
-
-
-ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-SRC = os.path.join(ROOT, "src")
-if ROOT not in sys.path:
-    sys.path.insert(0, ROOT)
-if SRC not in sys.path:
-    sys.path.insert(0, SRC)
+from types import MappingProxyType
 
 from condition_eval import (
     ConditionDepthError,
+    ConditionEvalError,
     ConditionSchemaError,
     TypeErrorInCondition,
     VarResolveError,
+    compile_condition,
     eval_condition,
 )
 
 
 class TestConditionEval(unittest.TestCase):
-    def setUp(self) -> None:
-        self.ctx = {
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.ctx = {
             "job": {"id": "j1", "status": "open", "count": 3},
             "text": "hello world",
             "nums": [1, 2, 3],
@@ -149,6 +143,11 @@ class TestConditionEval(unittest.TestCase):
         with self.assertRaises(VarResolveError):
             eval_condition(cond, self.ctx)
 
+    def test_ctx_must_be_dict(self) -> None:
+        cond = {"op": "eq", "left": {"var": "job.status"}, "right": {"literal": "open"}}
+        with self.assertRaises(ConditionSchemaError):
+            eval_condition(cond, MappingProxyType(self.ctx))
+
     def test_type_errors(self) -> None:
         cond = {"op": "gt", "left": {"literal": "a"}, "right": {"literal": "b"}}
         with self.assertRaises(TypeErrorInCondition):
@@ -166,6 +165,126 @@ class TestConditionEval(unittest.TestCase):
         with self.assertRaises(ConditionSchemaError):
             eval_condition({"op": "and"}, self.ctx)
 
+    def test_compiled_condition_reused_across_contexts(self) -> None:
+        matches = compile_condition(
+            {
+                "op": "any",
+                "over": {"var": "items"},
+                "where": {"op": "eq", "left": {"var": "item.status"}, "right": {"literal": "fail"}},
+            }
+        )
+        self.assertTrue(matches(self.ctx))
+        self.assertFalse(matches({"items": [{"status": "ok"}]}))
+        with self.assertRaises(VarResolveError):
+            matches({})
+
+    def test_compiled_condition_defers_schema_errors(self) -> None:
+        cond = {
+            "op": "and",
+            "children": [
+                {"op": "eq", "left": {"var": "job.status"}, "right": {"literal": "open"}},
+                {"op": "eq", "left": {"literal": 1}},
+            ],
+        }
+        matches = compile_condition(cond)
+        self.assertFalse(matches({"job": {"status": "closed"}}))
+        with self.assertRaises(ConditionSchemaError) as raised:
+            matches(self.ctx)
+        self.assertEqual(raised.exception.path, "$.children[1]")
+        with self.assertRaises(ConditionDepthError):
+            compile_condition(cond, depth_limit=1)(self.ctx)
+
+    def test_compiled_condition_matches_eval_condition(self) -> None:
+        def outcome(evaluate):
+            try:
+                return ("ok", evaluate())
+            except ConditionEvalError as exc:
+                return (type(exc), exc.code, exc.message, exc.path)
+
+        contexts = [
+            self.ctx,
+            {"job": {"status": "closed", "count": 1.5}, "text": "", "nums": [], "items": []},
+            {"job": "flat", "text": 7, "nums": "1,2", "items": [{"status": None}]},
+            {},
+        ]
+        for cond in _PARITY_CONDITIONS:
+            for limit in (10, 3):
+                compiled = compile_condition(cond, depth_limit=limit)
+                for ctx in contexts:
+                    with self.subTest(cond=cond, limit=limit, ctx=ctx):
+                        self.assertEqual(
+                            outcome(lambda: compiled(ctx)),
+                            outcome(lambda: eval_condition(cond, ctx, limit)),
+                        )
+
+
+def _var(name):
+    return {"var": name}
+
+
+def _lit(value):
+    return {"literal": value}
+
+
+# Valid and malformed conditions run through both evaluators; any drift
+# between eval_condition and compile_condition shows up as a mismatch.
+_PARITY_CONDITIONS = [
+    {"op": "and", "children": []},
+    {"op": "or", "children": []},
+    {"op": "and", "children": [{"op": "eq", "left": _var("job.status"), "right": _lit("open")}, {"op": "eq", "left": _lit(1)}]},
+    {"op": "or", "children": [{"op": "eq", "left": _var("job.status"), "right": _lit("open")}, {"op": "bogus"}]},
+    {"op": "and"},
+    {"op": "or", "children": "x"},
+    {"op": "not", "children": [{"op": "exists", "left": _var("job.id")}]},
+    {"op": "not", "children": []},
+    {"op": "not", "children": [_lit(True), _lit(False)]},
+    {"op": "not", "children": [{"op": "not", "children": [{"op": "not", "children": [{"op": "eq", "left": _lit(1), "right": _lit(1)}]}]}]},
+    {"op": "eq", "left": _var("job.status"), "right": _lit("open")},
+    {"op": "neq", "left": _var("job.count"), "right": _lit(3)},
+    {"op": "eq", "left": _var("job.status.deep"), "right": _lit(1)},
+    {"op": "eq", "left": _var("missing"), "right": _var("also.missing")},
+    {"op": "eq", "left": _lit(1)},
+    {"op": "eq", "left": {"var": 1}, "right": _lit(1)},
+    {"op": "eq", "left": 1, "right": _lit(1)},
+    {"op": "eq", "left": {"other": 1}, "right": _lit(1)},
+    {"op": "eq", "left": {"array": [_lit(1), _var("job.count")]}, "right": {"array": [_lit(1), _lit(3)]}},
+    {"op": "eq", "left": {"array": "x"}, "right": _lit([])},
+    {"op": "eq", "left": {"array": [{"array": [{"array": [_lit(1)]}]}]}, "right": _lit([[[1]]])},
+    {"op": "gt", "left": _var("job.count"), "right": _lit(2)},
+    {"op": "gte", "left": _var("job.count"), "right": _lit(3)},
+    {"op": "lt", "left": _var("job.count"), "right": _lit(2.5)},
+    {"op": "lte", "left": _lit(True), "right": _lit(1)},
+    {"op": "gt", "left": _lit("a"), "right": _lit("b")},
+    {"op": "gt", "left": _lit(float("nan")), "right": _lit(1)},
+    {"op": "lt", "left": _lit(1), "right": _lit(float("inf"))},
+    {"op": "contains", "left": _var("text"), "right": _lit("world")},
+    {"op": "contains", "left": _var("nums"), "right": _lit(2)},
+    {"op": "contains", "left": _lit(1), "right": _lit(1)},
+    {"op": "in", "left": _lit(2), "right": _var("nums")},
+    {"op": "not_in", "left": _lit(5), "right": _var("nums")},
+    {"op": "in", "left": _lit(1), "right": _lit(2)},
+    {"op": "exists", "left": _var("job.id")},
+    {"op": "not_exists", "left": _var("missing")},
+    {"op": "exists", "left": _var("nums")},
+    {"op": "exists", "left": _lit("")},
+    {"op": "exists", "left": {"var": None}},
+    {"op": "exists", "left": "job.id"},
+    {"op": "exists"},
+    {"op": "any", "over": _var("items"), "where": {"op": "eq", "left": _var("item.status"), "right": _lit("fail")}},
+    {"op": "all", "over": _var("items"), "where": {"op": "eq", "left": _var("item.status"), "right": _lit("ok")}},
+    {"op": "all", "over": _var("items"), "where": {"op": "any", "over": _var("nums"), "where": {"op": "gt", "left": _var("item"), "right": _lit(2)}}},
+    {"op": "any", "over": _var("job"), "where": {"op": "and", "children": []}},
+    {"op": "any", "over": _lit([]), "where": "x"},
+    {"op": "all", "over": _lit([]), "where": {"op": "bogus"}},
+    {"op": "any", "over": _lit([1]), "where": {"op": "bogus"}},
+    {"op": "any", "over": _var("items")},
+    {"op": "bogus"},
+    {"left": _lit(1)},
+    {"op": None},
+    "eq",
+    None,
+]
+
 
 if __name__ == "__main__":
     unittest.main()
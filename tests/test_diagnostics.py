@@ -1,7 +1,9 @@
 import unittest
+from unittest.mock import patch
 
 from manifest_store import ManifestStore
 from module_registry import ModuleRegistry
+from app import diagnostics
 from app.diagnostics import build_diagnostics
 
 
@@ -36,6 +38,22 @@ class TestDiagnostics(unittest.TestCase):
         self.assertEqual(mod["counts"]["views"], 1)
         self.assertEqual(mod["counts"]["entities"], 1)
 
+    def test_snapshot_warnings_cached_by_hash(self) -> None:
+        manifest = {
+            "manifest_version": "1.0",
+            "module": {"id": "diag"},
+            "entities": [],
+            "views": [],
+            "pages": [],
+        }
+        diagnostics._SNAPSHOT_WARNINGS_CACHE.clear()
+        first = diagnostics._snapshot_warnings("diag", "sha256:x", manifest)
+        with patch.object(diagnostics, "validate_manifest_raw") as validate:
+            second = diagnostics._snapshot_warnings("diag", "sha256:x", manifest)
+        validate.assert_not_called()
+        self.assertEqual(second, first)
+        self.assertIsNot(second, first)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -27,6 +27,16 @@ class TestDraftStore(unittest.TestCase):
         self.assertTrue(deleted)
         self.assertIsNone(self.store.get_draft("mod3"))
 
+    def test_draft_versions_newest_first_and_lookup_by_id(self) -> None:
+        first = self.store.create_draft_version("mod4", {"module": {"id": "mod4"}}, note="one")
+        second = self.store.create_draft_version("mod4", {"module": {"id": "mod4"}, "entities": []}, note="two")
+        versions = self.store.list_draft_versions("mod4")
+        self.assertEqual([v["id"] for v in versions], [second["id"], first["id"]])
+        self.assertEqual(self.store.get_draft_version("mod4", first["id"])["note"], "one")
+        self.assertIsNone(self.store.get_draft_version("mod4", "missing"))
+        self.store.delete_draft("mod4")
+        self.assertIsNone(self.store.get_draft_version("mod4", first["id"]))
+
 
 if __name__ == "__main__":
     unittest.main()
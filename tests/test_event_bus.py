@@ -1,15 +1,5 @@
-import os
-import sys
 import unittest
 
-
-ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-SRC = os.path.join(ROOT, "src")
-if ROOT not in sys.path:
-    sys.path.insert(0, ROOT)
-if SRC not in sys.path:
-    sys.path.insert(0, SRC)
-
 from event_bus import EventBus, EventValidationError, make_event
 from outbox import Outbox
 
@@ -60,6 +50,24 @@ class TestEventBus(unittest.TestCase):
         bus.publish(event)
         self.assertEqual(calls, [])
 
+    def test_unsubscribe_during_publish(self) -> None:
+        bus = EventBus()
+        calls = []
+
+        def h1(evt: dict) -> None:
+            calls.append("h1")
+            bus.unsubscribe("job.scheduled", h1)
+
+        def h2(evt: dict) -> None:
+            calls.append("h2")
+
+        bus.subscribe("job.scheduled", h1)
+        bus.subscribe("job.scheduled", h2)
+        event = make_event("job.scheduled", {"job_id": "j1"}, self._base_meta())
+        bus.publish(event)
+        bus.publish(event)
+        self.assertEqual(calls, ["h1", "h2", "h2"])
+
     def test_invalid_envelope_missing_name(self) -> None:
         bus = EventBus()
         event = make_event("job.scheduled", {"job_id": "j1"}, self._base_meta())
@@ -88,6 +96,15 @@ class TestEventBus(unittest.TestCase):
         with self.assertRaises(EventValidationError):
             bus.publish(event)
 
+    def test_payload_rejects_non_json_shapes(self) -> None:
+        bus = EventBus()
+        for value in ((1, 2), {1: "a"}):
+            with self.subTest(value=value):
+                event = make_event("job.scheduled", {"value": 1}, self._base_meta())
+                event["payload"]["value"] = value
+                with self.assertRaises(EventValidationError):
+                    bus.publish(event)
+
 
 if __name__ == "__main__":
     unittest.main()
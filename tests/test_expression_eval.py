@@ -1,14 +1,5 @@
-import os
-import sys
 import unittest
-
-
-ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-SRC = os.path.join(ROOT, "src")
-if ROOT not in sys.path:
-    sys.path.insert(0, ROOT)
-if SRC not in sys.path:
-    sys.path.insert(0, SRC)
+from types import MappingProxyType
 
 from expression_eval import (
     ExprVarResolveError,
@@ -21,8 +12,9 @@ from expression_eval import (
 
 
 class TestExpressionEval(unittest.TestCase):
-    def setUp(self) -> None:
-        self.ctx = {"job": {"id": "j1"}, "x": None}
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.ctx = {"job": {"id": "j1"}, "x": None}
 
     def test_literal_and_nan_rejection(self) -> None:
         self.assertEqual(eval_expression({"literal": {"a": 1}}, self.ctx), {"a": 1})
@@ -34,6 +26,10 @@ class TestExpressionEval(unittest.TestCase):
         with self.assertRaises(ExprVarResolveError):
             eval_expression({"var": "job.missing"}, self.ctx)
 
+    def test_ctx_must_be_dict(self) -> None:
+        with self.assertRaises(ExpressionSchemaError):
+            eval_expression({"var": "job.id"}, MappingProxyType(self.ctx))
+
     def test_coalesce(self) -> None:
         expr = {
             "expr": "coalesce",
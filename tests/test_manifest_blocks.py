@@ -139,5 +139,22 @@ class TestManifestBlocks(unittest.TestCase):
         self.assertEqual(errors, [])
 
 
+    def test_assume_valid_skips_validation_but_normalizes(self) -> None:
+        manifest = self._base_manifest()
+        manifest["pages"] = [
+            {
+                "id": "home",
+                "content": [{"kind": "grid", "columns": 12, "items": [{"span": 20, "content": []}]}],
+            }
+        ]
+        normalized, errors, warnings = validate_manifest_raw(manifest, expected_module_id="m1")
+        self.assertTrue(errors)
+        trusted, trusted_errors, trusted_warnings = validate_manifest_raw(
+            manifest, expected_module_id="m1", assume_valid=True
+        )
+        self.assertEqual((trusted_errors, trusted_warnings), ([], []))
+        self.assertEqual(trusted, normalized)
+
+
 if __name__ == "__main__":
     unittest.main()
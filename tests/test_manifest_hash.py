@@ -1,13 +1,6 @@
-import os
-import sys
 import unittest
 
-
-ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-SRC = os.path.join(ROOT, "src")
-if SRC not in sys.path:
-    sys.path.insert(0, SRC)
-
+from octo.canonical_json import CanonicalJsonTypeError
 from octo.manifest_hash import manifest_hash
 
 
@@ -28,6 +21,10 @@ class TestManifestHash(unittest.TestCase):
         self.assertTrue(h.startswith("sha256:"))
         self.assertEqual(len(h), len("sha256:") + 64)
 
+    def test_hash_rejects_non_string_keys(self) -> None:
+        with self.assertRaises(CanonicalJsonTypeError):
+            manifest_hash({1: "a"})
+
     def test_hash_rejects_nan(self) -> None:
         obj = {"bad": float("nan")}
         with self.assertRaises(ValueError):
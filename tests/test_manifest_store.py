@@ -83,6 +83,11 @@ class TestManifestStore(unittest.TestCase):
         fresh = self.store.get_snapshot("m1", self.head)
         self.assertEqual(fresh["module"]["id"], "m1")
 
+    def test_get_snapshot_without_copy_shares_stored_manifest(self) -> None:
+        shared = self.store.get_snapshot("m1", self.head, mutable=False)
+        self.assertIs(self.store.get_snapshot("m1", self.head, mutable=False), shared)
+        self.assertEqual(self.store.get_snapshot("m1", self.head), shared)
+
     def test_history_newest_first(self) -> None:
         approved = self._approved_preview([
             {"op": "add", "path": "/entities/0", "value": {"id": "entity.job"}}
@@ -102,6 +107,26 @@ class TestManifestStore(unittest.TestCase):
         snapshot = self.store.get_snapshot("m1", result["to_hash"])
         self.assertEqual(snapshot["entities"][0]["id"], "entity.job")
 
+    def test_list_snapshots_newest_first(self) -> None:
+        result = self.store.apply_approved_preview(self._approved_preview([
+            {"op": "add", "path": "/entities/0", "value": {"id": "entity.job"}}
+        ]))
+        hashes = [item["manifest_hash"] for item in self.store.list_snapshots("m1")]
+        self.assertEqual(hashes, [result["to_hash"], self.head])
+
+    def test_apply_test_op(self) -> None:
+        ok = self.store.apply_approved_preview(self._approved_preview([
+            {"op": "test", "path": "/module/id", "value": "m1"},
+            {"op": "test", "path": "/module", "value": {"id": "m1"}},
+        ]))
+        self.assertTrue(ok["ok"])
+        self.assertEqual(ok["to_hash"], self.head)
+        failed = self.store.apply_approved_preview(self._approved_preview([
+            {"op": "test", "path": "/module/id", "value": "other"}
+        ]))
+        self.assertFalse(failed["ok"])
+        self.assertEqual(failed["errors"][0]["code"], "APPLY_FAILED")
+
 
 if __name__ == "__main__":
     unittest.main()
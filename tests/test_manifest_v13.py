@@ -1,19 +1,12 @@
-import os
-import sys
 import unittest
 import json
 from pathlib import Path
 
-ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-SRC = os.path.join(ROOT, "src")
-if ROOT not in sys.path:
-    sys.path.insert(0, ROOT)
-if SRC not in sys.path:
-    sys.path.insert(0, SRC)
-
 from app.manifest_validate import validate_manifest, validate_manifest_raw
 from app.manifest_normalize import normalize_manifest
 
+ROOT = Path(__file__).resolve().parents[1]
+
 
 def base_manifest():
     return {
@@ -249,12 +242,12 @@ class TestManifestV13(unittest.TestCase):
         self.assertTrue(any(e["code"] == "MANIFEST_DEPENDS_ON_INVALID_VERSION" for e in errors))
 
     def test_octodrop_work_management_manifest_validates_with_grouped_invoice_flow(self):
-        manifest = json.loads((Path(ROOT) / "octodrop_modules" / "work_management" / "work_management.json").read_text(encoding="utf-8"))
+        manifest = json.loads((ROOT / "octodrop_modules" / "work_management" / "work_management.json").read_text(encoding="utf-8"))
         _normalized, errors, _warnings = validate_manifest_raw(manifest, expected_module_id="work_management")
         self.assertEqual(errors, [])
 
     def test_octodrop_billing_manifest_validates_without_single_time_entry_transform(self):
-        manifest_path = Path(ROOT) / "octodrop_modules" / "billing" / "billing.json"
+        manifest_path = ROOT / "octodrop_modules" / "billing" / "billing.json"
         manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
         _normalized, errors, _warnings = validate_manifest_raw(manifest, expected_module_id="billing")
         self.assertEqual(errors, [])
@@ -51,6 +51,7 @@ class TestModuleDelete(unittest.TestCase):
         self.assertFalse(record.get("enabled"))
         self.assertEqual(len(self.generic_records.list("item")), 0)
         self.assertIsNone(self.drafts.get_draft("mod2"))
+        self.assertNotIn("mod2", [m["module_id"] for m in self.registry.list()])
 
 
 if __name__ == "__main__":
@@ -1,6 +1,7 @@
 import os
 import sys
 import unittest
+import uuid
 
 
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -70,6 +71,7 @@ class TestModuleRegistry(unittest.TestCase):
         latest_hash = install["module"]["current_hash"]
         versions = self.registry.list_versions("m1")
         first_version = versions[0]
+        self.assertEqual(first_version["manifest"]["entities"][0]["id"], "entity.job")
         rollback = self.registry.rollback("m1", self.head, actor={"id": "u1"}, reason="rollback", to_version_id=first_version["version_id"])
         self.assertTrue(rollback["ok"])
         module = self.registry.get("m1")
@@ -78,6 +80,16 @@ class TestModuleRegistry(unittest.TestCase):
         self.assertEqual(history[0]["action"], "rollback")
         self.assertEqual(history[0]["from_hash"], latest_hash)
 
+    def test_rollback_to_current_snapshot_skips_store(self) -> None:
+        install = self.registry.install(self._approved())
+        current = install["module"]["current_hash"]
+        store_history = len(self.store.list_history("m1"))
+        result = self.registry.rollback("m1", current, actor={"id": "u1"}, reason="noop")
+        self.assertTrue(result["ok"])
+        self.assertEqual(result["warnings"][0]["code"], "MODULE_ALREADY_AT_SNAPSHOT")
+        self.assertEqual(len(self.store.list_history("m1")), store_history)
+        self.assertEqual(self.registry.history("m1")[0]["action"], "rollback")
+
     def test_enable_disable(self) -> None:
         self.registry.install(self._approved())
         res = self.registry.set_enabled("m1", False, actor={"id": "u1"}, reason="disable")
@@ -93,6 +105,21 @@ class TestModuleRegistry(unittest.TestCase):
         history = self.registry.history("m1")
         self.assertEqual(history[0]["action"], "disable")
         self.assertEqual(history[1]["action"], "install")
+        with self.assertRaises(TypeError):
+            history[0]["action"] = "mutated"
+
+    def test_generated_ids_are_uuid4(self) -> None:
+        result = self.registry.install(self._approved())
+        for value in (result["audit_id"], result["module"]["active_version"]):
+            self.assertEqual(uuid.UUID(value).version, 4)
+            self.assertEqual(str(uuid.UUID(value)), value)
+
+    def test_audit_cap_keeps_newest(self) -> None:
+        registry = ModuleRegistry(self.store, audit_cap=2)
+        registry.install(self._approved())
+        registry.set_enabled("m1", False, actor={"id": "u1"}, reason="disable")
+        registry.set_enabled("m1", True, actor={"id": "u1"}, reason="enable")
+        self.assertEqual([a["action"] for a in registry.history("m1")], ["enable", "disable"])
 
     def test_install_propagates_store_failure(self) -> None:
         approved = self._approved(from_hash="sha256:bad")
@@ -106,6 +133,13 @@ class TestModuleRegistry(unittest.TestCase):
         result = self.registry.install(approved)
         self.assertFalse(result["ok"])
 
+    def test_list_sorted_by_module_id(self) -> None:
+        for module_id in ("m3", "m2"):
+            self.store.init_module(module_id, {"module": {"id": module_id}, "entities": []}, actor={"id": "u1"})
+            self.registry.register(module_id, module_id, actor={"id": "u1"})
+        self.registry.install(self._approved())
+        self.assertEqual([m["module_id"] for m in self.registry.list()], ["m1", "m2", "m3"])
+
     def test_deep_copy_immutability(self) -> None:
         self.registry.install(self._approved())
         module = self.registry.get("m1")
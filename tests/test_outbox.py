@@ -10,7 +10,7 @@ if ROOT not in sys.path:
 if SRC not in sys.path:
     sys.path.insert(0, SRC)
 
-from event_bus import make_event
+from event_bus import EventValidationError, make_event
 from outbox import Outbox
 
 
@@ -41,6 +41,35 @@ class TestOutbox(unittest.TestCase):
         self.assertEqual(outbox.pending(), [])
         self.assertFalse(outbox.ack(event_id))
 
+    def test_ack_many(self) -> None:
+        outbox = Outbox()
+        events = [make_event(name, {}, self._base_meta()) for name in ("a", "b", "c")]
+        for event in events:
+            outbox.enqueue(event)
+        ids = [events[0]["meta"]["event_id"], events[2]["meta"]["event_id"], "missing"]
+        self.assertEqual(outbox.ack_many(ids), 2)
+        self.assertEqual([e["name"] for e in outbox.pending_iter()], ["b"])
+
+    def test_enqueue_copy(self) -> None:
+        outbox = Outbox()
+        copied = make_event("a", {"items": [1]}, self._base_meta())
+        owned = make_event("b", {"items": [2]}, self._base_meta())
+        outbox.enqueue(copied)
+        outbox.enqueue(owned, copy=False)
+        copied["payload"]["items"].append(3)
+        pending = outbox.pending()
+        self.assertEqual(pending[0]["payload"], {"items": [1]})
+        self.assertIs(pending[1], owned)
+
+    def test_enqueue_assume_valid_skips_validation(self) -> None:
+        outbox = Outbox()
+        event = make_event("a", {"x": 1}, self._base_meta())
+        event["meta"]["schema_version"] = "2"
+        with self.assertRaises(EventValidationError):
+            outbox.enqueue(event)
+        outbox.enqueue(event, assume_valid=True)
+        self.assertEqual([e["name"] for e in outbox.pending()], ["a"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,3 +1,4 @@
+import copy
 import os
 import sys
 import unittest
@@ -45,6 +46,12 @@ class TestPatchPreview(unittest.TestCase):
         self.assertFalse(result["ok"])
         self.assertEqual(result["resolved_ops"], [])
 
+    def test_precomputed_hash_is_trusted(self) -> None:
+        patch = dict(self.patch_base)
+        patch["target_manifest_hash"] = "sha256:precomputed"
+        result = preview_patch(self.manifest, patch, current_hash="sha256:precomputed")
+        self.assertTrue(result["ok"])
+
     def test_selector_resolve_and_simulation(self) -> None:
         patch = dict(self.patch_base)
         patch["operations"] = [
@@ -66,6 +73,20 @@ class TestPatchPreview(unittest.TestCase):
         result = preview_patch(self.manifest, patch)
         self.assertFalse(result["ok"])
 
+    def test_repeated_missing_selector_reported_per_op(self) -> None:
+        patch = dict(self.patch_base)
+        missing = "/entities/@[id=entity.job]/fields/@[id=job.missing]/id"
+        patch["operations"] = [
+            {"op": "replace", "path": missing, "value": "a"},
+            {"op": "replace", "path": missing, "value": "b"},
+        ]
+        result = preview_patch(self.manifest, patch)
+        self.assertFalse(result["ok"])
+        self.assertEqual(
+            [(e["code"], e["op_index"]) for e in result["errors"]],
+            [("SELECTOR_NOT_FOUND", 0), ("SELECTOR_NOT_FOUND", 1)],
+        )
+
     def test_add_field_macro_expands(self) -> None:
         patch = dict(self.patch_base)
         patch["operations"] = [
@@ -100,6 +121,27 @@ class TestPatchPreview(unittest.TestCase):
         ]
         result = preview_patch(self.manifest, patch)
         self.assertFalse(result["ok"])
+        self.assertEqual(result["errors"][0]["code"], "SIMULATION_ERROR")
+        self.assertEqual(result["errors"][0]["resolved_path"], "/entities/0/fields/1/id")
+
+    def test_simulation_leaves_manifest_untouched(self) -> None:
+        before = copy.deepcopy(self.manifest)
+        patch = dict(self.patch_base)
+        patch["operations"] = [
+            {
+                "op": "move",
+                "from": "/entities/@[id=entity.job]/fields/@[id=job.title]",
+                "path": "/entities/@[id=entity.job]/fields/@[id=job.priority]",
+            },
+            {
+                "op": "replace",
+                "path": "/entities/@[id=entity.job]/fields/@[id=job.status]/id",
+                "value": "job.state",
+            },
+        ]
+        result = preview_patch(self.manifest, patch)
+        self.assertTrue(result["ok"])
+        self.assertEqual(self.manifest, before)
 
     def test_diff_summary(self) -> None:
         patch = dict(self.patch_base)
@@ -14,6 +14,7 @@ from octo.selector_path import (
     SelectorNotUnique,
     SelectorTypeError,
     resolve_selector_path,
+    resolve_selector_paths_batch,
 )
 
 
@@ -64,6 +65,21 @@ class TestSelectorPath(unittest.TestCase):
         path = "/a~1b/~0key"
         self.assertEqual(resolve_selector_path(doc, path), "/a~1b/~0key")
 
+    def test_plain_pointer_is_normalized(self) -> None:
+        doc = {"entities": [{"id": "a"}, {"id": "b"}]}
+        self.assertEqual(resolve_selector_path(doc, "/entities/1/id"), "/entities/1/id")
+        self.assertEqual(resolve_selector_path(doc, "/entities/01/id"), "/entities/1/id")
+
+    def test_batch_resolution_reports_errors_in_place(self) -> None:
+        doc = {"entities": [{"id": "a"}, {"id": "dup"}, {"id": "b"}, {"id": "dup"}]}
+        results = resolve_selector_paths_batch(
+            doc,
+            ["/entities/@[id=b]", "/entities/@[id=dup]", "/entities/@[id=a]"],
+        )
+        self.assertEqual(results[0], "/entities/2")
+        self.assertIsInstance(results[1], SelectorNotUnique)
+        self.assertEqual(results[2], "/entities/0")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -164,7 +164,7 @@ def apply_workflow_step(workflow: dict, instance_id: str, ctx: dict, deps: dict)
                 "trace_id": ctx.get("trace_id"),
             },
         )
-        outbox.enqueue(envelope)
+        outbox.enqueue(envelope, assume_valid=True)
         events_enqueued.append(envelope["meta"]["event_id"])
 
     store.update_instance(instance)